@@ -5,7 +5,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import warnings
-from databricks_scripts.conect_databricks import connect_to_databricks
+from databricks_scripts.conect_databricks import PoolDatabricks
 from databricks_scripts.queries import LakehouseQueries
 
 warnings.filterwarnings("ignore")
@@ -183,10 +183,19 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+
 # ============================================
 # CONEXÃO COM DATABRICKS
 # ============================================
-conn = connect_to_databricks()
+@st.cache_resource
+def get_pool(http_path=None, tamanho=None):
+    """Pool de conexões do warehouse, criado uma vez por processo e compartilhado pelas sessões"""
+    return PoolDatabricks(http_path=http_path, tamanho=tamanho)
+
+
+def read_sql(query):
+    """Executa a query em uma conexão do pool (reconecta se a conexão tiver caído)"""
+    return get_pool().executar(lambda conexao: pd.read_sql(query, conexao))
 
 
 # ============================================
@@ -251,7 +260,7 @@ def get_score_class(score):
 def load_kpis(data_inicio, data_fim):
     """Carrega KPIs principais"""
     query = LakehouseQueries.get_kpis_executive(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -259,7 +268,7 @@ def load_kpis(data_inicio, data_fim):
 def load_vendas_diarias(data_inicio, data_fim):
     """Carrega vendas diárias"""
     query = LakehouseQueries.get_vendas_por_dia(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -267,7 +276,7 @@ def load_vendas_diarias(data_inicio, data_fim):
 def load_top_categorias(data_inicio, data_fim, limite=10):
     """Carrega top categorias"""
     query = LakehouseQueries.get_top_categorias(data_inicio, data_fim, limite)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -275,7 +284,7 @@ def load_top_categorias(data_inicio, data_fim, limite=10):
 def load_vendas_regiao(data_inicio, data_fim):
     """Carrega vendas por região"""
     query = LakehouseQueries.get_vendas_por_regiao(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -283,7 +292,7 @@ def load_vendas_regiao(data_inicio, data_fim):
 def load_top_produtos(data_inicio, data_fim, limite=20):
     """Carrega top produtos"""
     query = LakehouseQueries.get_top_produtos(data_inicio, data_fim, limite)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -291,7 +300,7 @@ def load_top_produtos(data_inicio, data_fim, limite=20):
 def load_analise_canais(data_inicio, data_fim):
     """Carrega análise por canais"""
     query = LakehouseQueries.get_analise_canais_venda(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -299,7 +308,7 @@ def load_analise_canais(data_inicio, data_fim):
 def load_tempo_entrega(data_inicio, data_fim):
     """Carrega tempo médio de entrega"""
     query = LakehouseQueries.get_tempo_medio_entrega(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -311,7 +320,7 @@ def load_rfv_analysis(data_inicio, data_fim, segmento="Todos"):
         data_fim,
         segmento if segmento != "Todos" else None,
     )
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -319,7 +328,7 @@ def load_rfv_analysis(data_inicio, data_fim, segmento="Todos"):
 def load_status(data_inicio, data_fim):
     """Carrega status dos pedidos"""
     query = LakehouseQueries.get_status(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -327,7 +336,7 @@ def load_status(data_inicio, data_fim):
 def load_region(data_inicio, data_fim):
     """Carrega dados por região"""
     query = LakehouseQueries.get_region(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -335,7 +344,7 @@ def load_region(data_inicio, data_fim):
 def load_timeline(data_inicio, data_fim):
     """Carrega timeline de pedidos"""
     query = LakehouseQueries.get_timeline(data_inicio, data_fim)
-    df = pd.read_sql(query, conn)
+    df = read_sql(query)
     return df
 
 
@@ -0,0 +1,141 @@
+# Benchmark do sink asyncpg: grava pedidos com itens gerados na hora, comparando o sink síncrono
+# (geração e gravação alternadas) com o asyncpg (gravação em N conexões enquanto a geração continua).
+# As tabelas ficam em um schema de benchmark, com os índices do modelo e sem chaves estrangeiras.
+# Uso: python -m benchmarks.bench_async --pedidos 200000 --conexoes 1 2 4 (conexão pelas variáveis DB_* do .env)
+
+# Bibliotecas utilizadas
+import argparse
+import time
+from contextlib import nullcontext
+from datetime import date
+import sqlalchemy as sa
+from sqlalchemy import text
+from benchmarks.bench_pedidos import clientes_sinteticos
+from src import loader
+from src import paralelo
+from src import pipeline
+from src import sinks
+from src.gerador import IndiceClientes
+from supabase.conect_supabase_db import Base, get_engine
+from supabase.model_supabase_db import itenspedido, pedidos
+
+SCHEMA_BENCH = "bench"
+
+
+class SinkDescarte:
+    """Sink que só consome os lotes, para medir o tempo da geração sozinha."""
+
+    banco = False
+    por_shard = False
+    batch_size = loader.DEFAULT_BATCH_SIZE["copy"]
+
+    def execucao(self):
+        return nullcontext(self)
+
+    def gravar(self, lotes):
+        return sum(len(dados) for lote in lotes for _, dados in lote)
+
+
+def criar_tabelas(engine):
+    """Recria pedidos e itens pedidos no schema de benchmark e retorna as tabelas."""
+    Base.metadata.create_all(engine)
+    originais = (pedidos.__table__, itenspedido.__table__)
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA_BENCH} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {SCHEMA_BENCH}"))
+        for table in originais:
+            connection.execute(
+                text(
+                    f"CREATE TABLE {SCHEMA_BENCH}.{table.name} (LIKE {table.name} INCLUDING INDEXES)",
+                ),
+            )
+
+        # Os itens usam o id da sequência (só os pedidos têm ids pré-atribuídos)
+        connection.execute(text(f"CREATE SEQUENCE {SCHEMA_BENCH}.itenspedido_id_seq"))
+        connection.execute(
+            text(
+                f"ALTER TABLE {SCHEMA_BENCH}.itenspedido ALTER COLUMN id "
+                f"SET DEFAULT nextval('{SCHEMA_BENCH}.itenspedido_id_seq')",
+            ),
+        )
+
+    metadata = sa.MetaData(schema=SCHEMA_BENCH)
+    return tuple(
+        sa.Table(
+            table.name,
+            metadata,
+            *(sa.Column(coluna.name, coluna.type) for coluna in table.columns),
+        )
+        for table in originais
+    )
+
+
+def medir(engine, sink, tabelas, quantidade, contexto, vetorizado):
+    """Gera e grava os pedidos com itens pelo sink e retorna o tempo gasto em segundos."""
+    with engine.begin() as connection:
+        connection.execute(
+            text(f"TRUNCATE {', '.join(f'{SCHEMA_BENCH}.{t.name}' for t in tabelas)}"),
+        )
+
+    inicio = time.perf_counter()
+    with sink.execucao():
+        pipeline.executar(
+            paralelo.gerar_shards(
+                "pedidos_com_itens",
+                quantidade,
+                1,
+                seed=1,
+                data_base=date(2026, 1, 1),
+                contexto=contexto,
+                vetorizado=vetorizado,
+            ),
+            sink,
+            tabelas,
+        )
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sink síncrono x asyncpg")
+    parser.add_argument("--pedidos", type=int, default=200000)
+    parser.add_argument("--conexoes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--vetorizado", action="store_true")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    tabelas = criar_tabelas(engine)
+    carregador = loader.BatchLoader(engine, mode="copy")
+    contexto = {
+        "clientes": IndiceClientes(clientes_sinteticos(10000)),
+        "ids_produtos": list(range(1, 201)),
+    }
+
+    cenarios = [
+        ("só geração", SinkDescarte()),
+        ("síncrono (COPY)", sinks.SinkPostgres(carregador)),
+    ] + [
+        (
+            f"asyncpg, {conexoes} conexões",
+            sinks.SinkAsyncpg(carregador, conexoes=conexoes),
+        )
+        for conexoes in args.conexoes
+    ]
+
+    resultados = {}
+    for nome, sink in cenarios:
+        tempo = medir(engine, sink, tabelas, args.pedidos, contexto, args.vetorizado)
+        resultados[nome] = tempo
+        print(f"{nome:>22}: {tempo:.2f}s ({args.pedidos / tempo:,.0f} pedidos/s)")
+
+    sincrono = resultados["síncrono (COPY)"]
+    for nome, tempo in resultados.items():
+        if nome.startswith("asyncpg"):
+            print(f"Ganho de {nome}: {sincrono / tempo:.2f}x")
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA_BENCH} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
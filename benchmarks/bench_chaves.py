@@ -0,0 +1,36 @@
+# Benchmark das chaves únicas: gera CPF, sufixo do e-mail e SKU para ids sequenciais (como uma carga
+# de 10 milhões de clientes) e confere que nenhuma chave se repete, medindo o custo por chave.
+# Uso: python -m benchmarks.bench_chaves --linhas 10000000
+
+# Bibliotecas utilizadas
+import argparse
+import time
+from src import chaves
+
+
+def medir(funcao, quantidade):
+    """Gera as chaves dos ids 1..quantidade e retorna o tempo gasto e a quantidade de chaves distintas."""
+    inicio = time.perf_counter()
+    distintas = len({funcao(id_linha) for id_linha in range(1, quantidade + 1)})
+    return time.perf_counter() - inicio, distintas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das chaves únicas")
+    parser.add_argument("--linhas", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    for nome, funcao in [
+        ("cpf", chaves.cpf),
+        ("sufixo do e-mail", chaves.sufixo_email),
+        ("sku", chaves.sku),
+    ]:
+        tempo, distintas = medir(funcao, args.linhas)
+        print(
+            f"{nome:>16}: {distintas:,} distintas de {args.linhas:,} "
+            f"({args.linhas - distintas} repetidas), {tempo / args.linhas * 1e6:.2f} µs/chave",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# Benchmark dos índices e do particionamento de pedidos: cria as tabelas do modelo (Base.metadata) em
+# um schema de benchmark, carrega pedidos e itens pedidos sintéticos (gerados no próprio PostgreSQL com
+# generate_series) e mede as consultas da pipeline (extração por faixa de datas, pedidos de um conjunto
+# de clientes e a junção de pedidos com itens do `update_pedidos`) sem índices, com os índices do
+# modelo (esquema.criar_indices) e com pedidos particionado por mês. O particionamento do modelo é lido
+# na importação (DB_PARTITION), então o cenário que pede o outro roda em um novo processo.
+# Uso: python -m benchmarks.bench_indices --pedidos 10000000 (conexão pelas variáveis DB_* do .env)
+
+# Bibliotecas utilizadas
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from sqlalchemy import text
+from src import esquema
+from supabase.conect_supabase_db import get_engine
+from supabase.model_supabase_db import (
+    MONEY_TYPE,
+    PARTICIONADO,
+    Base,
+    criar_particoes_pedidos,
+)
+
+SCHEMA_BENCH = "bench"
+CENARIOS = ("sem_indices", "indices", "particionado")
+
+# Janela de datas dos pedidos (um ano, como na carga completa)
+DATA_FINAL = date(2026, 1, 1)
+DATA_INICIAL = DATA_FINAL - timedelta(days=365)
+
+
+def dinheiro(maximo):
+    """Valor aleatório de até `maximo` reais no tipo das colunas de dinheiro do modelo."""
+    if MONEY_TYPE == "cents":
+        return f"(random() * {maximo * 100})::bigint"
+    return f"round((random() * {maximo})::numeric, 2)"
+
+
+# Expressões das colunas de pedidos (g: posição na generate_series) e de itens pedidos (p: o pedido,
+# n: a posição do item no pedido); as colunas anuláveis sem expressão ficam nulas
+COLUNAS_PEDIDOS = {
+    "id": "g",
+    "id_cliente": "1 + (random() * (:clientes - 1))::int",
+    "id_produto": "1 + (random() * 1999)::int",
+    "quantidade": "1 + (random() * 2)::int",
+    "subtotal": dinheiro(5000),
+    "data_pedido": "CAST(:data_inicial AS date) + (random() * 365)::int",
+    "id_canalvenda": "1 + (random() * 3)::int",
+    "frete": dinheiro(13),
+    "valor_desconto": dinheiro(500),
+    "total": dinheiro(5000),
+    "id_forma_pagamento": "1 + (random() * 4)::int",
+    "id_status": "1 + (random() * 4)::int",
+    "endereco_entrega": "'Rua ' || md5(g::text) || ', ' || g % 1000 || ' - Centro'",
+    "id_entregue": "1 + (random() * 1)::int",
+}
+COLUNAS_ITENS = {
+    "id": "(p.id - 1) * :itens + n",
+    "id_pedido": "p.id",
+    "data_pedido": "p.data_pedido",
+    "id_produto": "1 + (random() * 1999)::int",
+    "quantidade": "1 + (random() * 2)::int",
+    "preco_unitario": dinheiro(1000),
+    "subtotal": dinheiro(2000),
+}
+
+CONSULTAS = {
+    "extração de 7 dias": (
+        "SELECT count(*), sum(total) FROM {schema}.pedidos "
+        "WHERE data_pedido >= :data AND data_pedido < CAST(:data AS date) + 7"
+    ),
+    "pedidos de 50 clientes": (
+        "SELECT id, total FROM {schema}.pedidos WHERE id_cliente = ANY(:clientes)"
+    ),
+    "junção de 1.000 pedidos com itens": (
+        "SELECT p.id, sum(i.quantidade * i.preco_unitario) FROM {schema}.pedidos p "
+        "JOIN {schema}.itenspedido i ON i.id_pedido = p.id "
+        "WHERE p.id = ANY(:pedidos) GROUP BY p.id"
+    ),
+}
+
+
+def particionamento(cenario):
+    """DB_PARTITION do modelo usado pelo cenário."""
+    return "month" if cenario == "particionado" else "none"
+
+
+def criar_tabelas(connection):
+    """Recria o schema de benchmark com as tabelas do modelo, só com as chaves primárias.
+
+    As tabelas e as partições do modelo não têm schema: o search_path da transação as cria no de
+    benchmark. As tabelas além de pedidos e itens pedidos ficam vazias.
+    """
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA_BENCH} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {SCHEMA_BENCH}"))
+    connection.execute(text(f"SET LOCAL search_path TO {SCHEMA_BENCH}"))
+    esquema.criar_tabelas_sem_restricoes(connection, Base.metadata)
+    criar_particoes_pedidos(connection, DATA_INICIAL, DATA_FINAL)
+
+
+def inserir_select(table, expressoes, origem):
+    """INSERT ... SELECT com as colunas da tabela do modelo que têm expressão no benchmark."""
+    faltando = [
+        coluna.name
+        for coluna in table.columns
+        if not coluna.nullable and coluna.name not in expressoes
+    ]
+    if faltando:
+        raise ValueError(
+            f"Colunas de {table.name} sem expressão no benchmark: {faltando}",
+        )
+
+    colunas = [coluna.name for coluna in table.columns if coluna.name in expressoes]
+    return text(
+        f"INSERT INTO {table.name} ({', '.join(colunas)}) "
+        f"SELECT {', '.join(expressoes[coluna] for coluna in colunas)} FROM {origem}",
+    )
+
+
+def carregar(connection, quantidade, itens_por_pedido, clientes):
+    """Gera os pedidos e itens pedidos no banco e retorna o tempo gasto em segundos."""
+    inicio = time.perf_counter()
+    connection.execute(
+        inserir_select(
+            Base.metadata.tables["pedidos"],
+            COLUNAS_PEDIDOS,
+            "generate_series(1, :quantidade) g",
+        ),
+        {"clientes": clientes, "data_inicial": DATA_INICIAL, "quantidade": quantidade},
+    )
+    connection.execute(
+        inserir_select(
+            Base.metadata.tables["itenspedido"],
+            COLUNAS_ITENS,
+            "pedidos p CROSS JOIN generate_series(1, :itens) n",
+        ),
+        {"itens": itens_por_pedido},
+    )
+    return time.perf_counter() - inicio
+
+
+def criar_indices(connection):
+    """Cria os índices e as restrições unique do modelo e retorna o tempo gasto em segundos."""
+    inicio = time.perf_counter()
+    esquema.criar_indices(connection, Base.metadata)
+    return time.perf_counter() - inicio
+
+
+def tamanho(connection):
+    """Tamanho total (dados e índices) das tabelas do benchmark, em MB."""
+    return connection.execute(
+        text(
+            "SELECT sum(pg_total_relation_size(c.oid)) / 1024.0 / 1024.0 FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema AND c.relkind = 'r'",
+        ),
+        {"schema": SCHEMA_BENCH},
+    ).scalar()
+
+
+def medir_consultas(connection, quantidade, clientes, repeticoes):
+    """Mediana do tempo de cada consulta, em ms, com parâmetros sorteados a cada repetição."""
+    rng = random.Random(1)
+    tempos = {}
+    for nome, sql in CONSULTAS.items():
+        consulta = text(sql.format(schema=SCHEMA_BENCH))
+        medidas = []
+        for _ in range(repeticoes):
+            parametros = {
+                "data": DATA_INICIAL + timedelta(days=rng.randrange(358)),
+                "clientes": [rng.randint(1, clientes) for _ in range(50)],
+                "pedidos": [rng.randint(1, quantidade) for _ in range(1000)],
+            }
+            parametros = {
+                chave: parametros[chave] for chave in consulta.compile().params
+            }
+            inicio = time.perf_counter()
+            connection.execute(consulta, parametros).fetchall()
+            medidas.append(time.perf_counter() - inicio)
+        tempos[nome] = statistics.median(medidas) * 1000
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark dos índices e do particionamento de pedidos",
+    )
+    parser.add_argument("--pedidos", type=int, default=10_000_000)
+    parser.add_argument("--itens-por-pedido", type=int, default=2)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument(
+        "--cenarios",
+        nargs="+",
+        choices=CENARIOS,
+        default=list(CENARIOS),
+    )
+    # Cenário executado a pedido de outro processo, com o DB_PARTITION do cenário
+    parser.add_argument("--subprocesso", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Um cliente para cada 10 pedidos, como nas proporções do fator de escala
+    clientes = max(1, args.pedidos // 10)
+
+    engine = get_engine()
+    if not args.subprocesso:
+        with engine.connect() as connection:
+            versao = connection.execute(text("SHOW server_version")).scalar()
+        print(f"PostgreSQL {versao}, MONEY_TYPE={MONEY_TYPE}")
+
+    for cenario in args.cenarios:
+        if (particionamento(cenario) == "month") != PARTICIONADO:
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_indices",
+                    "--pedidos",
+                    str(args.pedidos),
+                    "--itens-por-pedido",
+                    str(args.itens_por_pedido),
+                    "--repeticoes",
+                    str(args.repeticoes),
+                    "--cenarios",
+                    cenario,
+                    "--subprocesso",
+                ],
+                env={**os.environ, "DB_PARTITION": particionamento(cenario)},
+                check=True,
+            )
+            continue
+
+        with engine.begin() as connection:
+            criar_tabelas(connection)
+            tempo_carga = carregar(
+                connection,
+                args.pedidos,
+                args.itens_por_pedido,
+                clientes,
+            )
+            tempo_indices = (
+                criar_indices(connection) if cenario != "sem_indices" else 0.0
+            )
+
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT",
+        ) as connection:
+            connection.execute(text(f"ANALYZE {SCHEMA_BENCH}.pedidos"))
+            connection.execute(text(f"ANALYZE {SCHEMA_BENCH}.itenspedido"))
+            tempos = medir_consultas(
+                connection,
+                args.pedidos,
+                clientes,
+                args.repeticoes,
+            )
+            megabytes = tamanho(connection)
+
+        print(
+            f"{cenario}: carga {tempo_carga:.1f}s, índices {tempo_indices:.1f}s, "
+            f"{megabytes:,.0f} MB",
+        )
+        for nome, tempo in tempos.items():
+            print(f"  {nome + ':':<36} {tempo:9.2f} ms")
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA_BENCH} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
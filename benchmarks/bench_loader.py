@@ -0,0 +1,74 @@
+# Benchmark do carregador em lote: compara o INSERT em lotes de 10 linhas (carga original), o INSERT
+# com insertmanyvalues em lotes maiores e o COPY FROM STDIN, gravando clientes em uma tabela temporária.
+# Uso: python -m benchmarks.bench_loader --linhas 20000 (conexão definida pelas variáveis DB_* do .env)
+
+# Bibliotecas utilizadas
+import argparse
+import time
+import sqlalchemy as sa
+from sqlalchemy import text
+from src import loader
+from src.gerador import GeradorDados
+from supabase.conect_supabase_db import get_engine
+from supabase.model_supabase_db import clientes
+
+TABELA_BENCH = "bench_clientes"
+
+
+def criar_tabela_temporaria(connection):
+    """Cria uma tabela temporária com a mesma estrutura de clientes, sem índices e restrições."""
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABELA_BENCH}"))
+    connection.execute(text(f"CREATE TEMP TABLE {TABELA_BENCH} (LIKE clientes)"))
+    connection.execute(
+        text(f"ALTER TABLE {TABELA_BENCH} ALTER COLUMN id DROP NOT NULL"),
+    )
+    connection.commit()
+
+    return sa.Table(
+        TABELA_BENCH,
+        sa.MetaData(),
+        *(sa.Column(coluna.name, coluna.type) for coluna in clientes.__table__.columns),
+    )
+
+
+def medir(connection, tabela, linhas, mode, tamanho_lote):
+    """Grava as linhas na tabela temporária e retorna o tempo gasto em segundos."""
+    inicio = time.perf_counter()
+
+    for i in range(0, len(linhas), tamanho_lote):
+        with connection.begin():
+            loader.write_batch(connection, tabela, linhas[i : i + tamanho_lote], mode)
+
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark INSERT x COPY")
+    parser.add_argument("--linhas", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"Gerando {args.linhas} clientes...")
+    linhas = list(GeradorDados(seed=1).clientes(args.linhas, 1))
+
+    resultados = {}
+    with get_engine().connect() as connection:
+        for mode, tamanho_lote in [
+            ("insert", 10),
+            ("insert", loader.default_batch_size("insert")),
+            ("copy", loader.default_batch_size("copy")),
+        ]:
+            tabela = criar_tabela_temporaria(connection)
+            tempo = medir(connection, tabela, linhas, mode, tamanho_lote)
+            resultados[(mode, tamanho_lote)] = tempo
+            print(
+                f"{mode:>6}: {tempo:.2f}s "
+                f"({args.linhas / tempo:,.0f} linhas/s, lote de {tamanho_lote})",
+            )
+
+    original = resultados[("insert", 10)]
+    for (mode, tamanho_lote), tempo in resultados.items():
+        print(f"Ganho de {mode} (lote de {tamanho_lote}): {original / tempo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
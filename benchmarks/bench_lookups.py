@@ -0,0 +1,130 @@
+# Benchmark das consultas aos dados auxiliares feitas por linha gerada: compara a versão anterior
+# (`MARCAS.index(marca)`, `list(CBE.keys())` e pesos recalculados a cada linha) com as estruturas
+# pré-calculadas de `src/list_auxiliar.py`, o sorteio do local por pesos acumulados com o amostrador
+# alias (um a um e em lote com NumPy) e mede o custo por linha de clientes e produtos, com o Faker a
+# cada linha e com os pools do Faker em disco (`--pools`).
+# Uso: python -m benchmarks.bench_lookups --linhas 200000 --locais-lote 10000000
+
+# Bibliotecas utilizadas
+import argparse
+import random
+import time
+from datetime import date
+import numpy as np
+from src import list_auxiliar
+from src import pools
+from src.gerador import GeradorDados
+
+MARCAS = list_auxiliar.MARCAS
+MODELOS = list_auxiliar.MODELOS
+CBE = list_auxiliar.CBE
+
+
+def consultas_anteriores(rng, quantidade):
+    """Consultas por linha da versão anterior: busca linear da marca e listas do CBE recriadas."""
+    for _ in range(quantidade):
+        marca = rng.choice(MARCAS)
+        MARCAS.index(marca) + 1
+        rng.choice(MODELOS.get(marca))
+        rng.choices(
+            ["37", "38", "39", "40", "41", "42", "43", "44"],
+            weights=[5, 8, 15, 18, 18, 15, 8, 5],
+            k=1,
+        )[0]
+        estado = rng.choice(list(CBE.keys()))
+        cidade = rng.choice(list(CBE[estado].keys()))
+        rng.choice(CBE[estado][cidade])
+
+
+def consultas_pre_calculadas(rng, quantidade):
+    """As mesmas consultas pelos mapas e arrays achatados de `list_auxiliar`."""
+    id_marca = list_auxiliar.ID_MARCA
+    modelos_por_marca = list_auxiliar.MODELOS_POR_MARCA
+    tamanhos, pesos_acumulados = list_auxiliar.TAMANHOS_POR_GENERO[1]
+    amostrador = list_auxiliar.AMOSTRADORES_LOCAIS["uniform"]
+
+    for _ in range(quantidade):
+        marca = rng.choice(MARCAS)
+        id_marca[marca]
+        rng.choice(modelos_por_marca[marca])
+        rng.choices(tamanhos, cum_weights=pesos_acumulados)[0]
+        local = amostrador.sortear(rng)
+        list_auxiliar.LOCAIS_ESTADOS[local]
+        list_auxiliar.LOCAIS_CIDADES[local]
+        list_auxiliar.LOCAIS_BAIRROS[local]
+
+
+def locais_pesos_acumulados(rng, quantidade):
+    """Sorteio dos locais por busca binária nos pesos acumulados."""
+    locais = list_auxiliar.LOCAIS
+    pesos = list_auxiliar.PESOS_ACUMULADOS_LOCAIS
+    for _ in range(quantidade):
+        rng.choices(locais, cum_weights=pesos)[0]
+
+
+def locais_alias(rng, quantidade):
+    """Sorteio dos locais pelo amostrador alias, um por vez."""
+    amostrador = list_auxiliar.AMOSTRADORES_LOCAIS["uniform"]
+    for _ in range(quantidade):
+        amostrador.sortear(rng)
+
+
+def locais_alias_lote(quantidade):
+    """Sorteio dos locais pelo amostrador alias em um único lote NumPy, já convertidos em estados."""
+    amostrador = list_auxiliar.AMOSTRADORES_LOCAIS["population"]
+    posicoes = amostrador.sortear_lote(np.random.default_rng(1), quantidade)
+    list_auxiliar.LOCAIS_ESTADOS_NP[posicoes]
+
+
+def medir(funcao, *args):
+    """Tempo gasto pela função, em segundos."""
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark das consultas aos dados auxiliares",
+    )
+    parser.add_argument("--linhas", type=int, default=200_000)
+    parser.add_argument("--linhas-gerador", type=int, default=5_000)
+    parser.add_argument("--locais-lote", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    anterior = medir(consultas_anteriores, random.Random(1), args.linhas)
+    pre_calculada = medir(consultas_pre_calculadas, random.Random(1), args.linhas)
+    print(f"Consultas anteriores:      {anterior / args.linhas * 1e6:6.2f} µs/linha")
+    print(
+        f"Consultas pré-calculadas:  {pre_calculada / args.linhas * 1e6:6.2f} µs/linha",
+    )
+    print(f"Ganho: {anterior / pre_calculada:.2f}x")
+
+    for nome, funcao in [
+        ("pesos acumulados", locais_pesos_acumulados),
+        ("alias", locais_alias),
+    ]:
+        tempo = medir(funcao, random.Random(1), args.linhas)
+        print(f"Local por {nome + ':':<18} {tempo / args.linhas * 1e6:6.3f} µs/sorteio")
+
+    tempo = medir(locais_alias_lote, args.locais_lote)
+    print(
+        f"Local por alias em lote: {args.locais_lote:,} sorteios em {tempo:.2f}s "
+        f"({tempo / args.locais_lote * 1e9:.0f} ns/sorteio)",
+    )
+
+    # Custo por linha do gerador completo: o Faker domina o tempo sem os pools
+    for modo, pools_faker in [("Faker", None), ("pools", pools.carregar())]:
+        gerador = GeradorDados(seed=1, data_base=date(2026, 1, 1), pools=pools_faker)
+        for entidade in ("clientes", "produtos"):
+            tempo = medir(
+                lambda: list(getattr(gerador, entidade)(args.linhas_gerador, 1)),
+            )
+            print(
+                f"Gerador de {entidade} ({modo}): "
+                f"{tempo / args.linhas_gerador * 1e6:6.1f} µs/linha",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Benchmark da geração de pedidos: mostra que o custo por pedido é constante (escala linear até
+# 1 milhão de pedidos) com o índice de clientes, e compara com a busca linear `ids.index(id)`.
+# Uso: python -m benchmarks.bench_pedidos --clientes 100000 --pedidos 10000 100000 1000000
+
+# Bibliotecas utilizadas
+import argparse
+import random
+import time
+from datetime import date
+from types import SimpleNamespace
+from src.gerador import GeradorDados, IndiceClientes
+
+
+def clientes_sinteticos(quantidade):
+    """Cria clientes mínimos (sem Faker) apenas com os campos usados pelos pedidos."""
+    estados = ["SP", "RJ", "MG", "BA", "PR", "RS"]
+    return [
+        SimpleNamespace(
+            id=i,
+            estado=random.choice(estados),
+            endereco=f"Rua {i}, {i % 1000}",
+            bairro="Centro",
+            cidade="Cidade",
+        )
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def medir_indice(indice, quantidade):
+    """Tempo para gerar `quantidade` pedidos usando o índice de clientes."""
+    gerador = GeradorDados(seed=1, data_base=date(2026, 1, 1))
+    inicio = time.perf_counter()
+    for _ in gerador.pedidos(quantidade, 1, indice, ids_produtos=list(range(1, 201))):
+        pass
+    return time.perf_counter() - inicio
+
+
+def medir_busca_linear(clientes, quantidade):
+    """Tempo das 5 buscas `ids.index(id)` por pedido feitas pela versão anterior."""
+    ids_clientes = [cliente.id for cliente in clientes]
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        id_cliente = random.choice(ids_clientes)
+        for _ in range(5):
+            clientes[ids_clientes.index(id_cliente)].estado
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da geração de pedidos")
+    parser.add_argument("--clientes", type=int, default=100_000)
+    parser.add_argument(
+        "--pedidos",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+    )
+    args = parser.parse_args()
+
+    clientes = clientes_sinteticos(args.clientes)
+
+    inicio = time.perf_counter()
+    indice = IndiceClientes(clientes)
+    print(f"Índice de {args.clientes} clientes: {time.perf_counter() - inicio:.2f}s")
+
+    for quantidade in args.pedidos:
+        tempo = medir_indice(indice, quantidade)
+        print(
+            f"{quantidade:>9} pedidos: {tempo:7.2f}s "
+            f"({tempo / quantidade * 1e6:.1f} µs/pedido)",
+        )
+
+    # A busca linear é medida em poucos pedidos, pois cresce com pedidos x clientes
+    amostra = 1_000
+    tempo = medir_busca_linear(clientes, amostra)
+    print(
+        f"Busca linear (anterior), só a busca do cliente: "
+        f"{tempo / amostra * 1e6:.1f} µs/pedido com {args.clientes} clientes",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
 import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
 from databricks.sql import connect
+from databricks.sql.exc import InterfaceError, OperationalError, RequestError
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Pool de conexões do dashboard: conexões por warehouse (DATABRICKS_POOL_SIZE_<warehouse> sobrescreve
+# o valor de um warehouse), segundos de espera por uma conexão livre e segundos ociosos após os quais a
+# conexão é testada (SELECT 1) antes de ser usada
+DATABRICKS_POOL_SIZE = int(os.getenv("DATABRICKS_POOL_SIZE", "4"))
+DATABRICKS_POOL_TIMEOUT = float(os.getenv("DATABRICKS_POOL_TIMEOUT", "30"))
+DATABRICKS_HEALTH_CHECK_AFTER = float(os.getenv("DATABRICKS_HEALTH_CHECK_AFTER", "60"))
 
-def connect_to_databricks():
-    """Conecta ao Databricks"""
+# Erros do conector que indicam uma conexão perdida (e não uma query inválida)
+ERROS_CONEXAO = (OperationalError, RequestError, InterfaceError, ConnectionError)
+
+
+def connect_to_databricks(http_path=None):
+    """Conecta ao Databricks (no warehouse de `http_path` ou no do .env)"""
     try:
         connection = connect(
             server_hostname=os.getenv("DATABRICKS_HOST"),
-            http_path=os.getenv("DATABRICKS_HTTP_PATH"),
+            http_path=http_path or os.getenv("DATABRICKS_HTTP_PATH"),
             access_token=os.getenv("DATABRICKS_TOKEN"),
             catalog=os.getenv("DATABRICKS_CATALOG"),
             schema=os.getenv("DATABRICKS_SCHEMA"),
@@ -22,5 +38,139 @@ def connect_to_databricks():
         raise
 
 
+def tamanho_pool(http_path=None):
+    """Conexões do pool do warehouse: DATABRICKS_POOL_SIZE_<warehouse> ou DATABRICKS_POOL_SIZE.
+
+    O warehouse é o último trecho do `http_path` (ex.: /sql/1.0/warehouses/abc123 -> ABC123).
+    """
+    http_path = http_path or os.getenv("DATABRICKS_HTTP_PATH") or ""
+    warehouse = re.sub(r"\W", "_", http_path.rstrip("/").rsplit("/", 1)[-1]).upper()
+    if warehouse:
+        tamanho = os.getenv(f"DATABRICKS_POOL_SIZE_{warehouse}")
+        if tamanho:
+            return int(tamanho)
+    return DATABRICKS_POOL_SIZE
+
+
+def erro_de_conexao(erro):
+    """Verifica se o erro (ou a causa explícita, ex.: o DatabaseError do pandas) é de conexão perdida.
+
+    Só a causa (`raise ... from`) é seguida: um erro de query levantado enquanto outro era tratado
+    não é confundido com uma queda de conexão.
+    """
+    while erro is not None:
+        if isinstance(erro, ERROS_CONEXAO):
+            return True
+        erro = erro.__cause__
+    return False
+
+
+def fechar_conexao(connection):
+    """Fecha a conexão ignorando erros (ela pode já ter caído)."""
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class PoolDatabricks:
+    """Pool de conexões de um warehouse, seguro para as threads das sessões do Streamlit.
+
+    As conexões são abertas sob demanda até `tamanho`; quem chega com todas em uso espera até
+    `timeout` segundos. Uma conexão ociosa há mais de `verificar_apos` segundos é testada antes de
+    ser entregue e, se a conexão cair durante uma consulta, ela é descartada junto com as ociosas e a
+    consulta é repetida uma vez em uma conexão nova.
+    """
+
+    def __init__(self, http_path=None, tamanho=None, timeout=None, verificar_apos=None):
+        self.http_path = http_path
+        self.tamanho = tamanho or tamanho_pool(http_path)
+        self.timeout = DATABRICKS_POOL_TIMEOUT if timeout is None else timeout
+        self.verificar_apos = (
+            DATABRICKS_HEALTH_CHECK_AFTER if verificar_apos is None else verificar_apos
+        )
+
+        # Vagas do pool e conexões livres com o instante do último uso (a mais recente sai primeiro)
+        self._vagas = threading.BoundedSemaphore(self.tamanho)
+        self._livres = queue.LifoQueue()
+
+    def _saudavel(self, connection):
+        """Testa a conexão com um SELECT 1."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            return True
+        except Exception:
+            return False
+
+    def _retirar(self):
+        """Reserva uma vaga e retorna uma conexão livre (testada se ociosa) ou uma nova."""
+        if not self._vagas.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"Nenhuma conexão livre com o Databricks após {self.timeout}s "
+                f"(pool de {self.tamanho} conexões)",
+            )
+
+        try:
+            while True:
+                try:
+                    connection, ultimo_uso = self._livres.get_nowait()
+                except queue.Empty:
+                    return connect_to_databricks(self.http_path)
+
+                ocioso = time.monotonic() - ultimo_uso > self.verificar_apos
+                if not ocioso or self._saudavel(connection):
+                    return connection
+                fechar_conexao(connection)
+        except BaseException:
+            self._vagas.release()
+            raise
+
+    def _descartar_livres(self):
+        """Fecha as conexões ociosas (após uma queda, provavelmente também caíram)."""
+        while True:
+            try:
+                connection, _ = self._livres.get_nowait()
+            except queue.Empty:
+                return
+            fechar_conexao(connection)
+
+    @contextmanager
+    def conexao(self):
+        """Empresta uma conexão do pool; conexões perdidas são fechadas em vez de devolvidas."""
+        connection = self._retirar()
+        try:
+            yield connection
+        except BaseException as erro:
+            if erro_de_conexao(erro):
+                fechar_conexao(connection)
+                self._descartar_livres()
+            else:
+                self._livres.put((connection, time.monotonic()))
+            raise
+        else:
+            self._livres.put((connection, time.monotonic()))
+        finally:
+            self._vagas.release()
+
+    def executar(self, funcao):
+        """Executa `funcao(conexao)`, repetindo uma vez em uma conexão nova se a conexão cair."""
+        try:
+            with self.conexao() as connection:
+                return funcao(connection)
+        except Exception as erro:
+            if not erro_de_conexao(erro):
+                raise
+            print(f"Conexão com o Databricks perdida, reconectando: {erro}")
+
+        with self.conexao() as connection:
+            return funcao(connection)
+
+    def fechar(self):
+        """Fecha as conexões livres do pool."""
+        self._descartar_livres()
+
+
 if __name__ == "__main__":
     conn = connect_to_databricks()
@@ -0,0 +1,117 @@
+# Script com o agendador das cargas: monta um grafo de dependências (DAG) a partir das chaves
+# estrangeiras do modelo e executa em paralelo as cargas independentes (ex.: clientes e produtos),
+# esperando apenas as cargas das tabelas referenciadas.
+
+# Bibliotecas utilizadas
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Carga:
+    """Uma etapa da carga: a função executada, as tabelas em que ela insere e as que só atualiza."""
+
+    def __init__(self, nome, funcao, tabelas, depois_de=(), atualiza=()):
+        self.nome = nome
+        self.funcao = funcao
+        self.tabelas = list(tabelas)
+
+        # Tabelas só atualizadas: a carga espera todas as cargas que inserem nelas
+        self.atualiza = list(atualiza)
+
+        # Dependências que não aparecem nas chaves estrangeiras (ex.: atualizar pedidos após os itens)
+        self.depois_de = set(depois_de)
+
+
+def tabelas_referenciadas(tabelas):
+    """Tabelas referenciadas pelas chaves estrangeiras das tabelas informadas (exceto elas mesmas)."""
+    nomes = {table.name for table in tabelas}
+    return {
+        fk.column.table.name
+        for table in tabelas
+        for fk in table.foreign_keys
+        if fk.column.table.name not in nomes
+    }
+
+
+def dependencias(cargas):
+    """Cargas das quais cada carga depende.
+
+    Uma carga espera todas as cargas que inserem nas tabelas referenciadas pelas suas chaves
+    estrangeiras ou nas tabelas que ela só atualiza, em qualquer posição da lista, além das cargas
+    listadas em `depois_de`. Cargas que inserem na mesma tabela rodam na ordem declarada.
+    """
+    grafo = {}
+
+    for posicao, carga in enumerate(cargas):
+        proprias = {table.name for table in carga.tabelas}
+        necessarias = tabelas_referenciadas(carga.tabelas) | {
+            table.name for table in carga.atualiza
+        }
+        grafo[carga.nome] = set(carga.depois_de)
+
+        for indice, outra in enumerate(cargas):
+            if outra is carga:
+                continue
+            gravadas = {table.name for table in outra.tabelas}
+            if gravadas & necessarias or (indice < posicao and gravadas & proprias):
+                grafo[carga.nome].add(outra.nome)
+
+    nomes = set(grafo)
+    for nome, dependencias_carga in grafo.items():
+        desconhecidas = dependencias_carga - nomes
+        if desconhecidas:
+            raise ValueError(
+                f"Carga {nome} depende de cargas inexistentes: {desconhecidas}",
+            )
+
+    return grafo
+
+
+def ordem_topologica(grafo):
+    """Ordena as cargas de modo que cada uma venha depois das suas dependências.
+
+    Entre as cargas prontas, mantém a ordem de `grafo`; um ciclo de dependências gera um erro.
+    """
+    ordem = []
+    restantes = dict(grafo)
+    while restantes:
+        prontas = [
+            nome
+            for nome, dependencias_carga in restantes.items()
+            if dependencias_carga <= set(ordem)
+        ]
+        if not prontas:
+            raise ValueError(
+                f"Dependência circular entre as cargas: {sorted(restantes)}",
+            )
+        for nome in prontas:
+            ordem.append(nome)
+            del restantes[nome]
+    return ordem
+
+
+def executar(cargas, paralelas=None):
+    """Executa as cargas respeitando as dependências, até `paralelas` ao mesmo tempo.
+
+    Cada carga roda em uma thread e abre as próprias transações, em conexões separadas do pool.
+    Um erro em uma carga interrompe o agendamento das seguintes e é repassado ao chamador.
+    """
+    grafo = dependencias(cargas)
+    por_nome = {carga.nome: carga for carga in cargas}
+    pendentes = {nome: por_nome[nome] for nome in ordem_topologica(grafo)}
+    concluidas = set()
+
+    with ThreadPoolExecutor(max_workers=paralelas or len(cargas) or 1) as executor:
+        em_execucao = {}
+
+        while pendentes or em_execucao:
+            # Agenda, na ordem topológica, as cargas com todas as dependências concluídas
+            for nome, carga in list(pendentes.items()):
+                if grafo[nome] <= concluidas:
+                    em_execucao[executor.submit(carga.funcao)] = nome
+                    del pendentes[nome]
+
+            prontas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in prontas:
+                nome = em_execucao.pop(futuro)
+                futuro.result()
+                concluidas.add(nome)
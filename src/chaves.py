@@ -0,0 +1,91 @@
+# Script com a geração das chaves únicas (CPF, sufixo do e-mail e SKU) a partir do id da linha: uma
+# permutação pseudoaleatória leva cada id a um número distinto, sem guardar as chaves já usadas e
+# sem inserções repetidas por violação das restrições `unique` do modelo.
+
+# Bibliotecas utilizadas
+import hashlib
+
+# Faixa dos números das chaves: 9 dígitos (base do CPF e corpo do SKU)
+FAIXA_CHAVES = 10**9
+
+# Rodadas da rede de Feistel
+RODADAS = 4
+
+# Prefixo EAN dos SKUs (mesmo formato ISBN-13 gerado antes pelo Faker)
+PREFIXO_SKU = "978"
+
+
+class Permutacao:
+    """Permutação bijetora de [0, faixa), embaralhada por uma rede de Feistel com chaves do nome.
+
+    A rede permuta os números de `2 * bits_metade` bits; os que caem fora da faixa são permutados
+    de novo (cycle walking) até voltar a ela, o que mantém a bijeção dentro da faixa.
+    """
+
+    def __init__(self, nome, faixa=FAIXA_CHAVES):
+        self.faixa = faixa
+        self.bits_metade = ((faixa - 1).bit_length() + 1) // 2
+        self.mascara = (1 << self.bits_metade) - 1
+
+        # As chaves das rodadas dependem só do nome, então a permutação é a mesma em toda execução
+        digest = hashlib.blake2b(nome.encode(), digest_size=4 * RODADAS).digest()
+        self.chaves_rodadas = [
+            int.from_bytes(digest[posicao : posicao + 4], "big")
+            for posicao in range(0, 4 * RODADAS, 4)
+        ]
+
+    def _rodada(self, metade, chave):
+        """Função de mistura de uma rodada (não precisa ser inversível)."""
+        mistura = (metade * 0x9E3779B1 + chave) & 0xFFFFFFFF
+        mistura = ((mistura ^ (mistura >> 15)) * 0x85EBCA6B) & 0xFFFFFFFF
+        return (mistura ^ (mistura >> 13)) & self.mascara
+
+    def _feistel(self, numero):
+        esquerda = numero >> self.bits_metade
+        direita = numero & self.mascara
+        for chave in self.chaves_rodadas:
+            esquerda, direita = direita, esquerda ^ self._rodada(direita, chave)
+        return (esquerda << self.bits_metade) | direita
+
+    def __call__(self, numero):
+        """Número permutado de `numero`: números distintos sempre levam a resultados distintos."""
+        if not 0 <= numero < self.faixa:
+            raise ValueError(f"Número fora da faixa da permutação: {numero}")
+
+        numero = self._feistel(numero)
+        while numero >= self.faixa:
+            numero = self._feistel(numero)
+        return numero
+
+
+# Uma permutação por chave, para que CPF, e-mail e SKU de um mesmo id não sejam correlacionados
+PERMUTACAO_CPF = Permutacao("cpf")
+PERMUTACAO_EMAIL = Permutacao("email")
+PERMUTACAO_SKU = Permutacao("sku")
+
+
+def cpf(id_cliente):
+    """CPF válido e formatado, único para cada id de cliente."""
+    digitos = [int(digito) for digito in f"{PERMUTACAO_CPF(id_cliente):09d}"]
+    for tamanho in (9, 10):
+        soma = sum(
+            digito * peso for digito, peso in zip(digitos, range(tamanho + 1, 1, -1))
+        )
+        digitos.append(soma * 10 % 11 % 10)
+
+    numero = "".join(map(str, digitos))
+    return f"{numero[:3]}.{numero[3:6]}.{numero[6:9]}-{numero[9:]}"
+
+
+def sufixo_email(id_cliente):
+    """Número após o nome no e-mail: como os nomes não têm dígitos, o e-mail fica único."""
+    return str(PERMUTACAO_EMAIL(id_cliente))
+
+
+def sku(id_produto):
+    """SKU no formato ISBN-13 (com dígito verificador), único para cada id de produto."""
+    corpo = f"{PREFIXO_SKU}{PERMUTACAO_SKU(id_produto):09d}"
+    soma = sum(
+        int(digito) * (3 if posicao % 2 else 1) for posicao, digito in enumerate(corpo)
+    )
+    return corpo + str(-soma % 10)
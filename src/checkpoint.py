@@ -0,0 +1,136 @@
+# Script com o registro de progresso (checkpoints) das cargas: cada shard gravado registra, na mesma
+# transação das suas linhas, a execução, a entidade, a posição do shard (que define a sua semente) e a
+# faixa de ids. Uma execução interrompida é retomada com os mesmos parâmetros, gerando só os shards
+# que faltam, sem duplicar linhas.
+
+# Bibliotecas utilizadas
+import json
+from datetime import datetime
+import sqlalchemy as sa
+
+# Tabelas de controle, fora do modelo replicado (Base.metadata), criadas sob demanda
+metadata = sa.MetaData()
+
+execucoes = sa.Table(
+    "checkpoint_execucoes",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("parametros", sa.Text, nullable=False),
+    sa.Column("iniciada_em", sa.DateTime, nullable=False),
+    sa.Column("concluida_em", sa.DateTime),
+)
+
+shards = sa.Table(
+    "checkpoint_shards",
+    metadata,
+    sa.Column(
+        "execucao",
+        sa.Integer,
+        sa.ForeignKey("checkpoint_execucoes.id"),
+        primary_key=True,
+    ),
+    sa.Column("entidade", sa.String(50), primary_key=True),
+    sa.Column("shard", sa.Integer, primary_key=True),
+    sa.Column("id_inicial", sa.BigInteger, nullable=False),
+    sa.Column("id_final", sa.BigInteger, nullable=False),
+    sa.Column("linhas", sa.Integer, nullable=False),
+    sa.Column("gravado_em", sa.DateTime, nullable=False),
+)
+
+
+class Checkpoint:
+    """Registro dos shards gravados por execução, guardado no próprio banco de destino."""
+
+    def __init__(self, carregador):
+        self.carregador = carregador
+        self.execucao = None
+
+    def retomar(self, data_base=None):
+        """Cria as tabelas de controle e retorna os parâmetros da última execução não concluída.
+
+        Com `data_base`, só retoma a execução da mesma data base (ex.: a carga diária interrompida
+        não é retomada no dia seguinte, com as datas do dia anterior). Retorna None se não há
+        execução a retomar (a execução atual é nova).
+        """
+        with self.carregador.transaction() as connection:
+            metadata.create_all(connection)
+            linha = connection.execute(
+                sa.select(execucoes.c.id, execucoes.c.parametros)
+                .where(execucoes.c.concluida_em.is_(None))
+                .order_by(execucoes.c.id.desc())
+                .limit(1),
+            ).first()
+
+        if linha is None:
+            return None
+
+        parametros = json.loads(linha.parametros)
+        if data_base is not None and parametros["data_base"] != data_base:
+            print(
+                f"Execução {linha.id} interrompida com outra data base ({parametros['data_base']}) "
+                "não será retomada",
+            )
+            return None
+
+        self.execucao = linha.id
+        return parametros
+
+    def iniciar(self, parametros):
+        """Registra uma execução nova com os parâmetros necessários para retomá-la."""
+        with self.carregador.transaction() as connection:
+            self.execucao = connection.execute(
+                execucoes.insert()
+                .values(parametros=json.dumps(parametros), iniciada_em=datetime.now())
+                .returning(execucoes.c.id),
+            ).scalar_one()
+
+    def concluir(self):
+        """Marca a execução como concluída; a próxima execução começa do zero."""
+        with self.carregador.transaction() as connection:
+            connection.execute(
+                execucoes.update()
+                .where(execucoes.c.id == self.execucao)
+                .values(concluida_em=datetime.now()),
+            )
+
+    def gravados(self, connection, entidade):
+        """Shards da entidade já gravados nesta execução, pela posição."""
+        return {
+            linha.shard: linha
+            for linha in connection.execute(
+                sa.select(shards)
+                .where(
+                    shards.c.execucao == self.execucao,
+                    shards.c.entidade == entidade,
+                )
+                .order_by(shards.c.shard),
+            )
+        }
+
+    def marcador(self, entidade, pendentes):
+        """Função do pipeline que acrescenta a cada shard fatiado a sua linha de checkpoint.
+
+        `pendentes` são os shards gerados (posição, id inicial e tamanho), na ordem em que chegam;
+        a linha de checkpoint segue no mesmo shard e é gravada na mesma transação das linhas.
+        """
+
+        def marcar(lotes):
+            for (indice, inicio, tamanho), lote in zip(pendentes, lotes):
+                yield lote + [
+                    (
+                        shards,
+                        [
+                            {
+                                "execucao": self.execucao,
+                                "entidade": entidade,
+                                "shard": indice,
+                                "id_inicial": inicio,
+                                "id_final": inicio + tamanho - 1,
+                                "linhas": tamanho,
+                                "gravado_em": datetime.now(),
+                            },
+                        ],
+                    ),
+                ]
+
+        return marcar
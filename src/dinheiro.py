@@ -0,0 +1,49 @@
+# Script com os valores monetários do gerador: preços, fretes, descontos e totais são calculados em
+# centavos inteiros, sem arredondar a cada conta, e convertidos só na saída para o tipo das colunas de
+# dinheiro do modelo (MONEY_TYPE). As funções aceitam inteiros e arrays NumPy (lotes vetorizados).
+
+# Bibliotecas utilizadas
+from supabase.model_supabase_db import MONEY_TYPE
+
+# Frete dos estados sem frete grátis e valor mínimo do pedido com desconto, em centavos
+FRETE = 1250
+MINIMO_DESCONTO = 20000
+
+
+def centavos(reais):
+    """Centavos de um valor sorteado em reais (um float ou um array), arredondados ao centavo."""
+    if hasattr(reais, "dtype"):
+        return (reais * 100).round().astype("int64")
+    return round(reais * 100)
+
+
+def desconto(subtotal):
+    """Desconto de 10% nos pedidos acima de R$ 200,00, arredondado ao centavo (metade para cima)."""
+    return (subtotal > MINIMO_DESCONTO) * ((subtotal + 5) // 10)
+
+
+def de_centavos(valor):
+    """Valor de saída: centavos inteiros (cents) ou reais com 2 casas (float e numeric).
+
+    Em numeric os reais seguem como float: com até 15 dígitos o texto do float é exatamente o valor
+    com 2 casas, então o banco (e o Arrow, no sink parquet) o converte em NUMERIC sem arredondamento,
+    sem o custo de criar um Decimal por valor.
+    """
+    if MONEY_TYPE == "cents":
+        return valor
+    return valor / 100
+
+
+def para_centavos(valor):
+    """Centavos de um valor de dinheiro lido do banco (float, Decimal ou inteiro em centavos)."""
+    if MONEY_TYPE == "cents":
+        return int(valor)
+    return round(valor * 100)
+
+
+def converter(linha, colunas):
+    """Converte as colunas de dinheiro da linha (em centavos) para o valor de saída."""
+    if MONEY_TYPE != "cents":
+        for coluna in colunas:
+            linha[coluna] = linha[coluna] / 100
+    return linha
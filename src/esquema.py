@@ -0,0 +1,164 @@
+# Script com a criação e o reset do esquema a partir do modelo (`metadata.sorted_tables`). Na carga
+# inicial as tabelas são criadas só com as colunas e a chave primária, carregadas e só então recebem
+# os índices, as restrições unique e as chaves estrangeiras (NOT VALID + VALIDATE CONSTRAINT), sem
+# manutenção de índices e checagens por linha. O reset esvazia as tabelas em um único TRUNCATE ou as
+# exclui em um único DROP TABLE e cria de novo, opcionalmente como UNLOGGED.
+
+# Bibliotecas utilizadas
+import time
+from contextlib import contextmanager
+import sqlalchemy as sa
+from sqlalchemy.schema import AddConstraint, CreateIndex, CreateTable
+
+
+@contextmanager
+def fase(tempos, nome):
+    """Mede o tempo do bloco e guarda em `tempos[nome]`, em segundos."""
+    inicio = time.perf_counter()
+    yield
+    tempos[nome] = time.perf_counter() - inicio
+
+
+def imprimir_fases(tempos):
+    """Relatório do tempo de cada fase da carga inicial."""
+    print("Tempo por fase da carga inicial:")
+    for nome, tempo in tempos.items():
+        print(f"  {nome + ':':<28} {tempo:8.2f}s")
+    print(f"  {'total:':<28} {sum(tempos.values()):8.2f}s")
+
+
+def restricoes_adiadas(table):
+    """Restrições unique e chaves estrangeiras da tabela, criadas só depois da carga."""
+    return [
+        constraint
+        for constraint in table.constraints
+        if isinstance(constraint, (sa.UniqueConstraint, sa.ForeignKeyConstraint))
+    ]
+
+
+def particionada(table):
+    """Indica se a tabela é particionada no PostgreSQL (ex.: pedidos com DB_PARTITION=month)."""
+    return bool(table.dialect_options["postgresql"]["partition_by"])
+
+
+def criar_tabelas_sem_restricoes(connection, metadata):
+    """Cria as tabelas do modelo só com as colunas e a chave primária (e o particionamento)."""
+    sem_restricoes = sa.MetaData()
+    for table in metadata.sorted_tables:
+        copia = table.to_metadata(sem_restricoes)
+        for constraint in restricoes_adiadas(copia):
+            copia.constraints.discard(constraint)
+        copia.indexes.clear()
+        connection.execute(CreateTable(copia))
+
+
+def lista_tabelas(connection, tabelas):
+    """Nomes das tabelas, já com as aspas necessárias, separados por vírgula."""
+    preparer = connection.dialect.identifier_preparer
+    return ", ".join(preparer.format_table(table) for table in tabelas)
+
+
+def truncar(connection, tabelas):
+    """Esvazia as tabelas em um único TRUNCATE, reiniciando as sequências dos ids."""
+    connection.execute(
+        sa.text(
+            f"TRUNCATE {lista_tabelas(connection, tabelas)} RESTART IDENTITY CASCADE",
+        ),
+    )
+
+
+def excluir(connection, tabelas):
+    """Exclui as tabelas que existirem em um único DROP TABLE (com as partições e as sequências)."""
+    connection.execute(
+        sa.text(f"DROP TABLE IF EXISTS {lista_tabelas(connection, tabelas)} CASCADE"),
+    )
+
+
+def tornar_unlogged(connection, metadata):
+    """Torna as tabelas (ainda vazias) UNLOGGED: sem WAL, mais rápidas de carregar e perdidas se o
+    servidor cair, para cargas descartáveis como as de benchmark.
+
+    As tabelas que referenciam outras mudam primeiro, porque uma tabela com log não pode referenciar
+    uma UNLOGGED. O PostgreSQL não aceita tabelas particionadas UNLOGGED.
+    """
+    if any(particionada(table) for table in metadata.sorted_tables):
+        raise ValueError(
+            "Tabelas particionadas não podem ser UNLOGGED (use DB_PARTITION=none)",
+        )
+
+    preparer = connection.dialect.identifier_preparer
+    for table in reversed(metadata.sorted_tables):
+        connection.execute(
+            sa.text(f"ALTER TABLE {preparer.format_table(table)} SET UNLOGGED"),
+        )
+
+
+def recriar(connection, metadata, restricoes=True, unlogged=False):
+    """Exclui as tabelas do modelo e as cria de novo, completas ou só com as chaves primárias."""
+    excluir(connection, metadata.sorted_tables)
+    if restricoes:
+        metadata.create_all(connection)
+    else:
+        criar_tabelas_sem_restricoes(connection, metadata)
+    if unlogged:
+        tornar_unlogged(connection, metadata)
+
+
+def criar_indices(connection, metadata):
+    """Cria os índices e as restrições unique do modelo sobre as tabelas já carregadas."""
+    for table in metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            connection.execute(CreateIndex(index))
+        for constraint in restricoes_adiadas(table):
+            if isinstance(constraint, sa.UniqueConstraint):
+                connection.execute(AddConstraint(constraint))
+
+
+def nome_chave_estrangeira(table, constraint):
+    """Nome da chave estrangeira: o do modelo ou o padrão do PostgreSQL (tabela_colunas_fkey)."""
+    return constraint.name or f"{table.name}_{'_'.join(constraint.column_keys)}_fkey"
+
+
+def adicionar_chaves_estrangeiras(connection, metadata):
+    """Adiciona as chaves estrangeiras sem checar as linhas já gravadas (NOT VALID).
+
+    Retorna as chaves a validar, como (tabela, nome). O PostgreSQL não aceita NOT VALID em tabelas
+    particionadas, então as chaves delas são checadas já ao serem adicionadas. As que referenciam uma
+    tabela particionada (ex.: itenspedido -> pedidos) também: o VALIDATE CONSTRAINT não marca como
+    validadas as cópias internas da chave em cada partição.
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    pendentes = []
+    for table in metadata.sorted_tables:
+        for constraint in restricoes_adiadas(table):
+            if not isinstance(constraint, sa.ForeignKeyConstraint):
+                continue
+
+            nome = nome_chave_estrangeira(table, constraint)
+            colunas = ", ".join(quote(coluna) for coluna in constraint.column_keys)
+            referenciadas = ", ".join(
+                quote(elemento.column.name) for elemento in constraint.elements
+            )
+            sem_validar = not (
+                particionada(table) or particionada(constraint.referred_table)
+            )
+            connection.execute(
+                sa.text(
+                    f"ALTER TABLE {quote(table.name)} ADD CONSTRAINT {quote(nome)} "
+                    f"FOREIGN KEY ({colunas}) REFERENCES {quote(constraint.referred_table.name)} "
+                    f"({referenciadas})" + (" NOT VALID" if sem_validar else ""),
+                ),
+            )
+            if sem_validar:
+                pendentes.append((table.name, nome))
+
+    return pendentes
+
+
+def validar_chaves_estrangeiras(connection, pendentes):
+    """Valida as chaves adicionadas com NOT VALID (uma leitura por chave, sem bloquear escritas)."""
+    quote = connection.dialect.identifier_preparer.quote
+    for tabela, nome in pendentes:
+        connection.execute(
+            sa.text(f"ALTER TABLE {quote(tabela)} VALIDATE CONSTRAINT {quote(nome)}"),
+        )
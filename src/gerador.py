@@ -0,0 +1,410 @@
+# Script com a geração das linhas sintéticas (clientes, produtos, pedidos e itens), sem acesso ao banco de dados.
+
+# Bibliotecas utilizadas
+from src import chaves
+from src import dinheiro
+from src import list_auxiliar
+from src.gerador_colunar import semente_numpy
+from src.pools import ValoresFaker
+from supabase.model_supabase_db import PARTICIONADO
+from faker import Faker
+from datetime import date, timedelta
+from itertools import accumulate
+import numpy as np
+import os
+import re
+import random
+
+# Dados auxiliares
+DDD_BR = list_auxiliar.DDD_BR
+MARCAS = list_auxiliar.MARCAS
+CATEGORIAS = list_auxiliar.CATEGORIAS
+CORES = list_auxiliar.CORES
+FORMA_PAGAMENTO = list_auxiliar.FORMA_PAGAMENTO
+STATUS_PEDIDO = list_auxiliar.STATUS_PEDIDO
+CANAL_VENDA = list_auxiliar.CANAIS_VENDA
+ESTADO_CIVIL = list_auxiliar.ESTADO_CIVIL
+
+# Consultas pré-calculadas (ids por nome, modelos, tamanhos e locais achatados)
+ID_MARCA = list_auxiliar.ID_MARCA
+MODELOS_POR_MARCA = list_auxiliar.MODELOS_POR_MARCA
+TAMANHOS_POR_GENERO = list_auxiliar.TAMANHOS_POR_GENERO
+AMOSTRADORES_LOCAIS = list_auxiliar.AMOSTRADORES_LOCAIS
+LOCAIS_ESTADOS_NP = list_auxiliar.LOCAIS_ESTADOS_NP
+LOCAIS_CIDADES_NP = list_auxiliar.LOCAIS_CIDADES_NP
+LOCAIS_BAIRROS_NP = list_auxiliar.LOCAIS_BAIRROS_NP
+
+# Pesos do sorteio do local dos clientes: "uniform" (por nível) ou "population" (população do estado)
+LOCATION_WEIGHTS = os.getenv("LOCATION_WEIGHTS", "uniform")
+
+# Ids de gênero (clientes e produtos) e de e-mail marketing, com os pesos acumulados do sorteio
+GENEROS = [1, 2, 3]
+PESOS_ACUMULADOS_GENEROS = list(accumulate([0.60, 0.36, 0.04]))
+EMAILS_MARKETING = [1, 2]
+PESOS_ACUMULADOS_EMAILS_MARKETING = list(accumulate([0.70, 0.30]))
+
+# Quantidade de itens por pedido e seus pesos (pedidos gerados junto com os itens)
+QUANTIDADE_ITENS = [1, 2, 3]
+PESOS_ITENS = [0.70, 0.20, 0.10]
+
+# Colunas de dinheiro, calculadas em centavos e convertidas na saída
+DINHEIRO_PRODUTOS = ("preco", "preco_custo")
+DINHEIRO_PEDIDOS = ("subtotal", "frete", "valor_desconto", "total")
+DINHEIRO_ITENS = ("preco_unitario", "subtotal")
+
+
+def calcular_frete(estado):
+    """Frete do pedido em centavos: grátis para clientes de SP e RJ, 12,50 para os demais estados."""
+    return 0 if estado in ["SP", "RJ"] else dinheiro.FRETE
+
+
+class IndiceClientes:
+    """Atributos dos clientes em colunas paralelas, acessados em O(1) pela posição sorteada."""
+
+    def __init__(self, clientes=()):
+        self.ids = []
+        self.fretes = []
+        self.enderecos_entrega = []
+
+        for cliente in clientes:
+            self.adicionar(
+                cliente.id,
+                cliente.estado,
+                cliente.endereco,
+                cliente.bairro,
+                cliente.cidade,
+            )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def estender(self, outro):
+        """Inclui todos os clientes de outro índice."""
+        self.ids.extend(outro.ids)
+        self.fretes.extend(outro.fretes)
+        self.enderecos_entrega.extend(outro.enderecos_entrega)
+
+    def adicionar(self, id_cliente, estado, endereco, bairro, cidade):
+        """Inclui um cliente, já com o frete e o endereço de entrega calculados."""
+        self.ids.append(id_cliente)
+        self.fretes.append(calcular_frete(estado))
+
+        # Endereço de entrega baseado no cliente do pedido
+        self.enderecos_entrega.append(
+            endereco + ", " + bairro + " - " + cidade + " - " + estado,
+        )
+
+
+class GeradorDados:
+    """Gera linhas sintéticas com um random e um Faker próprios, semeados pela mesma semente."""
+
+    def __init__(
+        self,
+        seed=None,
+        data_base=None,
+        data_inicial=None,
+        pesos_locais=None,
+        pools=None,
+    ):
+        self.random = random.Random(seed)
+
+        # Generator do NumPy para os sorteios em lote (locais dos clientes de um shard)
+        self.rng_numpy = np.random.default_rng(
+            None if seed is None else semente_numpy(seed),
+        )
+
+        # Amostrador alias dos locais (estado, cidade e bairro) dos clientes
+        pesos_locais = pesos_locais or LOCATION_WEIGHTS
+        if pesos_locais not in AMOSTRADORES_LOCAIS:
+            raise ValueError(f"Pesos de locais inválidos: {pesos_locais}")
+        self.amostrador_locais = AMOSTRADORES_LOCAIS[pesos_locais]
+
+        # Inicializar Faker com localização brasileira
+        self.fake = Faker("pt_BR")
+        self.fake.seed_instance(seed)
+
+        # Nomes, endereços e descrições: pelo Faker a cada linha ou sorteados dos pools
+        self.valores = pools or ValoresFaker(self.fake)
+
+        # Data de referência das janelas de datas geradas (cadastro, pedido, envio e entrega)
+        self.data_base = data_base or date.today()
+
+        # Início das janelas de cadastro e pedido (carga incremental); sem ela, 2 anos e 1 ano
+        self.data_inicial = data_inicial
+
+    def clientes(self, quantidade, id_inicial):
+        """Gera os dados de clientes com ids a partir de `id_inicial`."""
+        rng = self.random
+        fake = self.fake
+        valores = self.valores
+
+        # Locais (estado, cidade e bairro) de todos os clientes do shard, sorteados em lote
+        locais = self.amostrador_locais.sortear_lote(self.rng_numpy, quantidade)
+        estados = LOCAIS_ESTADOS_NP[locais].tolist()
+        cidades = LOCAIS_CIDADES_NP[locais].tolist()
+        bairros = LOCAIS_BAIRROS_NP[locais].tolist()
+
+        for id_cliente, estado, cidade, bairro in zip(
+            range(id_inicial, id_inicial + quantidade),
+            estados,
+            cidades,
+            bairros,
+        ):
+            id_genero = rng.choices(GENEROS, cum_weights=PESOS_ACUMULADOS_GENEROS)[0]
+            nome, sobrenome = valores.nome(rng, id_genero)
+            id_estadocivil = rng.randint(1, len(ESTADO_CIVIL))
+            email = (
+                re.sub(r"[^a-zA-Z0-9]", "", nome.lower())
+                + re.sub(r"[^a-zA-Z0-9]", "", sobrenome.lower())
+                + chaves.sufixo_email(id_cliente)
+                + "@"
+                + valores.dominio_email(rng)
+            )
+            cpf = chaves.cpf(id_cliente)
+            telefone = f"55 ({rng.choice(DDD_BR)}) 9 " + valores.telefone(rng)
+            endereco = valores.endereco(rng)
+            cep = valores.cep(rng)
+            data_cadastro = fake.date_between(
+                start_date=self.data_inicial or self.data_base - timedelta(days=730),
+                end_date=self.data_base,
+            )
+            id_emailmarketing = rng.choices(
+                EMAILS_MARKETING,
+                cum_weights=PESOS_ACUMULADOS_EMAILS_MARKETING,
+            )[0]
+
+            yield {
+                "id": id_cliente,
+                "nome": nome,
+                "sobrenome": sobrenome,
+                "id_genero": id_genero,
+                "id_estadocivil": id_estadocivil,
+                "email": email,
+                "cpf": cpf,
+                "telefone": telefone,
+                "endereco": endereco,
+                "estado": estado,
+                "cidade": cidade,
+                "bairro": bairro,
+                "cep": cep,
+                "data_cadastro": data_cadastro,
+                "id_emailmarketing": id_emailmarketing,
+            }
+
+    def produtos(self, quantidade, id_inicial):
+        """Gera os dados de produtos com ids a partir de `id_inicial`."""
+        rng = self.random
+
+        for id_produto in range(id_inicial, id_inicial + quantidade):
+            sku = chaves.sku(id_produto)
+            marca = rng.choice(MARCAS)
+            id_marca = ID_MARCA[marca]
+            modelo = rng.choice(MODELOS_POR_MARCA[marca])
+            nome = f"{marca} {modelo}"
+            descricao = self.valores.descricao(rng)
+            preco = dinheiro.centavos(rng.uniform(97, 345))
+            margem = rng.uniform(0.40, 0.60)
+            preco_custo = round(preco * (1 - margem))
+            estoque = rng.randint(0, 100)
+            id_categoria = rng.randint(1, len(CATEGORIAS))
+            id_genero = rng.choices(GENEROS, cum_weights=PESOS_ACUMULADOS_GENEROS)[0]
+            tamanhos, pesos_acumulados = TAMANHOS_POR_GENERO[id_genero]
+            tamanho = rng.choices(tamanhos, cum_weights=pesos_acumulados)[0]
+            cor = rng.choice(CORES)
+
+            yield dinheiro.converter(
+                {
+                    "id": id_produto,
+                    "sku": sku,
+                    "nome": nome,
+                    "descricao": descricao,
+                    "preco": preco,
+                    "preco_custo": preco_custo,
+                    "margem": margem,
+                    "tamanho": tamanho,
+                    "estoque": estoque,
+                    "id_categoria": id_categoria,
+                    "id_marca": id_marca,
+                    "modelo": modelo,
+                    "id_genero": id_genero,
+                    "cor": cor,
+                },
+                DINHEIRO_PRODUTOS,
+            )
+
+    def pedidos(self, quantidade, id_inicial, clientes, ids_produtos):
+        """Gera os dados de pedidos a partir do índice de clientes e dos produtos existentes."""
+        rng = self.random
+
+        for id_pedido in range(id_inicial, id_inicial + quantidade):
+            posicao_cliente = rng.randrange(len(clientes))
+            id_produto = rng.choice(ids_produtos)
+            quantidade_pedido = rng.randint(1, 2)
+            subtotal = dinheiro.centavos(rng.uniform(97, 345))
+
+            yield self._pedido(
+                id_pedido,
+                clientes,
+                posicao_cliente,
+                id_produto,
+                quantidade_pedido,
+                subtotal,
+            )
+
+    def pedidos_com_itens(self, quantidade, id_inicial, clientes, ids_produtos):
+        """Gera pedidos junto com seus itens, com os totais do pedido calculados a partir dos itens."""
+        rng = self.random
+        pedidos = []
+        itens = []
+
+        for id_pedido in range(id_inicial, id_inicial + quantidade):
+            posicao_cliente = rng.randrange(len(clientes))
+
+            # Cada pedido tem de 1 a 3 itens
+            quantidade_itens = rng.choices(QUANTIDADE_ITENS, weights=PESOS_ITENS, k=1)[
+                0
+            ]
+            itens_pedido = [
+                self._item(id_pedido, rng.choice(ids_produtos))
+                for _ in range(quantidade_itens)
+            ]
+
+            pedido = self._pedido(
+                id_pedido,
+                clientes,
+                posicao_cliente,
+                itens_pedido[0]["id_produto"],
+                sum(item["quantidade"] for item in itens_pedido),
+                sum(item["subtotal"] for item in itens_pedido),
+            )
+            pedidos.append(pedido)
+
+            # Com pedidos particionado a data do pedido faz parte da chave estrangeira dos itens
+            if PARTICIONADO:
+                for item in itens_pedido:
+                    item["data_pedido"] = pedido["data_pedido"]
+            itens.extend(
+                dinheiro.converter(item, DINHEIRO_ITENS) for item in itens_pedido
+            )
+
+        return {"pedidos": pedidos, "itenspedido": itens}
+
+    def itens_pedidos(self, quantidade, id_inicial, ids_pedidos, ids_produtos):
+        """Gera os dados de itens pedidos a partir dos pedidos e produtos existentes."""
+        rng = self.random
+
+        for id_item in range(id_inicial, id_inicial + quantidade):
+            id_pedido = rng.choice(ids_pedidos)
+            id_produto = rng.choice(ids_produtos)
+
+            yield dinheiro.converter(
+                {"id": id_item, **self._item(id_pedido, id_produto)},
+                DINHEIRO_ITENS,
+            )
+
+    def _item(self, id_pedido, id_produto):
+        """Gera um item do pedido (sem id: a chave fica a cargo do chamador ou do banco).
+
+        Os valores ficam em centavos; o chamador os converte depois de somar os itens do pedido.
+        """
+        rng = self.random
+        quantidade_item = rng.randint(1, 2)
+        preco_unitario = dinheiro.centavos(rng.uniform(97, 345))
+        subtotal = quantidade_item * preco_unitario
+
+        return {
+            "id_pedido": id_pedido,
+            "id_produto": id_produto,
+            "quantidade": quantidade_item,
+            "preco_unitario": preco_unitario,
+            "subtotal": subtotal,
+        }
+
+    def _pedido(
+        self,
+        id_pedido,
+        clientes,
+        posicao_cliente,
+        id_produto,
+        quantidade,
+        subtotal,
+    ):
+        """Gera um pedido do cliente na posição sorteada, com frete, desconto, total e datas.
+
+        O subtotal chega em centavos; frete, desconto e total são somados em centavos.
+        """
+        rng = self.random
+        fake = self.fake
+
+        id_cliente = clientes.ids[posicao_cliente]
+        data_pedido = fake.date_between(
+            start_date=self.data_inicial or self.data_base - timedelta(days=365),
+            end_date=self.data_base,
+        )
+        id_canalvenda = rng.randint(1, len(CANAL_VENDA))
+
+        # Se estado do cliente for SP - RJ e grátis outros 12,50
+        frete = clientes.fretes[posicao_cliente]
+
+        # Se valor do pedido for maior que 200, desconto de 10%,
+        valor_desconto = dinheiro.desconto(subtotal)
+        total = subtotal + frete - valor_desconto
+        id_forma_pagamento = rng.randint(1, len(FORMA_PAGAMENTO))
+        id_status = rng.randint(1, len(STATUS_PEDIDO))
+
+        # Endereço de entrega baseado no cliente do pedido
+        endereco_entrega = clientes.enderecos_entrega[posicao_cliente]
+
+        # Se status for entregue, data_entrega é 3 a 7 dias após data_pedido. Status for
+        if id_status == 4:  # Entregue
+            data_envio = fake.date_between(
+                start_date=data_pedido,
+                end_date=self.data_base + timedelta(days=2),
+            )
+            data_entrega = fake.date_between(
+                start_date=data_envio,
+                end_date=self.data_base + timedelta(days=5),
+            )
+        elif id_status == 3:  # Enviado (AINDA NÃO ENTREGUE)
+            data_envio = fake.date_between(
+                start_date=data_pedido,
+                end_date=self.data_base + timedelta(days=2),
+            )
+            data_entrega = None
+        elif id_status == 2:  # Processando
+            data_envio = None
+            data_entrega = None
+        elif id_status == 1:  # Pendente
+            data_envio = None
+            data_entrega = None
+        elif id_status == 5:  # Cancelado
+            data_envio = None
+            data_entrega = None
+
+        # Verifica se o pedido foi entregue
+        if id_status == 4:  # Entregue
+            id_entregue = 1  # Sim
+        else:
+            id_entregue = 2  # Não
+
+        return dinheiro.converter(
+            {
+                "id": id_pedido,
+                "id_cliente": id_cliente,
+                "id_produto": id_produto,
+                "quantidade": quantidade,
+                "subtotal": subtotal,
+                "data_pedido": data_pedido,
+                "id_canalvenda": id_canalvenda,
+                "frete": frete,
+                "valor_desconto": valor_desconto,
+                "total": total,
+                "id_forma_pagamento": id_forma_pagamento,
+                "id_status": id_status,
+                "endereco_entrega": endereco_entrega,
+                "data_envio": data_envio,
+                "data_entrega": data_entrega,
+                "id_entregue": id_entregue,
+            },
+            DINHEIRO_PEDIDOS,
+        )
@@ -0,0 +1,191 @@
+# Script com a geração vetorizada (NumPy) das colunas numéricas de pedidos e itens pedidos.
+# Cada chamada devolve um lote colunar (nome da coluna -> array) que o loader grava diretamente.
+# Os valores de dinheiro são somados em centavos (int64) e convertidos só no lote de saída.
+
+# Bibliotecas utilizadas
+from src import dinheiro
+from src import list_auxiliar
+from supabase.model_supabase_db import PARTICIONADO
+from datetime import date
+from types import SimpleNamespace
+import hashlib
+import numpy as np
+
+# Dados auxiliares
+FORMA_PAGAMENTO = list_auxiliar.FORMA_PAGAMENTO
+STATUS_PEDIDO = list_auxiliar.STATUS_PEDIDO
+CANAL_VENDA = list_auxiliar.CANAIS_VENDA
+
+# Quantidade de itens por pedido e seus pesos (mesma distribuição da geração linha a linha)
+QUANTIDADE_ITENS = [1, 2, 3]
+PESOS_ITENS = [0.70, 0.20, 0.10]
+
+# Entidades com geração vetorizada disponível
+ENTIDADES = ("pedidos", "itens_pedidos", "pedidos_com_itens")
+
+
+def semente_numpy(seed):
+    """Converte a semente do shard (texto) em um inteiro aceito pelo NumPy."""
+    return int.from_bytes(hashlib.sha256(str(seed).encode()).digest()[:8], "big")
+
+
+def indice_em_arrays(indice_clientes):
+    """Converte o índice de clientes em arrays NumPy, uma única vez antes da geração."""
+    return SimpleNamespace(
+        ids=np.asarray(indice_clientes.ids, dtype=np.int64),
+        fretes=np.asarray(indice_clientes.fretes, dtype=np.int64),
+        enderecos_entrega=np.asarray(indice_clientes.enderecos_entrega, dtype=object),
+    )
+
+
+class GeradorColunar:
+    """Gera colunas inteiras de uma vez com o Generator do NumPy, semeado pela semente do shard."""
+
+    def __init__(self, seed=None, data_base=None, data_inicial=None):
+        self.rng = np.random.default_rng(None if seed is None else semente_numpy(seed))
+
+        # Data de referência das janelas de datas geradas (pedido, envio e entrega)
+        self.data_base = np.datetime64(data_base or date.today(), "D")
+
+        # Dias da janela de pedidos: desde a data inicial (carga incremental) ou o último ano
+        self.dias_pedidos = 365
+        if data_inicial is not None:
+            self.dias_pedidos = int(
+                (self.data_base - np.datetime64(data_inicial, "D")).astype(int),
+            )
+
+    def pedidos(self, quantidade, id_inicial, clientes, ids_produtos):
+        """Gera o lote colunar de pedidos a partir dos clientes e produtos existentes."""
+        rng = self.rng
+        ids_produtos = np.asarray(ids_produtos)
+
+        posicao_cliente = rng.integers(0, len(clientes.ids), quantidade)
+        subtotal = dinheiro.centavos(rng.uniform(97, 345, quantidade))
+
+        return self._pedidos(
+            np.arange(id_inicial, id_inicial + quantidade),
+            clientes,
+            posicao_cliente,
+            ids_produtos[rng.integers(0, len(ids_produtos), quantidade)],
+            rng.integers(1, 3, quantidade),
+            subtotal,
+        )
+
+    def pedidos_com_itens(self, quantidade, id_inicial, clientes, ids_produtos):
+        """Gera pedidos e itens juntos; os totais do pedido são somados a partir dos itens."""
+        rng = self.rng
+        ids_produtos = np.asarray(ids_produtos)
+        ids_pedido = np.arange(id_inicial, id_inicial + quantidade)
+
+        posicao_cliente = rng.integers(0, len(clientes.ids), quantidade)
+
+        # Cada pedido tem de 1 a 3 itens; os itens de um pedido ficam contíguos
+        itens_por_pedido = rng.choice(QUANTIDADE_ITENS, size=quantidade, p=PESOS_ITENS)
+        inicio_pedido = np.cumsum(itens_por_pedido) - itens_por_pedido
+        total_itens = int(itens_por_pedido.sum())
+
+        id_produto_item = ids_produtos[rng.integers(0, len(ids_produtos), total_itens)]
+        quantidade_item = rng.integers(1, 3, total_itens)
+        preco_unitario = dinheiro.centavos(rng.uniform(97, 345, total_itens))
+        subtotal_item = quantidade_item * preco_unitario
+
+        itens = {
+            "id_pedido": np.repeat(ids_pedido, itens_por_pedido),
+            "id_produto": id_produto_item,
+            "quantidade": quantidade_item,
+            "preco_unitario": dinheiro.de_centavos(preco_unitario),
+            "subtotal": dinheiro.de_centavos(subtotal_item),
+        }
+
+        pedidos = self._pedidos(
+            ids_pedido,
+            clientes,
+            posicao_cliente,
+            id_produto_item[inicio_pedido],
+            np.add.reduceat(quantidade_item, inicio_pedido),
+            np.add.reduceat(subtotal_item, inicio_pedido),
+        )
+
+        # Com pedidos particionado a data do pedido faz parte da chave estrangeira dos itens
+        if PARTICIONADO:
+            itens["data_pedido"] = np.repeat(pedidos["data_pedido"], itens_por_pedido)
+
+        return {"pedidos": pedidos, "itenspedido": itens}
+
+    def itens_pedidos(self, quantidade, id_inicial, ids_pedidos, ids_produtos):
+        """Gera o lote colunar de itens pedidos a partir dos pedidos e produtos existentes."""
+        rng = self.rng
+        ids_pedidos = np.asarray(ids_pedidos)
+        ids_produtos = np.asarray(ids_produtos)
+
+        quantidade_item = rng.integers(1, 3, quantidade)
+        preco_unitario = dinheiro.centavos(rng.uniform(97, 345, quantidade))
+
+        return {
+            "id": np.arange(id_inicial, id_inicial + quantidade),
+            "id_pedido": ids_pedidos[rng.integers(0, len(ids_pedidos), quantidade)],
+            "id_produto": ids_produtos[rng.integers(0, len(ids_produtos), quantidade)],
+            "quantidade": quantidade_item,
+            "preco_unitario": dinheiro.de_centavos(preco_unitario),
+            "subtotal": dinheiro.de_centavos(quantidade_item * preco_unitario),
+        }
+
+    def _pedidos(
+        self,
+        ids_pedido,
+        clientes,
+        posicao_cliente,
+        id_produto,
+        quantidade,
+        subtotal,
+    ):
+        """Completa o lote colunar de pedidos com frete, desconto, total, status e datas.
+
+        O subtotal chega em centavos; frete, desconto e total são somados em centavos.
+        """
+        rng = self.rng
+        tamanho = len(ids_pedido)
+
+        # Se estado do cliente for SP - RJ e grátis outros 12,50
+        frete = np.asarray(clientes.fretes)[posicao_cliente]
+
+        # Se valor do pedido for maior que 200, desconto de 10%,
+        valor_desconto = dinheiro.desconto(subtotal)
+        total = subtotal + frete - valor_desconto
+
+        id_status = rng.integers(1, len(STATUS_PEDIDO) + 1, tamanho)
+        enviado = (id_status == 3) | (id_status == 4)  # Enviado ou Entregue
+        entregue = id_status == 4
+
+        # Pedido na janela de pedidos; envio até 2 dias após a data base e entrega até 5 dias
+        dias_pedido = rng.integers(0, self.dias_pedidos + 1, tamanho)
+        data_pedido = self.data_base - dias_pedido.astype("timedelta64[D]")
+        dias_envio = rng.integers(0, dias_pedido + 3)
+        data_envio = data_pedido + dias_envio.astype("timedelta64[D]")
+        dias_entrega = rng.integers(0, dias_pedido - dias_envio + 6)
+        data_entrega = data_envio + dias_entrega.astype("timedelta64[D]")
+
+        sem_data = np.datetime64("NaT", "D")
+
+        return {
+            "id": ids_pedido,
+            "id_cliente": np.asarray(clientes.ids)[posicao_cliente],
+            "id_produto": id_produto,
+            "quantidade": quantidade,
+            "subtotal": dinheiro.de_centavos(subtotal),
+            "data_pedido": data_pedido,
+            "id_canalvenda": rng.integers(1, len(CANAL_VENDA) + 1, tamanho),
+            "frete": dinheiro.de_centavos(frete),
+            "valor_desconto": dinheiro.de_centavos(valor_desconto),
+            "total": dinheiro.de_centavos(total),
+            "id_forma_pagamento": rng.integers(1, len(FORMA_PAGAMENTO) + 1, tamanho),
+            "id_status": id_status,
+            # Endereço de entrega baseado no cliente do pedido
+            "endereco_entrega": np.asarray(clientes.enderecos_entrega, dtype=object)[
+                posicao_cliente
+            ],
+            "data_envio": np.where(enviado, data_envio, sem_data),
+            "data_entrega": np.where(entregue, data_entrega, sem_data),
+            # Verifica se o pedido foi entregue: 1 = Sim, 2 = Não
+            "id_entregue": np.where(entregue, 1, 2),
+        }
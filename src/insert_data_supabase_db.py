@@ -2,7 +2,19 @@
 
 # Bibliotecas utilizadas
 import supabase.conect_supabase_db
+from src import agendador
+from src import checkpoint
+from src import dinheiro
+from src import esquema
+from src import gerador
+from src import gerador_colunar
 from src import list_auxiliar
+from src import loader
+from src import paralelo
+from src import pipeline
+from src import pools as pools_faker
+from src import sinks
+from src.registro import IDS_POR_CONSULTA, Registro
 from supabase.model_supabase_db import (
     clientes,
     produtos,
@@ -19,12 +31,15 @@ from supabase.model_supabase_db import (
     emailmarketing,
     entregue,
 )
-from supabase.model_supabase_db import Base
+from supabase.model_supabase_db import Base, criar_particoes_pedidos
 from tqdm import tqdm
-from faker import Faker
-import re
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, timedelta
+from functools import partial
+import argparse
+import os
 import random
-from sqlalchemy import text
+import sys
 import sqlalchemy as sa
 
 # Quantidades
@@ -32,175 +47,449 @@ NUM_CLIENTES = random.randint(5, 20)
 NUM_PRODUTOS = 200
 NUM_PEDIDOS = random.randint(200, 400)
 
+# Volumes com fator de escala 1 (proporções no estilo TPC-H); os demais fatores escalam linearmente
+VOLUMES_SF1 = {"clientes": 150_000, "produtos": 2_000, "pedidos": 1_500_000}
+
+# Data de referência das janelas de datas geradas (cadastro, pedido, envio e entrega)
+DATA_BASE = date.today()
+
+# Semente da execução (cada shard deriva a sua) e quantidade de processos de geração
+SEED = random.randrange(2**63)
+WORKERS = 1
+
+# Gera as colunas numéricas de pedidos e itens com NumPy, em vez de linha a linha
+VETORIZADO = False
+
+# Sorteia nomes, endereços e descrições de pools do Faker gerados uma vez (cache em disco)
+POOLS = False
+
+# Carga incremental: só dados novos, com datas posteriores à marca d'água (maior data de pedido)
+INCREMENTAL = False
+DATA_INICIAL = None
+
+# Registro dos shards gravados para retomar uma execução interrompida (None sem --checkpoint)
+CHECKPOINT = None
+
 # Dados auxiliares
-DDD_BR = list_auxiliar.DDD_BR
 MARCAS = list_auxiliar.MARCAS
 CATEGORIAS = list_auxiliar.CATEGORIAS
-CORES = list_auxiliar.CORES
 FORMA_PAGAMENTO = list_auxiliar.FORMA_PAGAMENTO
 STATUS_PEDIDO = list_auxiliar.STATUS_PEDIDO
 GENEROS_PESSOAS = list_auxiliar.GENEROS_PESSOAS
 GENEROS_PRODUTOS = list_auxiliar.GENEROS_PRODUTOS
 CANAL_VENDA = list_auxiliar.CANAIS_VENDA
-CBE = list_auxiliar.CBE
 ESTADO_CIVIL = list_auxiliar.ESTADO_CIVIL
-MODELOS = list_auxiliar.MODELOS
 EMAIL_MARKETING = list_auxiliar.EMAIL_MARKETING
 ENTREGUE = list_auxiliar.ENTREGUE
 
-# Inicializar Faker com localização brasileira
-fake = Faker("pt_BR")
+# Tabelas auxiliares e seus nomes
+TABELAS_AUXILIARES = [
+    (status.__table__, STATUS_PEDIDO),
+    (formapagamento.__table__, FORMA_PAGAMENTO),
+    (canalvenda.__table__, CANAL_VENDA),
+    (generocliente.__table__, GENEROS_PESSOAS),
+    (categorias.__table__, CATEGORIAS),
+    (generoproduto.__table__, GENEROS_PRODUTOS),
+    (marcas.__table__, MARCAS),
+    (estadocivil.__table__, ESTADO_CIVIL),
+    (emailmarketing.__table__, EMAIL_MARKETING),
+    (entregue.__table__, ENTREGUE),
+]
 
 # Criar engine e sessão com o banco de dados
 get_engine = supabase.conect_supabase_db.get_engine
 engine = get_engine()
 
+# Camada de carga em lote (tamanho de lote, modo de carga e política de commit via .env)
+carregador = loader.BatchLoader(engine)
+
+# Chaves e atributos gerados na execução, usados no lugar de releituras das tabelas
+registro = Registro(SEED)
+
+# Destino das linhas geradas (banco de dados, arquivos Parquet ou saída padrão)
+SINK = sinks.SinkPostgres(carregador)
+
+
+def configurar(
+    scale_factor=None,
+    seed=None,
+    data_base=None,
+    workers=1,
+    vetorizado=False,
+    incremental=False,
+    sink=None,
+    pools=False,
+):
+    """Define semente, data de referência, processos e volumes de cada entidade para a execução."""
+    global NUM_CLIENTES, NUM_PRODUTOS, NUM_PEDIDOS, DATA_BASE, SEED, WORKERS, VETORIZADO
+    global INCREMENTAL, DATA_INICIAL, SINK, POOLS, registro
+
+    # Semente única para o random e para os Faker de cada shard, tornando a execução reproduzível
+    if seed is not None:
+        SEED = seed
+        random.seed(seed)
+
+    WORKERS = workers or os.cpu_count()
+    VETORIZADO = vetorizado
+    INCREMENTAL = incremental
+    DATA_INICIAL = None
+    POOLS = pools
+
+    # Gera (ou lê) os pools antes das cargas, para que threads e workers só leiam o cache
+    if pools:
+        pools_faker.carregar()
+    SINK = sink or sinks.SinkPostgres(carregador)
+    registro = Registro(SEED)
+
+    if data_base is not None:
+        DATA_BASE = data_base
+
+    # Sem fator de escala mantém os volumes diários sorteados; com fator, volumes proporcionais
+    if scale_factor is None:
+        NUM_CLIENTES = random.randint(5, 20)
+        NUM_PRODUTOS = 200
+        NUM_PEDIDOS = random.randint(200, 400)
+    else:
+        NUM_CLIENTES = max(1, round(VOLUMES_SF1["clientes"] * scale_factor))
+        NUM_PRODUTOS = max(1, round(VOLUMES_SF1["produtos"] * scale_factor))
+        NUM_PEDIDOS = max(1, round(VOLUMES_SF1["pedidos"] * scale_factor))
+
+
+def resetar(modo, unlogged=False):
+    """Apaga os dados das tabelas do modelo e os checkpoints das execuções anteriores.
 
-def drop_tables():
-    """Exclui todas as tabelas do banco de dados."""
+    `truncate` esvazia as tabelas em um único TRUNCATE, reiniciando os ids; `recreate` as exclui em
+    um único DROP TABLE e cria de novo (UNLOGGED com `unlogged`), pegando as mudanças do modelo.
+    """
     with engine.begin() as connection:
-        connection.execute(text("DROP TABLE IF EXISTS itenspedido CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS pedidos CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS produtos CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS clientes CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS status CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS formapagamento CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS canalvenda CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS categorias CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS marcas CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS generocliente CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS generoproduto CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS estadocivil CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS emailmarketing CASCADE"))
-        connection.execute(text("DROP TABLE IF EXISTS entregue CASCADE"))
-
-    print("Tabelas excluídas com sucesso!")
-
-    # Criar todas as tabelas (se não existirem)
-    Base.metadata.create_all(engine)
+        if modo == "truncate":
+            Base.metadata.create_all(connection)
+            checkpoint.metadata.create_all(connection)
+            esquema.truncar(
+                connection,
+                Base.metadata.sorted_tables + checkpoint.metadata.sorted_tables,
+            )
+        else:
+            esquema.excluir(connection, checkpoint.metadata.sorted_tables)
+            esquema.recriar(connection, Base.metadata, unlogged=unlogged)
+
+    print(f"Tabelas resetadas com sucesso ({modo})!")
+
+
+def recriar_tabelas_sem_restricoes(tempos, unlogged=False):
+    """Carga inicial: recria as tabelas do modelo só com as colunas e as chaves primárias."""
+    with esquema.fase(tempos, "criação das tabelas"), engine.begin() as connection:
+        esquema.recriar(connection, Base.metadata, restricoes=False, unlogged=unlogged)
+
+
+def finalizar_carga_inicial(tempos):
+    """Carga inicial: cria os índices e as restrições do modelo depois da carga e imprime os tempos."""
+    with (
+        esquema.fase(tempos, "índices e restrições unique"),
+        engine.begin() as connection,
+    ):
+        esquema.criar_indices(connection, Base.metadata)
+    with esquema.fase(tempos, "chaves estrangeiras"), engine.begin() as connection:
+        pendentes = esquema.adicionar_chaves_estrangeiras(connection, Base.metadata)
+    with esquema.fase(tempos, "validação das chaves"), engine.begin() as connection:
+        esquema.validar_chaves_estrangeiras(connection, pendentes)
+
+    esquema.imprimir_fases(tempos)
 
 
 def table_empty(table):
-    """Verifica se uma tabela está vazia."""
-    with engine.connect() as conn:
-        result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-        count = result.scalar()
-        return count == 0
+    """Verifica se uma tabela está vazia (SELECT EXISTS, sem contar as linhas)."""
+    with carregador.transaction() as conn:
+        return not loader.has_rows(conn, table)
 
 
-def insert_data_assistant():
-    """Insere dados auxiliares nas tabelas correspondentes."""
+def linhas_estimadas(table):
+    """Quantidade aproximada de linhas da tabela pelo catálogo, para as mensagens das cargas."""
+    with carregador.transaction() as conn:
+        return loader.estimated_rows(conn, table)
 
-    if not table_empty("status"):
-        print("Tabelas auxiliates já populadas")
+
+def criar_sink(nome, saida=None):
+    """Cria o sink pelo nome usado na linha de comando."""
+    if nome == "postgres":
+        return sinks.SinkPostgres(carregador)
+    if nome == "asyncpg":
+        return sinks.SinkAsyncpg(carregador)
+    if nome == "parquet":
+        return sinks.SinkParquet(saida or "dados")
+    if nome == "stdout":
+        return sinks.SinkStdout()
+
+    raise ValueError(f"Sink inválido: {nome}")
+
+
+@contextmanager
+def conexao_leitura():
+    """Conexão para as leituras do gerador; None quando o sink não é o banco de dados."""
+    if not SINK.banco:
+        yield None
         return
-    else:
-        with engine.begin() as connection:
-            connection.execute(
-                status.__table__.insert(),
-                [{"nome": nome} for nome in STATUS_PEDIDO],
-            )
-            connection.execute(
-                formapagamento.__table__.insert(),
-                [{"nome": nome} for nome in FORMA_PAGAMENTO],
-            )
-            connection.execute(
-                canalvenda.__table__.insert(),
-                [{"nome": nome} for nome in CANAL_VENDA],
-            )
-            connection.execute(
-                generocliente.__table__.insert(),
-                [{"nome": nome} for nome in GENEROS_PESSOAS],
-            )
-            connection.execute(
-                categorias.__table__.insert(),
-                [{"nome": nome} for nome in CATEGORIAS],
-            )
-            connection.execute(
-                generoproduto.__table__.insert(),
-                [{"nome": nome} for nome in GENEROS_PRODUTOS],
-            )
-            connection.execute(
-                marcas.__table__.insert(),
-                [{"nome": nome} for nome in MARCAS],
-            )
-            connection.execute(
-                estadocivil.__table__.insert(),
-                [{"nome": nome} for nome in ESTADO_CIVIL],
-            )
-            connection.execute(
-                emailmarketing.__table__.insert(),
-                [{"nome": nome} for nome in EMAIL_MARKETING],
-            )
-            connection.execute(
-                entregue.__table__.insert(),
-                [{"nome": nome} for nome in ENTREGUE],
-            )
 
+    with carregador.transaction() as connection:
+        yield connection
 
-def insert_data_clientes():
-    """Insere dados de clientes no banco de dados."""
 
-    batch = []
+def marca_dagua():
+    """Maior data de pedido já gravada (None se ainda não há pedidos)."""
+    tabela = pedidos.__table__
+    with carregador.transaction() as connection:
+        return connection.execute(sa.select(sa.func.max(tabela.c.data_pedido))).scalar()
+
+
+def iniciar_incremental():
+    """Na carga incremental, começa as janelas de cadastro e pedido logo após a marca d'água."""
+    global DATA_INICIAL
+
+    if not SINK.banco:
+        print("Carga incremental disponível apenas com o sink do banco de dados")
+        return
+
+    ultima_data = marca_dagua()
+    if ultima_data is None:
+        print("Sem pedidos anteriores - carga completa das janelas de datas")
+        return
+
+    # Se a marca d'água já chegou à data base (ex.: segunda execução no dia), gera na data base
+    DATA_INICIAL = min(ultima_data + timedelta(days=1), DATA_BASE)
+    print(f"Carga incremental: datas de {DATA_INICIAL} a {DATA_BASE}")
+
+
+def criar_particoes():
+    """Com pedidos particionado (DB_PARTITION=month), cria as partições da janela de datas da carga."""
+    inicio = DATA_INICIAL or DATA_BASE - timedelta(days=365)
+    with carregador.transaction() as connection:
+        criar_particoes_pedidos(connection, inicio, DATA_BASE)
+
+
+def parametros_execucao(itens_avulsos=False):
+    """Parâmetros que definem os dados gerados, guardados no checkpoint para retomar a execução."""
+    return {
+        "seed": SEED,
+        "data_base": DATA_BASE.isoformat(),
+        "data_inicial": DATA_INICIAL.isoformat() if DATA_INICIAL else None,
+        "num_clientes": NUM_CLIENTES,
+        "num_produtos": NUM_PRODUTOS,
+        "num_pedidos": NUM_PEDIDOS,
+        "vetorizado": VETORIZADO,
+        "pools": POOLS,
+        "incremental": INCREMENTAL,
+        "itens_avulsos": itens_avulsos,
+    }
+
+
+def retomar_execucao():
+    """Ativa os checkpoints e, se a última execução não terminou, restaura os seus parâmetros.
+
+    Retorna os parâmetros da execução retomada, ou None se a execução atual é nova.
+    """
+    global NUM_CLIENTES, NUM_PRODUTOS, NUM_PEDIDOS, DATA_BASE, SEED, VETORIZADO
+    global INCREMENTAL, DATA_INICIAL, POOLS, CHECKPOINT, registro
+
+    # A execução retomada é a da mesma data base (na carga diária, a do dia)
+    CHECKPOINT = checkpoint.Checkpoint(carregador)
+    parametros = CHECKPOINT.retomar(DATA_BASE.isoformat())
+    if parametros is None:
+        return None
+
+    SEED = parametros["seed"]
+    DATA_BASE = date.fromisoformat(parametros["data_base"])
+    DATA_INICIAL = parametros["data_inicial"] and date.fromisoformat(
+        parametros["data_inicial"],
+    )
+    NUM_CLIENTES = parametros["num_clientes"]
+    NUM_PRODUTOS = parametros["num_produtos"]
+    NUM_PEDIDOS = parametros["num_pedidos"]
+    VETORIZADO = parametros["vetorizado"]
+    POOLS = parametros["pools"]
+    INCREMENTAL = parametros["incremental"]
+    registro = Registro(SEED)
+
+    if POOLS:
+        pools_faker.carregar()
+
+    print(f"Retomando a execução {CHECKPOINT.execucao}, interrompida (semente {SEED})")
+    return parametros
+
+
+def carga_iniciada(entidade):
+    """Indica se a execução retomada já gravou shards da entidade."""
+    if CHECKPOINT is None:
+        return False
+
+    with carregador.transaction() as connection:
+        return bool(CHECKPOINT.gravados(connection, entidade))
+
+
+def _linhas_shard(shard, table=None):
+    """Quantidade de linhas do shard (da tabela `table`, se o shard tiver várias tabelas)."""
+    if table is not None:
+        shard = shard[table.name]
+    return len(shard["id"]) if isinstance(shard, dict) else len(shard)
+
+
+def registrar_gravados(shards_gravados, entidade, table):
+    """Registra, lidos do banco pela chave, os shards gravados antes da retomada."""
+    with conexao_leitura() as connection:
+        for shard in shards_gravados:
+            registro.registrar_gravados(
+                connection,
+                entidade,
+                table,
+                shard.id_inicial,
+                shard.id_final,
+            )
+
 
-    for i in tqdm(range(NUM_CLIENTES), desc="Inserindo clientes"):
-        id_genero = random.choices([1, 2, 3], weights=[0.60, 0.36, 0.04], k=1)[0]
-        if id_genero == 1:
-            nome = fake.first_name_male()
-            sobrenome = fake.last_name_male()
-        elif id_genero == 2:
-            nome = fake.first_name_female()
-            sobrenome = fake.last_name_female()
+def intercalar_gravados(shards, pendentes, gravados, entidade, table):
+    """Registra os shards já gravados antes de cada shard gerado que vem depois deles.
+
+    O registro fica na ordem dos shards, como em uma execução sem interrupção, mesmo quando os
+    shards gravados não são os primeiros (o sink asyncpg grava os shards fora de ordem). Os
+    gravados depois do último shard gerado são registrados pelo chamador, ao final da carga.
+    """
+    restantes = dict(gravados)
+    for (indice, _, _), shard in zip(pendentes, shards):
+        anteriores = [posicao for posicao in restantes if posicao < indice]
+        registrar_gravados(
+            [restantes.pop(posicao) for posicao in anteriores],
+            entidade,
+            table,
+        )
+        yield shard
+
+
+def carregar_entidade(
+    table,
+    entidade,
+    quantidade,
+    desc,
+    contexto=None,
+    relacionadas=(),
+):
+    """Gera a entidade em shards com ids pré-atribuídos e grava as linhas no sink.
+
+    Com `relacionadas`, cada shard traz também as linhas dessas tabelas (ex.: os itens dos
+    pedidos), gravadas logo após as da tabela principal.
+    """
+
+    with conexao_leitura() as connection:
+        gravados = CHECKPOINT.gravados(connection, entidade) if CHECKPOINT else {}
+
+        # Na retomada a faixa de ids é a da execução interrompida; sem banco de dados (sink de
+        # arquivos ou stdout) os ids de cada execução começam em 1
+        if gravados:
+            indice, shard = next(iter(gravados.items()))
+            id_inicial = shard.id_inicial - indice * paralelo.SHARD_SIZE
         else:
-            nome = fake.first_name_nonbinary()
-            sobrenome = fake.last_name_nonbinary()
-        id_estadocivil = random.randint(1, len(ESTADO_CIVIL))
-        email = (
-            re.sub(r"[^a-zA-Z0-9]", "", nome.lower())
-            + re.sub(r"[^a-zA-Z0-9]", "", sobrenome.lower())
-            + str(random.randint(1000, 9999))
-            + "@"
-            + fake.free_email_domain()
+            id_inicial = 1 if connection is None else loader.next_id(connection, table)
+        registro.iniciar_tabela(table, id_inicial)
+
+    # Shards que faltam gerar (posição, id inicial e tamanho), na ordem em que são gerados
+    pendentes = [
+        shard
+        for shard in paralelo.dividir_em_shards(quantidade, id_inicial)
+        if shard[0] not in gravados
+    ]
+
+    vetorizado = VETORIZADO and entidade in gerador_colunar.ENTIDADES
+    shards = paralelo.gerar_shards(
+        entidade,
+        quantidade,
+        id_inicial,
+        seed=SEED,
+        data_base=DATA_BASE,
+        workers=WORKERS,
+        contexto=contexto,
+        vetorizado=vetorizado,
+        data_inicial=DATA_INICIAL,
+        pools=POOLS,
+        pular=set(gravados),
+    )
+    if gravados:
+        shards = intercalar_gravados(shards, pendentes, gravados, entidade, table)
+
+    # Cada shard gerado leva a sua linha de checkpoint, gravada na mesma transação
+    marcar = None
+    if CHECKPOINT:
+        marcar = CHECKPOINT.marcador(entidade, pendentes)
+
+    # Sem banco de dados as linhas relacionadas recebem ids do registro, na ordem dos shards
+    transformadores = [partial(registro.registrar, entidade)]
+    if relacionadas and not SINK.banco:
+        transformadores.append(partial(registro.numerar, relacionadas))
+
+    linhas_gravadas = sum(shard.linhas for shard in gravados.values())
+    with tqdm(total=quantidade, initial=linhas_gravadas, desc=desc) as barra:
+
+        def progresso(shard):
+            barra.update(_linhas_shard(shard, table if relacionadas else None))
+            return shard
+
+        # gerador -> registro e progresso -> lotes -> sink, um shard por vez
+        pipeline.executar(
+            shards,
+            SINK,
+            (table, *relacionadas),
+            transformadores=(*transformadores, progresso),
+            marcar=marcar,
         )
-        cpf = fake.cpf()
-        telefone = f"55 ({random.choice(DDD_BR)}) 9 " + fake.numerify(text="####-####")
-        endereco = fake.street_address()
-        estado = random.choice(list(CBE.keys()))
-        cidade = random.choice(list(CBE[estado].keys()))
-        bairro = random.choice(CBE[estado][cidade])
-        cep = fake.bothify(text="#####-###")
-        data_cadastro = fake.date_between(start_date="-2y", end_date="today")
-        id_emailmarketing = random.choices([1, 2], weights=[0.70, 0.30], k=1)[0]
-
-        # Batch insert
-        batch.append(
-            {
-                "nome": nome,
-                "sobrenome": sobrenome,
-                "id_genero": id_genero,
-                "id_estadocivil": id_estadocivil,
-                "email": email,
-                "cpf": cpf,
-                "telefone": telefone,
-                "endereco": endereco,
-                "estado": estado,
-                "cidade": cidade,
-                "bairro": bairro,
-                "cep": cep,
-                "data_cadastro": data_cadastro,
-                "id_emailmarketing": id_emailmarketing,
-            },
+
+    # Shards gravados depois do último shard gerado (ou todos, se nenhum faltava)
+    ultimo = pendentes[-1][0] if pendentes else -1
+    registrar_gravados(
+        [shard for posicao, shard in gravados.items() if posicao > ultimo],
+        entidade,
+        table,
+    )
+
+    if SINK.banco:
+        with carregador.transaction() as connection:
+            loader.sync_sequence(connection, table)
+
+
+def insert_data_assistant():
+    """Insere dados auxiliares nas tabelas correspondentes."""
+
+    if SINK.banco and not table_empty(status.__table__):
+        print("Tabelas auxiliates já populadas")
+        return
+    else:
+        # Ids explícitos (posição na lista), os mesmos usados pelas chaves estrangeiras geradas
+        SINK.gravar(
+            [
+                [
+                    (
+                        table,
+                        [
+                            {"id": id_nome, "nome": nome}
+                            for id_nome, nome in enumerate(nomes, 1)
+                        ],
+                    )
+                    for table, nomes in TABELAS_AUXILIARES
+                ],
+            ],
         )
 
-        if len(batch) >= 10:
-            with engine.begin() as connection:
-                connection.execute(clientes.__table__.insert(), batch)
-            batch = []
+        if SINK.banco:
+            with carregador.transaction() as connection:
+                for table, _ in TABELAS_AUXILIARES:
+                    loader.sync_sequence(connection, table)
 
-    # 🔥 INSERE O RESTO
-    if batch:
-        with engine.begin() as connection:
-            connection.execute(clientes.__table__.insert(), batch)
+
+def insert_data_clientes():
+    """Insere dados de clientes no banco de dados."""
+
+    carregar_entidade(
+        clientes.__table__,
+        "clientes",
+        NUM_CLIENTES,
+        desc="Inserindo clientes",
+    )
 
     print("Clientes inseridos com sucesso!")
 
@@ -208,76 +497,23 @@ def insert_data_clientes():
 def insert_data_produtos():
     """Insere dados de produtos no banco de dados."""
 
-    if not table_empty("produtos"):
-        print("Produtos já existem - pulando carga")
+    tabela = produtos.__table__
+    if SINK.banco and not table_empty(tabela) and not carga_iniciada("produtos"):
+        estimativa = linhas_estimadas(tabela)
+        if estimativa:
+            print(f"Produtos já existem (~{estimativa} linhas) - pulando carga")
+        else:
+            print("Produtos já existem - pulando carga")
         return
     else:
         print("Populando produtos...")
 
-        batch = []
-
-        for _ in tqdm(range(NUM_PRODUTOS), desc="Inserindo produtos"):
-            sku = fake.isbn13(separator="")
-            marca = random.choice(MARCAS)
-            id_marca = MARCAS.index(marca) + 1
-            modelos_marca = MODELOS.get(marca)
-            modelo = random.choice(modelos_marca)
-            nome = f"{marca} {modelo}"
-            descricao = fake.text(max_nb_chars=200)
-            preco = round(random.uniform(97, 345), 2)
-            margem = random.uniform(0.40, 0.60)
-            preco_custo = round(preco * (1 - margem), 2)
-            estoque = random.randint(0, 100)
-            id_categoria = random.randint(1, len(CATEGORIAS))
-            id_genero = random.choices([1, 2, 3], weights=[0.60, 0.36, 0.04], k=1)[0]
-            if id_genero == 1:
-                tamanho = random.choices(
-                    ["37", "38", "39", "40", "41", "42", "43", "44"],
-                    weights=[5, 8, 15, 18, 18, 15, 8, 5],
-                    k=1,
-                )[0]
-            elif id_genero == 2:
-                tamanho = random.choices(
-                    ["34", "35", "36", "37", "38", "39", "40"],
-                    weights=[5, 8, 18, 20, 18, 10, 5],
-                    k=1,
-                )[0]
-            else:
-                tamanho = random.choices(
-                    ["34", "35", "36", "37", "38", "39", "40", "41", "42", "43", "44"],
-                    weights=[3, 5, 8, 12, 15, 15, 15, 12, 8, 5, 3],
-                    k=1,
-                )[0]
-            cor = random.choice(CORES)
-
-            # Batch insert
-            batch.append(
-                {
-                    "sku": sku,
-                    "nome": nome,
-                    "descricao": descricao,
-                    "preco": preco,
-                    "preco_custo": preco_custo,
-                    "margem": margem,
-                    "tamanho": tamanho,
-                    "estoque": estoque,
-                    "id_categoria": id_categoria,
-                    "id_marca": id_marca,
-                    "modelo": modelo,
-                    "id_genero": id_genero,
-                    "cor": cor,
-                },
-            )
-
-            if len(batch) >= 10:
-                with engine.begin() as connection:
-                    connection.execute(produtos.__table__.insert(), batch)
-                batch = []
-
-        # 🔥 INSERE O RESTO
-        if batch:
-            with engine.begin() as connection:
-                connection.execute(produtos.__table__.insert(), batch)
+        carregar_entidade(
+            produtos.__table__,
+            "produtos",
+            NUM_PRODUTOS,
+            desc="Inserindo produtos",
+        )
 
         print("Produtos inseridos com sucesso!")
 
@@ -285,165 +521,112 @@ def insert_data_produtos():
 def insert_data_pedidos():
     """Insere dados de pedidos no banco de dados."""
 
-    with engine.begin() as connection:
-        result_clientes = connection.execute(clientes.__table__.select()).fetchall()
-        result_produtos = connection.execute(produtos.__table__.select()).fetchall()
+    # Clientes e produtos vêm do registro, mais uma amostra das execuções anteriores lida pela chave
+    with conexao_leitura() as connection:
+        indice_clientes = registro.indice_clientes(
+            connection,
+            clientes.__table__,
+            NUM_PEDIDOS,
+        )
+        ids_produtos = registro.ids_disponiveis(
+            connection,
+            produtos.__table__,
+            NUM_PEDIDOS,
+        )
+
+    if VETORIZADO:
+        indice_clientes = gerador_colunar.indice_em_arrays(indice_clientes)
 
-    ids_clientes = [cliente.id for cliente in result_clientes]
-    ids_produtos = [produto.id for produto in result_produtos]
+    carregar_entidade(
+        pedidos.__table__,
+        "pedidos",
+        NUM_PEDIDOS,
+        desc="Inserindo pedidos",
+        contexto={"clientes": indice_clientes, "ids_produtos": ids_produtos},
+    )
 
-    batch = []
+    print("Pedidos inseridos com sucesso!")
 
-    for _ in tqdm(range(NUM_PEDIDOS), desc="Inserindo pedidos"):
-        id_cliente = random.choice(ids_clientes)
-        id_produto = random.choice(ids_produtos)
-        quantidade = random.randint(1, 2)
-        subtotal = round(random.uniform(97, 345), 2)
-        data_pedido = fake.date_between(start_date="-1y", end_date="today")
-        id_canalvenda = random.randint(1, len(CANAL_VENDA))
 
-        # Se estado do cliente for SP - RJ e grátis outros 12,50
-        if result_clientes[ids_clientes.index(id_cliente)].estado in ["SP", "RJ"]:
-            frete = 0
-        else:
-            frete = 12.50
+def insert_data_pedidos_com_itens():
+    """Insere pedidos junto com seus itens, com os totais do pedido já calculados na geração."""
 
-        # Se valor do pedido for maior que 200, desconto de 10%,
-        if subtotal > 200:
-            valor_desconto = round(subtotal * 0.10, 2)
-        else:
-            valor_desconto = 0
-        total = subtotal + frete - valor_desconto
-        id_forma_pagamento = random.randint(1, len(FORMA_PAGAMENTO))
-        id_status = random.randint(1, len(STATUS_PEDIDO))
-
-        # Endereço de entrega baseado no cliente do pedido
-        endereco_entrega = (
-            result_clientes[ids_clientes.index(id_cliente)].endereco
-            + ", "
-            + result_clientes[ids_clientes.index(id_cliente)].bairro
-            + " - "
-            + result_clientes[ids_clientes.index(id_cliente)].cidade
-            + " - "
-            + result_clientes[ids_clientes.index(id_cliente)].estado
+    # Clientes e produtos vêm do registro, mais uma amostra das execuções anteriores lida pela chave
+    with conexao_leitura() as connection:
+        indice_clientes = registro.indice_clientes(
+            connection,
+            clientes.__table__,
+            NUM_PEDIDOS,
         )
-
-        # Se status for entregue, data_entrega é 3 a 7 dias após data_pedido. Status for
-        if id_status == 4:  # Entregue
-            data_envio = fake.date_between(start_date=data_pedido, end_date="+2d")
-            data_entrega = fake.date_between(start_date=data_envio, end_date="+5d")
-        elif id_status == 3:  # Enviado (AINDA NÃO ENTREGUE)
-            data_envio = fake.date_between(start_date=data_pedido, end_date="+2d")
-            data_entrega = None
-        elif id_status == 2:  # Processando
-            data_envio = None
-            data_entrega = None
-        elif id_status == 1:  # Pendente
-            data_envio = None
-            data_entrega = None
-        elif id_status == 5:  # Cancelado
-            data_envio = None
-            data_entrega = None
-
-        # Verifica se o pedido foi entregue
-        if id_status == 4:  # Entregue
-            id_entregue = 1  # Sim
-        else:
-            id_entregue = 2  # Não
-
-        batch.append(
-            {
-                "id_cliente": id_cliente,
-                "id_produto": id_produto,
-                "quantidade": quantidade,
-                "subtotal": subtotal,
-                "data_pedido": data_pedido,
-                "id_canalvenda": id_canalvenda,
-                "frete": frete,
-                "valor_desconto": valor_desconto,
-                "total": total,
-                "id_forma_pagamento": id_forma_pagamento,
-                "id_status": id_status,
-                "endereco_entrega": endereco_entrega,
-                "data_envio": data_envio,
-                "data_entrega": data_entrega,
-                "id_entregue": id_entregue,
-            },
+        ids_produtos = registro.ids_disponiveis(
+            connection,
+            produtos.__table__,
+            NUM_PEDIDOS,
         )
 
-        if len(batch) >= 10:
-            with engine.begin() as connection:
-                connection.execute(pedidos.__table__.insert(), batch)
-            batch = []
-
-    if batch:
-        with engine.begin() as connection:
-            connection.execute(pedidos.__table__.insert(), batch)
+    if VETORIZADO:
+        indice_clientes = gerador_colunar.indice_em_arrays(indice_clientes)
+
+    # No banco os itens usam o id da sequência; nos outros sinks o registro numera os itens
+    carregar_entidade(
+        pedidos.__table__,
+        "pedidos_com_itens",
+        NUM_PEDIDOS,
+        desc="Inserindo pedidos e itens",
+        contexto={"clientes": indice_clientes, "ids_produtos": ids_produtos},
+        relacionadas=(itenspedido.__table__,),
+    )
 
-    print("Pedidos inseridos com sucesso!")
+    print("Pedidos e itens pedidos inseridos com sucesso!")
 
 
 def insert_data_itens_pedidos():
-    """Insere dados de itens pedidos no banco de dados."""
-
-    with engine.begin() as connection:
-        result_pedidos = connection.execute(pedidos.__table__.select()).fetchall()
-        result_produtos = connection.execute(produtos.__table__.select()).fetchall()
-
-    ids_pedidos = [pedido.id for pedido in result_pedidos]
-    ids_produtos = [produto.id for produto in result_produtos]
-
-    batch = []
-
-    for _ in tqdm(range(NUM_PEDIDOS), desc="Inserindo itens pedidos"):
-        id_pedido = random.choice(ids_pedidos)
-        id_produto = random.choice(ids_produtos)
-        quantidade = random.randint(1, 2)
-        preco_unitario = round(random.uniform(97, 345), 2)
-        subtotal = round(quantidade * preco_unitario, 2)
-
-        batch.append(
-            {
-                "id_pedido": id_pedido,
-                "id_produto": id_produto,
-                "quantidade": quantidade,
-                "preco_unitario": preco_unitario,
-                "subtotal": subtotal,
-            },
+    """Insere dados de itens pedidos (avulsos, em pedidos já existentes) no banco de dados."""
+
+    # Pedidos e produtos vêm do registro, mais uma amostra das execuções anteriores lida pela chave;
+    # na carga incremental os itens vão só para os pedidos criados nesta execução
+    with conexao_leitura() as connection:
+        ids_pedidos = registro.ids_disponiveis(
+            connection,
+            pedidos.__table__,
+            0 if INCREMENTAL else NUM_PEDIDOS,
+        )
+        ids_produtos = registro.ids_disponiveis(
+            connection,
+            produtos.__table__,
+            NUM_PEDIDOS,
         )
 
-        if len(batch) >= 10:
-            with engine.begin() as connection:
-                connection.execute(itenspedido.__table__.insert(), batch)
-            batch = []
-
-    if batch:
-        with engine.begin() as connection:
-            connection.execute(itenspedido.__table__.insert(), batch)
+    carregar_entidade(
+        itenspedido.__table__,
+        "itens_pedidos",
+        NUM_PEDIDOS,
+        desc="Inserindo itens pedidos",
+        contexto={"ids_pedidos": ids_pedidos, "ids_produtos": ids_produtos},
+    )
 
     print("Itens pedidos inseridos com sucesso!")
 
 
-def update_pedidos():
-    """Atualiza os pedidos com base nos itens dos pedidos."""
+def update_pedidos(ids_pedidos=None):
+    """Atualiza os pedidos com base nos itens dos pedidos.
 
-    with engine.begin() as connection:
-        result_pedidos = connection.execute(pedidos.__table__.select()).fetchall()
-        result_itenspedidos = connection.execute(
-            itenspedido.__table__.select(),
-        ).fetchall()
-        result_clientes = connection.execute(clientes.__table__.select()).fetchall()
+    Por padrão atualiza só os pedidos que receberam itens avulsos nesta execução (registro),
+    lendo do banco apenas esses pedidos e a soma dos seus itens. O fluxo padrão gera os pedidos
+    já com os totais dos itens; esta rotina fica para o modo de itens avulsos e para reparos.
+    """
 
-    pedidos_map = {p.id: p for p in result_pedidos}
-    clientes_map = {c.id: c for c in result_clientes}
+    if ids_pedidos is None:
+        ids_pedidos = registro.pedidos_com_itens
+    ids_pedidos = sorted(set(ids_pedidos))
 
-    itens_por_pedido = {}
-    for item in result_itenspedidos:
-        itens_por_pedido.setdefault(item.id_pedido, []).append(item)
+    tabela_pedidos = pedidos.__table__
+    tabela_itens = itenspedido.__table__
+    tabela_clientes = clientes.__table__
 
     stmt = (
-        pedidos.__table__.update()
-        .where(pedidos.__table__.c.id == sa.bindparam("b_id"))
+        tabela_pedidos.update()
+        .where(tabela_pedidos.c.id == sa.bindparam("b_id"))
         .values(
             quantidade=sa.bindparam("quantidade"),
             subtotal=sa.bindparam("subtotal"),
@@ -453,49 +636,270 @@ def update_pedidos():
         )
     )
 
-    batch = []
-
-    for id_pedido, pedido in tqdm(pedidos_map.items(), desc="Atualizando pedidos"):
-        itens = itens_por_pedido.get(id_pedido)
-        if not itens:
-            continue
+    def gerar_atualizacoes():
+        for lote in loader.chunked(
+            tqdm(ids_pedidos, desc="Atualizando pedidos"),
+            IDS_POR_CONSULTA,
+        ):
+            with carregador.transaction() as connection:
+                estados = dict(
+                    connection.execute(
+                        sa.select(tabela_pedidos.c.id, tabela_clientes.c.estado)
+                        .join(
+                            tabela_clientes,
+                            tabela_clientes.c.id == tabela_pedidos.c.id_cliente,
+                        )
+                        .where(tabela_pedidos.c.id.in_(lote)),
+                    ).all(),
+                )
+                somas_itens = connection.execute(
+                    sa.select(
+                        tabela_itens.c.id_pedido,
+                        sa.func.sum(tabela_itens.c.quantidade),
+                        sa.func.sum(tabela_itens.c.subtotal),
+                    )
+                    .where(tabela_itens.c.id_pedido.in_(lote))
+                    .group_by(tabela_itens.c.id_pedido),
+                ).all()
+
+            # Frete, desconto e total somados em centavos, como no gerador
+            for id_pedido, quantidade_total, subtotal_total in somas_itens:
+                subtotal_total = dinheiro.para_centavos(subtotal_total)
+                frete = gerador.calcular_frete(estados[id_pedido])
+                valor_desconto = dinheiro.desconto(subtotal_total)
+                total = subtotal_total + frete - valor_desconto
+
+                yield dinheiro.converter(
+                    {
+                        "b_id": id_pedido,
+                        "quantidade": quantidade_total,
+                        "subtotal": subtotal_total,
+                        "frete": frete,
+                        "valor_desconto": valor_desconto,
+                        "total": total,
+                    },
+                    gerador.DINHEIRO_PEDIDOS,
+                )
+
+    carregador.execute(stmt, gerar_atualizacoes())
+
+
+def cargas(itens_avulsos=False):
+    """Etapas da carga e as tabelas gravadas por cada uma (as dependências vêm das chaves estrangeiras)."""
+    etapas = [
+        agendador.Carga(
+            "auxiliares",
+            insert_data_assistant,
+            [table for table, _ in TABELAS_AUXILIARES],
+        ),
+        agendador.Carga("clientes", insert_data_clientes, [clientes.__table__]),
+        agendador.Carga("produtos", insert_data_produtos, [produtos.__table__]),
+    ]
+
+    if itens_avulsos:
+        etapas += [
+            agendador.Carga("pedidos", insert_data_pedidos, [pedidos.__table__]),
+            # Sorteia os itens entre os pedidos já gravados (só com pedidos sem particionamento)
+            agendador.Carga(
+                "itens_pedidos",
+                insert_data_itens_pedidos,
+                [itenspedido.__table__],
+                depois_de=["pedidos"],
+            ),
+            # Lê os itens gravados, o que não aparece nas chaves estrangeiras de pedidos
+            agendador.Carga(
+                "update_pedidos",
+                update_pedidos,
+                [],
+                depois_de=["itens_pedidos"],
+                atualiza=[pedidos.__table__],
+            ),
+        ]
+    else:
+        etapas.append(
+            agendador.Carga(
+                "pedidos_com_itens",
+                insert_data_pedidos_com_itens,
+                [pedidos.__table__, itenspedido.__table__],
+            ),
+        )
 
-        quantidade_total = sum(i.quantidade for i in itens)
-        subtotal_total = sum(i.subtotal for i in itens)
+    return etapas
 
-        cliente = clientes_map[pedido.id_cliente]
-        frete = 0 if cliente.estado in ["SP", "RJ"] else 12.50
 
-        valor_desconto = round(subtotal_total * 0.10, 2) if subtotal_total > 200 else 0
-        total = subtotal_total + frete - valor_desconto
+def parse_args(argv=None):
+    """Lê os parâmetros de linha de comando do gerador."""
+    parser = argparse.ArgumentParser(
+        description="Gera dados sintéticos e insere no banco de dados.",
+    )
+    parser.add_argument(
+        "--scale-factor",
+        type=float,
+        default=None,
+        help="Fator de escala dos volumes (1 = 150 mil clientes, 2 mil produtos e 1,5 milhão de pedidos)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Semente do random e do Faker para gerar sempre os mesmos dados",
+    )
+    parser.add_argument(
+        "--data-base",
+        type=date.fromisoformat,
+        default=None,
+        help="Data de referência (AAAA-MM-DD) das datas geradas; padrão: hoje",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos de geração dos dados (0 = todos os núcleos); o resultado não depende deste valor",
+    )
+    parser.add_argument(
+        "--vetorizado",
+        action="store_true",
+        help="Gera as colunas de pedidos e itens pedidos com NumPy, em lotes colunares",
+    )
+    parser.add_argument(
+        "--pools",
+        action="store_true",
+        help="Sorteia nomes, endereços e descrições de pools do Faker salvos em disco, com CPF e e-mail únicos pelo id",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Gera só dados novos, com datas após a maior data de pedido já gravada",
+    )
+    parser.add_argument(
+        "--itens-avulsos",
+        action="store_true",
+        help="Modo antigo: gera pedidos, sorteia itens entre os pedidos e depois atualiza os totais",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Registra cada shard gravado e retoma a última execução, se ela foi interrompida",
+    )
+    parser.add_argument(
+        "--carga-inicial",
+        action="store_true",
+        help="Recria as tabelas sem índices, unique e chaves estrangeiras, carrega e só então os cria, com o tempo de cada fase",
+    )
+    parser.add_argument(
+        "--reset",
+        choices=("truncate", "recreate"),
+        default=None,
+        help="Antes da carga, esvazia as tabelas (TRUNCATE) ou as exclui e cria de novo (recreate)",
+    )
+    parser.add_argument(
+        "--unlogged",
+        action="store_true",
+        help="Com --reset recreate ou --carga-inicial, cria as tabelas UNLOGGED (cargas descartáveis, ex.: benchmarks)",
+    )
+    parser.add_argument(
+        "--sequencial",
+        action="store_true",
+        help="Executa as cargas uma de cada vez, em vez de paralelizar as tabelas independentes",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=sinks.SINKS,
+        default="postgres",
+        help="Destino dos dados: banco de dados (SQLAlchemy ou asyncpg), arquivos Parquet ou saída padrão (JSON por linha)",
+    )
+    parser.add_argument(
+        "--saida",
+        default="dados",
+        help="Diretório dos arquivos do sink parquet",
+    )
 
-        batch.append(
-            {
-                "b_id": id_pedido,
-                "quantidade": quantidade_total,
-                "subtotal": subtotal_total,
-                "frete": frete,
-                "valor_desconto": valor_desconto,
-                "total": total,
-            },
+    args = parser.parse_args(argv)
+    if args.itens_avulsos and args.sink not in ("postgres", "asyncpg"):
+        parser.error(
+            "--itens-avulsos atualiza os pedidos no banco e exige um sink do banco de dados",
         )
-
-        if len(batch) >= 500:
-            with engine.begin() as connection:
-                connection.execute(stmt, batch)
-            batch = []
-
-    if batch:
-        with engine.begin() as connection:
-            connection.execute(stmt, batch)
+    # Com pedidos particionado os itens levam a data do pedido, que os itens avulsos não conhecem
+    if args.itens_avulsos and esquema.particionada(pedidos.__table__):
+        parser.error(
+            "--itens-avulsos não combina com pedidos particionado (DB_PARTITION=month)",
+        )
+    if args.checkpoint and args.sink not in ("postgres", "asyncpg"):
+        parser.error(
+            "--checkpoint grava o progresso no banco e exige um sink do banco de dados",
+        )
+    if args.carga_inicial and args.sink not in ("postgres", "asyncpg"):
+        parser.error(
+            "--carga-inicial recria as tabelas no banco e exige um sink do banco de dados",
+        )
+    if args.carga_inicial and (args.incremental or args.checkpoint):
+        parser.error(
+            "--carga-inicial recria as tabelas e não combina com --incremental ou --checkpoint",
+        )
+    if args.reset and args.sink not in ("postgres", "asyncpg"):
+        parser.error(
+            "--reset apaga as tabelas no banco e exige um sink do banco de dados",
+        )
+    if args.reset and args.carga_inicial:
+        parser.error("--carga-inicial já recria as tabelas e não combina com --reset")
+    if args.unlogged and not (args.reset == "recreate" or args.carga_inicial):
+        parser.error(
+            "--unlogged vale só para tabelas recriadas (--reset recreate ou --carga-inicial)",
+        )
+    # Validado antes de qualquer DDL: o PostgreSQL não aceita tabelas particionadas UNLOGGED
+    if args.unlogged and any(
+        esquema.particionada(table) for table in Base.metadata.sorted_tables
+    ):
+        parser.error(
+            "--unlogged não combina com pedidos particionado (DB_PARTITION=month)",
+        )
+    return args
 
 
 if __name__ == "__main__":
-    # drop_tables()
-    Base.metadata.create_all(engine)
-    insert_data_assistant()
-    insert_data_clientes()
-    insert_data_produtos()
-    insert_data_pedidos()
-    insert_data_itens_pedidos()
-    update_pedidos()
+    args = parse_args()
+    configurar(
+        scale_factor=args.scale_factor,
+        seed=args.seed,
+        data_base=args.data_base,
+        workers=args.workers,
+        vetorizado=args.vetorizado,
+        incremental=args.incremental,
+        sink=criar_sink(args.sink, args.saida),
+        pools=args.pools,
+    )
+
+    # Tempo de cada fase da carga inicial
+    tempos: dict[str, float] = {}
+    if args.carga_inicial:
+        recriar_tabelas_sem_restricoes(tempos, args.unlogged)
+    elif args.reset:
+        resetar(args.reset, args.unlogged)
+    elif SINK.banco:
+        Base.metadata.create_all(engine)
+
+    # Uma execução interrompida é retomada com os seus parâmetros (inclusive as datas incrementais)
+    retomada = retomar_execucao() if args.checkpoint else None
+    if retomada:
+        itens_avulsos = retomada["itens_avulsos"]
+    else:
+        itens_avulsos = args.itens_avulsos
+        if INCREMENTAL:
+            iniciar_incremental()
+        if CHECKPOINT:
+            CHECKPOINT.iniciar(parametros_execucao(itens_avulsos))
+    if SINK.banco:
+        criar_particoes()
+
+    # Com o sink stdout as mensagens de progresso vão para o stderr, deixando só os dados no stdout
+    mensagens = sys.stderr if args.sink == "stdout" else sys.stdout
+    # Cargas independentes (ex.: clientes e produtos) rodam juntas quando o sink permite
+    paralelas = None if SINK.concorrente and not args.sequencial else 1
+    with redirect_stdout(mensagens), esquema.fase(tempos, "carga"), SINK.execucao():
+        agendador.executar(cargas(itens_avulsos), paralelas=paralelas)
+
+    if args.carga_inicial:
+        finalizar_carga_inicial(tempos)
+
+    if CHECKPOINT:
+        CHECKPOINT.concluir()
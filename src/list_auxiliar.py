@@ -1,3 +1,8 @@
+# Bibliotecas utilizadas
+from itertools import accumulate
+from types import MappingProxyType
+import numpy as np
+
 # Gêneros para os clientes
 GENEROS_PESSOAS = ["Masculino", "Feminino", "Outro"]
 
@@ -677,3 +682,167 @@ CBE = {
 
 # Canais de venda
 CANAIS_VENDA = ["Loja Física", "E-commerce", "Marketplace", "Telefone", "WhatsApp"]
+
+# Consultas pré-calculadas na importação (somente leitura), usadas pelo gerador em cada linha
+
+# Id de cada marca na tabela auxiliar (posição na lista, a partir de 1)
+ID_MARCA = MappingProxyType({marca: posicao for posicao, marca in enumerate(MARCAS, 1)})
+
+# Modelos de cada marca
+MODELOS_POR_MARCA = MappingProxyType(
+    {marca: tuple(modelos) for marca, modelos in MODELOS.items()},
+)
+
+# Tamanhos por id do gênero do produto, com os pesos acumulados do sorteio
+TAMANHOS_POR_GENERO = MappingProxyType(
+    {
+        id_genero: (tuple(tamanhos), tuple(accumulate(pesos)))
+        for id_genero, tamanhos, pesos in [
+            (
+                1,
+                ["37", "38", "39", "40", "41", "42", "43", "44"],
+                [5, 8, 15, 18, 18, 15, 8, 5],
+            ),
+            (
+                2,
+                ["34", "35", "36", "37", "38", "39", "40"],
+                [5, 8, 18, 20, 18, 10, 5],
+            ),
+            (
+                3,
+                ["34", "35", "36", "37", "38", "39", "40", "41", "42", "43", "44"],
+                [3, 5, 8, 12, 15, 15, 15, 12, 8, 5, 3],
+            ),
+        ]
+    },
+)
+
+# CBE achatado: um local (estado, cidade, bairro) por bairro, em arrays paralelos
+LOCAIS_ESTADOS = tuple(
+    estado
+    for estado, cidades in CBE.items()
+    for bairros in cidades.values()
+    for _ in bairros
+)
+LOCAIS_CIDADES = tuple(
+    cidade
+    for cidades in CBE.values()
+    for cidade, bairros in cidades.items()
+    for _ in bairros
+)
+LOCAIS_BAIRROS = tuple(
+    bairro
+    for cidades in CBE.values()
+    for bairros in cidades.values()
+    for bairro in bairros
+)
+LOCAIS = range(len(LOCAIS_BAIRROS))
+
+# População dos estados em milhares de habitantes (Censo IBGE 2022)
+POPULACAO_ESTADOS = MappingProxyType(
+    {
+        "AL": 3128,
+        "BA": 14141,
+        "CE": 8794,
+        "ES": 3834,
+        "GO": 7056,
+        "MA": 6777,
+        "MT": 3658,
+        "PA": 8121,
+        "PB": 3974,
+        "PE": 9059,
+        "PI": 3271,
+        "RJ": 16055,
+        "RN": 3302,
+        "SC": 7610,
+        "SE": 2210,
+        "SP": 44411,
+    },
+)
+
+
+def pesos_locais(pesos_estados=None):
+    """Peso de cada local: o peso do estado dividido igualmente entre suas cidades e bairros.
+
+    Sem `pesos_estados`, os estados são equiprováveis (estado, cidade e bairro sorteados por nível).
+    """
+    return tuple(
+        (pesos_estados[estado] if pesos_estados else 1 / len(CBE))
+        / (len(cidades) * len(bairros))
+        for estado, cidades in CBE.items()
+        for bairros in cidades.values()
+        for _ in bairros
+    )
+
+
+# Pesos acumulados dos locais: estado, cidade do estado e bairro da cidade equiprováveis
+PESOS_ACUMULADOS_LOCAIS = tuple(accumulate(pesos_locais()))
+
+
+class AmostradorAlias:
+    """Sorteio ponderado de posições em O(1) pelo método alias (Vose), montado uma única vez.
+
+    Cada posição sorteada é aceita com a probabilidade da sua coluna ou trocada pelo seu alias;
+    `sortear` usa um único `random()` por sorteio e `sortear_lote` sorteia lotes com NumPy.
+    """
+
+    def __init__(self, pesos):
+        quantidade = len(pesos)
+        total = sum(pesos)
+        escalados = [peso * quantidade / total for peso in pesos]
+
+        probabilidades = [1.0] * quantidade
+        alias = list(range(quantidade))
+        pequenos = [posicao for posicao, peso in enumerate(escalados) if peso < 1]
+        grandes = [posicao for posicao, peso in enumerate(escalados) if peso >= 1]
+
+        while pequenos and grandes:
+            pequeno = pequenos.pop()
+            grande = grandes.pop()
+            probabilidades[pequeno] = escalados[pequeno]
+            alias[pequeno] = grande
+
+            # O excesso do grande completa a coluna do pequeno
+            escalados[grande] += escalados[pequeno] - 1
+            if escalados[grande] < 1:
+                pequenos.append(grande)
+            else:
+                grandes.append(grande)
+
+        # As sobras (só por arredondamento) ficam com probabilidade 1
+        self.quantidade = quantidade
+        self.probabilidades = tuple(probabilidades)
+        self.alias = tuple(alias)
+        self.probabilidades_np = np.array(probabilidades)
+        self.alias_np = np.array(alias)
+
+    def __len__(self):
+        return self.quantidade
+
+    def sortear(self, rng):
+        """Sorteia uma posição com um `random.Random`: a parte inteira escolhe a coluna."""
+        sorteio = rng.random() * self.quantidade
+        posicao = int(sorteio)
+        if sorteio - posicao < self.probabilidades[posicao]:
+            return posicao
+        return self.alias[posicao]
+
+    def sortear_lote(self, rng, quantidade):
+        """Sorteia `quantidade` posições de uma vez com um `numpy.random.Generator`."""
+        posicoes = rng.integers(0, self.quantidade, size=quantidade)
+        aceitas = rng.random(quantidade) < self.probabilidades_np[posicoes]
+        return np.where(aceitas, posicoes, self.alias_np[posicoes])
+
+
+# Amostradores dos locais: "uniform" (equiprováveis por nível) ou "population" (pela população do estado)
+AMOSTRADORES_LOCAIS = MappingProxyType(
+    {
+        "uniform": AmostradorAlias(pesos_locais()),
+        "population": AmostradorAlias(pesos_locais(POPULACAO_ESTADOS)),
+    },
+)
+
+# Arrays NumPy dos locais, para converter as posições de um sorteio em lote
+LOCAIS_ESTADOS_NP = np.array(LOCAIS_ESTADOS)
+LOCAIS_CIDADES_NP = np.array(LOCAIS_CIDADES)
+LOCAIS_BAIRROS_NP = np.array(LOCAIS_BAIRROS)
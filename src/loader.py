@@ -0,0 +1,302 @@
+# Script com as rotinas de gravação em lote no banco de dados (INSERT em lote ou COPY FROM STDIN).
+
+# Bibliotecas utilizadas
+import csv
+import io
+import os
+from contextlib import contextmanager
+import sqlalchemy as sa
+
+# Modo de carga: "insert" (executemany do SQLAlchemy) ou "copy" (COPY FROM STDIN do PostgreSQL)
+LOAD_MODE = os.getenv("LOAD_MODE", "insert")
+
+# Quantidade de linhas por lote; sem BATCH_SIZE definido usa o padrão de cada modo de carga
+DEFAULT_BATCH_SIZE = {"insert": 500, "copy": 10000}
+BATCH_SIZE = os.getenv("BATCH_SIZE")
+
+# Política de commit: "batch" (um commit por lote), "table" (um por tabela) ou "run" (um por execução)
+COMMIT_POLICY = os.getenv("COMMIT_POLICY", "batch")
+COMMIT_POLICIES = ("batch", "table", "run")
+
+# Marcador de valores nulos no CSV enviado ao COPY
+COPY_NULL = r"\N"
+
+# Caracteres enviados por escrita no COPY do psycopg 3
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def default_batch_size(mode=None):
+    """Retorna o tamanho de lote configurado ou o padrão do modo de carga."""
+    mode = mode or LOAD_MODE
+    if BATCH_SIZE:
+        return int(BATCH_SIZE)
+    return DEFAULT_BATCH_SIZE[mode]
+
+
+def chunked(rows, size):
+    """Agrupa um iterável de linhas em listas de até `size` elementos."""
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    # 🔥 ENTREGA O RESTO
+    if batch:
+        yield batch
+
+
+def rows_to_csv(rows, colunas):
+    """Serializa as linhas em um buffer CSV em memória no formato esperado pelo COPY."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow(
+            [COPY_NULL if row[coluna] is None else row[coluna] for coluna in colunas],
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def column_values(coluna):
+    """Converte uma coluna (array NumPy ou sequência) em lista de valores Python (NaT vira None)."""
+    return coluna.tolist() if hasattr(coluna, "tolist") else list(coluna)
+
+
+def columns_to_rows(colunas):
+    """Converte um lote colunar (coluna -> array) em uma lista de linhas (dicts)."""
+    nomes = list(colunas)
+    valores = [column_values(colunas[nome]) for nome in nomes]
+    return [dict(zip(nomes, linha)) for linha in zip(*valores)]
+
+
+def columns_to_csv(colunas):
+    """Serializa um lote colunar em um buffer CSV em memória no formato esperado pelo COPY."""
+    valores = []
+    for coluna in colunas.values():
+        lista = column_values(coluna)
+
+        # Só colunas de datas ou objetos (ex.: data_envio) podem conter nulos
+        if getattr(getattr(coluna, "dtype", None), "kind", "O") in "OM":
+            lista = [COPY_NULL if valor is None else valor for valor in lista]
+        valores.append(lista)
+
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(zip(*valores))
+    buffer.seek(0)
+    return buffer
+
+
+def slice_columns(colunas, size):
+    """Divide um lote colunar em lotes menores de até `size` linhas."""
+    total = len(next(iter(colunas.values())))
+
+    for inicio in range(0, total, size):
+        yield {nome: coluna[inicio : inicio + size] for nome, coluna in colunas.items()}
+
+
+def _copy(connection, table, colunas, buffer):
+    """Executa o COPY FROM STDIN das colunas informadas a partir do buffer CSV."""
+    preparer = connection.dialect.identifier_preparer
+    sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '{}')".format(
+        preparer.format_table(table),
+        ", ".join(preparer.quote(coluna) for coluna in colunas),
+        COPY_NULL,
+    )
+
+    # Usa o cursor DBAPI da própria conexão para participar da transação aberta
+    cursor = connection.connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(sql, buffer)
+        else:
+            # psycopg 3 (DB_DRIVER=psycopg): COPY pelo gerenciador de contexto do cursor
+            with cursor.copy(sql) as copy:
+                while dados := buffer.read(COPY_CHUNK_SIZE):
+                    copy.write(dados)
+    finally:
+        cursor.close()
+
+
+def copy_rows(connection, table, rows):
+    """Grava as linhas na tabela via COPY FROM STDIN (psycopg2 copy_expert)."""
+    if not rows:
+        return 0
+
+    colunas = list(rows[0].keys())
+    _copy(connection, table, colunas, rows_to_csv(rows, colunas))
+
+    return len(rows)
+
+
+def write_columns(connection, table, colunas, mode=None):
+    """Grava um lote colunar na tabela usando o modo de carga configurado."""
+    mode = mode or LOAD_MODE
+    total = len(next(iter(colunas.values())))
+
+    if mode == "copy":
+        _copy(connection, table, list(colunas), columns_to_csv(colunas))
+        return total
+
+    return write_batch(connection, table, columns_to_rows(colunas), mode)
+
+
+def write_batch(connection, table, rows, mode=None):
+    """Grava um lote de linhas na tabela usando o modo de carga configurado."""
+    mode = mode or LOAD_MODE
+
+    if mode == "copy":
+        return copy_rows(connection, table, rows)
+    if mode == "insert":
+        connection.execute(table.insert(), rows)
+        return len(rows)
+
+    raise ValueError(f"Modo de carga inválido: {mode}")
+
+
+def has_rows(connection, table):
+    """Indica se a tabela tem alguma linha; o EXISTS para na primeira, sem contar a tabela inteira."""
+    return connection.execute(sa.select(sa.exists().select_from(table))).scalar()
+
+
+def estimated_rows(connection, table):
+    """Quantidade estimada de linhas pelo catálogo (pg_class.reltuples), sem ler a tabela.
+
+    Retorna None se a tabela não existe ou ainda não foi analisada (VACUUM/ANALYZE).
+    """
+    nome = connection.dialect.identifier_preparer.format_table(table)
+    estimativa = connection.execute(
+        sa.text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:nome)"),
+        {"nome": nome},
+    ).scalar()
+    return None if estimativa is None or estimativa < 0 else int(estimativa)
+
+
+def next_id(connection, table):
+    """Retorna o primeiro id livre da tabela, para gerar linhas com ids pré-atribuídos."""
+    result = connection.execute(sa.select(sa.func.coalesce(sa.func.max(table.c.id), 0)))
+    return result.scalar() + 1
+
+
+def sync_sequence(connection, table):
+    """Alinha a sequência do id da tabela ao maior id gravado com ids pré-atribuídos."""
+    connection.execute(
+        sa.select(
+            sa.func.setval(
+                sa.func.pg_get_serial_sequence(table.name, "id"),
+                sa.select(
+                    sa.func.coalesce(sa.func.max(table.c.id), 1),
+                ).scalar_subquery(),
+            ),
+        ),
+    )
+
+
+class BatchLoader:
+    """Agrupa as linhas geradas em lotes e controla as transações conforme a política de commit."""
+
+    def __init__(self, engine, batch_size=None, commit_policy=None, mode=None):
+        self.engine = engine
+        self.mode = mode or LOAD_MODE
+        self.batch_size = batch_size or default_batch_size(self.mode)
+        self.commit_policy = commit_policy or COMMIT_POLICY
+
+        if self.commit_policy not in COMMIT_POLICIES:
+            raise ValueError(f"Política de commit inválida: {self.commit_policy}")
+
+        # Conexão compartilhada durante uma execução com a política "run"
+        self._connection = None
+
+    @contextmanager
+    def run(self):
+        """Delimita uma execução; na política "run" tudo acontece em uma única transação."""
+        if self.commit_policy != "run" or self._connection is not None:
+            yield self
+            return
+
+        with self.engine.begin() as connection:
+            self._connection = connection
+            try:
+                yield self
+            finally:
+                self._connection = None
+
+    @contextmanager
+    def transaction(self):
+        """Retorna a conexão da execução em andamento ou abre uma nova transação."""
+        if self._connection is not None:
+            yield self._connection
+        else:
+            with self.engine.begin() as connection:
+                yield connection
+
+    def _gravar(self, lotes, gravar_lote):
+        """Percorre os lotes, aplicando `gravar_lote` dentro da transação adequada."""
+        total = 0
+
+        if self.commit_policy == "batch":
+            for batch in lotes:
+                with self.transaction() as connection:
+                    total += gravar_lote(connection, batch)
+        else:
+            with self.transaction() as connection:
+                for batch in lotes:
+                    total += gravar_lote(connection, batch)
+
+        return total
+
+    def load(self, table, rows):
+        """Insere as linhas na tabela em lotes e retorna a quantidade gravada."""
+        return self._gravar(
+            chunked(rows, self.batch_size),
+            lambda connection, batch: write_batch(connection, table, batch, self.mode),
+        )
+
+    def load_columns(self, table, lotes_colunares):
+        """Insere lotes colunares (coluna -> array) na tabela e retorna a quantidade gravada."""
+        lotes = (
+            lote
+            for colunas in lotes_colunares
+            for lote in slice_columns(colunas, self.batch_size)
+        )
+        return self._gravar(
+            lotes,
+            lambda connection, batch: write_columns(
+                connection,
+                table,
+                batch,
+                self.mode,
+            ),
+        )
+
+    def load_tables(self, shards):
+        """Grava shards com linhas de várias tabelas relacionadas, na ordem dada em cada shard.
+
+        Cada shard é uma lista de pares (tabela, linhas ou lote colunar); na política "batch" o
+        shard inteiro (ex.: pedidos e seus itens) é gravado em uma única transação.
+        """
+
+        def gravar_shard(connection, shard):
+            total = 0
+            for table, dados in shard:
+                if isinstance(dados, dict):
+                    for lote in slice_columns(dados, self.batch_size):
+                        total += write_columns(connection, table, lote, self.mode)
+                else:
+                    for lote in chunked(dados, self.batch_size):
+                        total += write_batch(connection, table, lote, self.mode)
+            return total
+
+        return self._gravar(shards, gravar_shard)
+
+    def execute(self, statement, rows):
+        """Executa um comando (ex.: UPDATE) em lotes de parâmetros via executemany."""
+
+        def executar_lote(connection, batch):
+            connection.execute(statement, batch)
+            return len(batch)
+
+        return self._gravar(chunked(rows, self.batch_size), executar_lote)
@@ -0,0 +1,128 @@
+# Script com a geração dos dados em shards: cada shard tem semente e faixa de ids próprias e pode
+# ser gerado em um processo separado, mantendo o resultado idêntico para qualquer número de processos.
+
+# Bibliotecas utilizadas
+from collections import deque
+from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from src import pools as pools_faker
+from src.gerador import GeradorDados
+from src.gerador_colunar import GeradorColunar
+
+# Quantidade de linhas por shard (fixa, para que a divisão não dependa do número de processos)
+SHARD_SIZE = 10_000
+
+# Dados compartilhados pelos shards de um processo worker (clientes, ids de produtos, ...)
+_contexto_worker: dict[str, Any] = {}
+
+
+def _inicializar_worker(contexto):
+    """Recebe uma única vez, em cada processo worker, os dados compartilhados pelos shards."""
+    global _contexto_worker
+    _contexto_worker = contexto
+
+
+def semente_shard(seed, entidade, indice):
+    """Deriva a semente de um shard a partir da semente da execução."""
+    return f"{seed}-{entidade}-{indice}"
+
+
+def dividir_em_shards(quantidade, id_inicial):
+    """Divide a faixa de ids da entidade em shards de até SHARD_SIZE linhas."""
+    for indice, inicio in enumerate(range(0, quantidade, SHARD_SIZE)):
+        yield indice, id_inicial + inicio, min(SHARD_SIZE, quantidade - inicio)
+
+
+def resultado_shard(tarefa, contexto):
+    """Gera um shard: lista de linhas ou, no modo vetorizado, um lote colunar.
+
+    Entidades que geram várias tabelas juntas (pedidos com itens) devolvem um dict tabela -> shard.
+    """
+    (
+        entidade,
+        seed,
+        data_base,
+        data_inicial,
+        indice,
+        id_inicial,
+        quantidade,
+        vetorizado,
+        pools,
+    ) = tarefa
+    semente = semente_shard(seed, entidade, indice)
+
+    if vetorizado:
+        gerador = GeradorColunar(semente, data_base, data_inicial)
+        return getattr(gerador, entidade)(quantidade, id_inicial, **contexto)
+
+    gerador = GeradorDados(
+        semente,
+        data_base,
+        data_inicial,
+        pools=pools_faker.carregar() if pools else None,
+    )
+    resultado = getattr(gerador, entidade)(quantidade, id_inicial, **contexto)
+    return resultado if isinstance(resultado, dict) else list(resultado)
+
+
+def gerar_shard(tarefa):
+    """Gera um shard dentro do processo worker."""
+    return resultado_shard(tarefa, _contexto_worker)
+
+
+def gerar_shards(
+    entidade,
+    quantidade,
+    id_inicial,
+    seed,
+    data_base,
+    workers=1,
+    contexto=None,
+    vetorizado=False,
+    data_inicial=None,
+    pools=False,
+    pular=(),
+):
+    """Gera os shards da entidade, em ordem, usando até `workers` processos.
+
+    Com `pools`, nomes, endereços e descrições são sorteados dos pools do Faker em disco. Os shards
+    com posição em `pular` (já gravados em uma execução interrompida) não são gerados.
+    """
+    contexto = contexto or {}
+    tarefas = [
+        (
+            entidade,
+            seed,
+            data_base,
+            data_inicial,
+            indice,
+            inicio,
+            tamanho,
+            vetorizado,
+            pools,
+        )
+        for indice, inicio, tamanho in dividir_em_shards(quantidade, id_inicial)
+        if indice not in pular
+    ]
+
+    if workers <= 1 or len(tarefas) <= 1:
+        for tarefa in tarefas:
+            yield resultado_shard(tarefa, contexto)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_inicializar_worker,
+        initargs=(contexto,),
+    ) as executor:
+        # Limita os shards em andamento para manter a memória estável se a carga for mais lenta
+        pendentes = deque()
+
+        for tarefa in tarefas:
+            pendentes.append(executor.submit(gerar_shard, tarefa))
+
+            if len(pendentes) >= workers * 2:
+                yield pendentes.popleft().result()
+
+        while pendentes:
+            yield pendentes.popleft().result()
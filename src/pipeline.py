@@ -0,0 +1,65 @@
+# Script com o pipeline de geração em iteradores encadeados: gerador -> transformadores -> fatiador -> sink.
+# Cada etapa consome um shard por vez, então a memória depende do tamanho do shard e do lote, não do volume.
+
+# Bibliotecas utilizadas
+from src.loader import chunked, slice_columns
+
+
+def transformar(shards, *funcoes):
+    """Aplica as funções a cada shard, na ordem, à medida que os shards são consumidos."""
+    for shard in shards:
+        for funcao in funcoes:
+            shard = funcao(shard)
+        yield shard
+
+
+def por_tabela(shards, tabelas):
+    """Converte cada shard em pares (tabela, linhas ou lote colunar), na ordem das tabelas.
+
+    Com uma única tabela o shard é o próprio conteúdo; com várias (ex.: pedidos e itens) o shard
+    é um dict com o conteúdo de cada tabela pelo nome.
+    """
+    for shard in shards:
+        if len(tabelas) == 1:
+            yield [(tabelas[0], shard)]
+        else:
+            yield [(tabela, shard[tabela.name]) for tabela in tabelas]
+
+
+def lotes(dados, tamanho):
+    """Divide linhas ou um lote colunar em lotes de até `tamanho` linhas."""
+    if isinstance(dados, dict):
+        return slice_columns(dados, tamanho)
+    return chunked(dados, tamanho)
+
+
+def fatiar(shards, tamanho, por_shard=False):
+    """Divide os shards em lotes de até `tamanho` linhas, um lote (de uma tabela) por vez.
+
+    Com `por_shard`, entrega juntos todos os lotes de um shard (ex.: pedidos e seus itens).
+    """
+    for shard in shards:
+        fatiado = [
+            (tabela, lote) for tabela, dados in shard for lote in lotes(dados, tamanho)
+        ]
+        if por_shard:
+            yield fatiado
+        else:
+            for par in fatiado:
+                yield [par]
+
+
+def executar(shards, sink, tabelas, transformadores=(), tamanho=None, marcar=None):
+    """Encadeia as etapas até o sink e retorna a quantidade de linhas gravadas.
+
+    Com `marcar` (ex.: checkpoints), os lotes seguem agrupados por shard e passam pela função antes
+    do sink, que pode acrescentar linhas de outras tabelas ao shard.
+    """
+    lotes = fatiar(
+        por_tabela(transformar(shards, *transformadores), tabelas),
+        tamanho or sink.batch_size,
+        por_shard=sink.por_shard or marcar is not None,
+    )
+    if marcar is not None:
+        lotes = marcar(lotes)
+    return sink.gravar(lotes)
@@ -0,0 +1,158 @@
+# Script com os pools de valores do Faker (nomes, endereços, descrições e domínios de e-mail): gerados
+# uma única vez, deduplicados e salvos em disco, para que as linhas sejam montadas sorteando índices.
+
+# Bibliotecas utilizadas
+import json
+import os
+import threading
+from pathlib import Path
+import faker
+from faker import Faker
+
+# Valores gerados por campo (antes da deduplicação) e diretório do cache em disco
+FAKER_POOL_SIZE = int(os.getenv("FAKER_POOL_SIZE", "50000"))
+FAKER_POOL_DIR = os.getenv("FAKER_POOL_DIR", ".cache/faker")
+
+# Localização e semente fixa dos pools: o mesmo arquivo serve para qualquer semente da execução
+LOCALIZACAO = "pt_BR"
+SEMENTE_POOLS = 0
+
+# Campos dos pools e o método do Faker que gera cada valor
+CAMPOS = {
+    "nomes_masculinos": lambda fake: fake.first_name_male(),
+    "sobrenomes_masculinos": lambda fake: fake.last_name_male(),
+    "nomes_femininos": lambda fake: fake.first_name_female(),
+    "sobrenomes_femininos": lambda fake: fake.last_name_female(),
+    "nomes_nao_binarios": lambda fake: fake.first_name_nonbinary(),
+    "sobrenomes_nao_binarios": lambda fake: fake.last_name_nonbinary(),
+    "dominios_email": lambda fake: fake.free_email_domain(),
+    "enderecos": lambda fake: fake.street_address(),
+    "descricoes": lambda fake: fake.text(max_nb_chars=200),
+}
+
+# Pools já carregados no processo (um por processo, compartilhado pelas threads das cargas)
+_pools = None
+_trava = threading.Lock()
+
+
+class ValoresFaker:
+    """Valores gerados pelo Faker a cada linha (modo padrão, sem pools)."""
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def nome(self, rng, id_genero):
+        """Nome e sobrenome do gênero do cliente."""
+        if id_genero == 1:
+            return self.fake.first_name_male(), self.fake.last_name_male()
+        if id_genero == 2:
+            return self.fake.first_name_female(), self.fake.last_name_female()
+        return self.fake.first_name_nonbinary(), self.fake.last_name_nonbinary()
+
+    def dominio_email(self, rng):
+        """Domínio de um e-mail gratuito."""
+        return self.fake.free_email_domain()
+
+    def telefone(self, rng):
+        """Número do celular, sem o DDD."""
+        return self.fake.numerify(text="####-####")
+
+    def endereco(self, rng):
+        """Logradouro com número."""
+        return self.fake.street_address()
+
+    def cep(self, rng):
+        """CEP no formato 00000-000."""
+        return self.fake.bothify(text="#####-###")
+
+    def descricao(self, rng):
+        """Descrição do produto, com até 200 caracteres."""
+        return self.fake.text(max_nb_chars=200)
+
+
+class PoolsFaker:
+    """Valores do Faker pré-gerados por campo, sorteados por índice com o random da linha."""
+
+    def __init__(self, valores):
+        self.valores = {campo: tuple(valores[campo]) for campo in CAMPOS}
+        self.nomes = {
+            1: (
+                self.valores["nomes_masculinos"],
+                self.valores["sobrenomes_masculinos"],
+            ),
+            2: (self.valores["nomes_femininos"], self.valores["sobrenomes_femininos"]),
+            3: (
+                self.valores["nomes_nao_binarios"],
+                self.valores["sobrenomes_nao_binarios"],
+            ),
+        }
+
+    def nome(self, rng, id_genero):
+        """Nome e sobrenome do gênero do cliente."""
+        nomes, sobrenomes = self.nomes[id_genero]
+        return rng.choice(nomes), rng.choice(sobrenomes)
+
+    def dominio_email(self, rng):
+        """Domínio de um e-mail gratuito, sorteado do pool."""
+        return rng.choice(self.valores["dominios_email"])
+
+    def telefone(self, rng):
+        """Número do celular, sem o DDD (oito dígitos sorteados de uma vez)."""
+        numero = f"{rng.randrange(10**8):08d}"
+        return f"{numero[:4]}-{numero[4:]}"
+
+    def endereco(self, rng):
+        """Logradouro com número, sorteado do pool."""
+        return rng.choice(self.valores["enderecos"])
+
+    def cep(self, rng):
+        """CEP no formato 00000-000 (oito dígitos sorteados de uma vez)."""
+        numero = f"{rng.randrange(10**8):08d}"
+        return f"{numero[:5]}-{numero[5:]}"
+
+    def descricao(self, rng):
+        """Descrição do produto, sorteada do pool."""
+        return rng.choice(self.valores["descricoes"])
+
+
+def arquivo_cache(tamanho=None):
+    """Arquivo dos pools em disco, por localização, versão do Faker e tamanho."""
+    tamanho = tamanho or FAKER_POOL_SIZE
+    return Path(FAKER_POOL_DIR) / f"pools_{LOCALIZACAO}_{faker.VERSION}_{tamanho}.json"
+
+
+def gerar_valores(tamanho=None):
+    """Gera `tamanho` valores de cada campo com o Faker e remove os repetidos, mantendo a ordem."""
+    tamanho = tamanho or FAKER_POOL_SIZE
+    fake = Faker(LOCALIZACAO)
+    fake.seed_instance(SEMENTE_POOLS)
+    return {
+        campo: list(dict.fromkeys(gerar(fake) for _ in range(tamanho)))
+        for campo, gerar in CAMPOS.items()
+    }
+
+
+def carregar(tamanho=None):
+    """Pools do processo: lidos do cache em disco ou gerados e salvos na primeira execução."""
+    global _pools
+
+    with _trava:
+        if _pools is None:
+            caminho = arquivo_cache(tamanho)
+            if caminho.exists():
+                valores = json.loads(caminho.read_text(encoding="utf-8"))
+            else:
+                valores = gerar_valores(tamanho)
+
+                # Grava em um arquivo temporário e renomeia, para nunca expor um cache incompleto
+                caminho.parent.mkdir(parents=True, exist_ok=True)
+                temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+                temporario.write_text(
+                    json.dumps(valores, ensure_ascii=False),
+                    encoding="utf-8",
+                )
+                os.replace(temporario, caminho)
+
+            _pools = PoolsFaker(valores)
+
+    return _pools
@@ -0,0 +1,187 @@
+# Script com o registro em memória das chaves e atributos gerados na execução. As etapas seguintes
+# (pedidos, itens e atualização dos pedidos) usam o registro em vez de reler tabelas inteiras do banco.
+# A memória do registro cresce com o número de clientes (o índice é copiado para cada worker).
+
+# Bibliotecas utilizadas
+from array import array
+from src.gerador import IndiceClientes
+from src.loader import next_id
+import numpy as np
+import random
+import sqlalchemy as sa
+
+# Quantidade de ids por consulta ao buscar linhas de execuções anteriores pela chave primária
+IDS_POR_CONSULTA = 10_000
+
+# Amostra de execuções anteriores: no máximo AMOSTRA_ANTERIORES linhas, lidas em faixas sorteadas de
+# IDS_POR_FAIXA ids contíguos (leituras curtas do índice da chave primária, sem varrer a tabela)
+AMOSTRA_ANTERIORES = IDS_POR_CONSULTA
+IDS_POR_FAIXA = 100
+
+# Entidades cujas chaves ficam no registro (usadas pelas etapas seguintes)
+ENTIDADES = ("clientes", "produtos", "pedidos", "itens_pedidos")
+
+
+class Registro:
+    """Chaves e atributos das linhas geradas na execução, guardados em colunas compactas."""
+
+    def __init__(self, seed=None):
+        self.seed = seed
+
+        # Maior id de cada tabela antes desta execução (as linhas novas vêm depois dele)
+        self.id_max_anterior = {}
+
+        # Clientes novos com frete e endereço de entrega; ids de produtos e pedidos novos
+        self.clientes = IndiceClientes()
+        self.produtos = array("q")
+        self.pedidos = array("q")
+
+        # Pedidos que receberam itens avulsos nesta execução (precisam ter os totais atualizados)
+        self.pedidos_com_itens = array("q")
+
+        # Próximo id das linhas geradas sem id (ex.: itens dos pedidos), nos sinks sem banco de dados
+        self.proximo_id = {}
+
+    def iniciar_tabela(self, table, id_inicial):
+        """Registra o primeiro id pré-atribuído da tabela nesta execução."""
+        self.id_max_anterior[table.name] = id_inicial - 1
+
+    def maior_id_anterior(self, connection, table):
+        """Maior id existente antes desta execução (consulta o banco só se a tabela não foi carregada)."""
+        if table.name not in self.id_max_anterior:
+            self.iniciar_tabela(table, next_id(connection, table))
+        return self.id_max_anterior[table.name]
+
+    def registrar(self, entidade, shard):
+        """Guarda as chaves e atributos de um shard gerado antes de ele seguir para a carga."""
+        colunar = isinstance(shard, dict)
+
+        if entidade == "clientes":
+            for cliente in shard:
+                self.clientes.adicionar(
+                    cliente["id"],
+                    cliente["estado"],
+                    cliente["endereco"],
+                    cliente["bairro"],
+                    cliente["cidade"],
+                )
+        elif entidade in ("produtos", "pedidos"):
+            ids = shard["id"].tolist() if colunar else (linha["id"] for linha in shard)
+            getattr(self, entidade).extend(ids)
+        elif entidade == "itens_pedidos":
+            ids = (
+                shard["id_pedido"].tolist()
+                if colunar
+                else (linha["id_pedido"] for linha in shard)
+            )
+            self.pedidos_com_itens.extend(ids)
+
+        # Pedidos com itens não são registrados: já saem com os totais e nenhuma etapa seguinte
+        # usa seus ids, o que mantém a memória constante em execuções com muitos pedidos
+        return shard
+
+    def numerar(self, tabelas, shard):
+        """Pré-atribui ids sequenciais às linhas das `tabelas` do shard, como os dos pedidos.
+
+        Nos sinks com banco de dados o id dessas linhas vem da sequência; sem banco (arquivos ou
+        stdout) os ids de cada execução começam em 1, como os das entidades com ids pré-atribuídos.
+        """
+        for table in tabelas:
+            dados = shard[table.name]
+            colunar = isinstance(dados, dict)
+            quantidade = len(dados["id_pedido"]) if colunar else len(dados)
+            inicio = self.proximo_id.get(table.name, 1)
+            self.proximo_id[table.name] = inicio + quantidade
+
+            if colunar:
+                shard[table.name] = {
+                    "id": np.arange(inicio, inicio + quantidade),
+                    **dados,
+                }
+            else:
+                shard[table.name] = [
+                    {"id": id_linha, **linha}
+                    for id_linha, linha in enumerate(dados, inicio)
+                ]
+        return shard
+
+    def registrar_gravados(self, connection, entidade, table, id_inicial, id_final):
+        """Registra, lendo do banco pela chave, as linhas de um shard gravado antes de uma retomada."""
+        if entidade not in ENTIDADES:
+            return
+
+        for inicio in range(id_inicial, id_final + 1, IDS_POR_CONSULTA):
+            fim = min(inicio + IDS_POR_CONSULTA - 1, id_final)
+            linhas = connection.execute(
+                sa.select(table)
+                .where(table.c.id.between(inicio, fim))
+                .order_by(table.c.id),
+            )
+            self.registrar(entidade, linhas.mappings().all())
+
+    def amostrar_anteriores(self, connection, table, colunas, quantidade):
+        """Busca pela chave primária uma amostra de até `quantidade` linhas de execuções anteriores.
+
+        A amostra tem no máximo AMOSTRA_ANTERIORES linhas, de faixas de ids sorteadas em uma única
+        consulta, qualquer que seja o tamanho da tabela.
+        """
+        id_max = self.maior_id_anterior(connection, table)
+        quantidade = min(quantidade, AMOSTRA_ANTERIORES, id_max)
+        if quantidade <= 0:
+            return []
+
+        # Faixas determinísticas; ids inexistentes (lacunas da sequência) não entram na amostra
+        rng = random.Random(f"{self.seed}-amostra-{table.name}")
+        faixas = rng.sample(
+            range(-(-id_max // IDS_POR_FAIXA)),
+            -(-quantidade // IDS_POR_FAIXA),
+        )
+
+        linhas = connection.execute(
+            sa.select(*colunas)
+            .where(
+                sa.or_(
+                    *(
+                        table.c.id.between(
+                            faixa * IDS_POR_FAIXA + 1,
+                            (faixa + 1) * IDS_POR_FAIXA,
+                        )
+                        for faixa in sorted(faixas)
+                    ),
+                ),
+            )
+            .order_by(table.c.id),
+        ).all()
+        return linhas[:quantidade]
+
+    def indice_clientes(self, connection, table, quantidade_anteriores):
+        """Índice com os clientes novos e uma amostra dos clientes de execuções anteriores."""
+        anteriores = self.amostrar_anteriores(
+            connection,
+            table,
+            [
+                table.c.id,
+                table.c.estado,
+                table.c.endereco,
+                table.c.bairro,
+                table.c.cidade,
+            ],
+            quantidade_anteriores,
+        )
+
+        indice = IndiceClientes(anteriores)
+        indice.estender(self.clientes)
+        return indice
+
+    def ids_disponiveis(self, connection, table, quantidade_anteriores):
+        """Ids novos da tabela somados a uma amostra de ids de execuções anteriores."""
+        anteriores = self.amostrar_anteriores(
+            connection,
+            table,
+            [table.c.id],
+            quantidade_anteriores,
+        )
+
+        ids = array("q", (linha.id for linha in anteriores))
+        ids.extend(getattr(self, table.name))
+        return ids
@@ -0,0 +1,502 @@
+# Script com os destinos (sinks) do pipeline de geração: banco de dados (PostgreSQL), arquivos Parquet
+# ou a saída padrão. Todos recebem os lotes já fatiados como listas de pares (tabela, linhas ou lote colunar).
+
+# Bibliotecas utilizadas
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+from src.loader import column_values, columns_to_rows, default_batch_size
+import supabase.conect_supabase_db as conexao_db
+import asyncio
+import json
+import os
+import sys
+import threading
+import uuid
+import sqlalchemy as sa
+
+# Sinks disponíveis na linha de comando
+SINKS = ("postgres", "asyncpg", "parquet", "stdout")
+
+# Sink asyncpg: conexões gravando em paralelo e lotes gerados à frente da gravação (fila limitada)
+ASYNC_CONNECTIONS = int(os.getenv("ASYNC_CONNECTIONS", "4"))
+ASYNC_QUEUE_SIZE = int(os.getenv("ASYNC_QUEUE_SIZE", "8"))
+
+# Linhas por lote dos sinks de arquivo e da saída padrão
+BATCH_SIZE_ARQUIVO = 100_000
+
+# Arquivos Parquet: compressão, linhas por row group e partição pela data do pedido
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "250000"))
+PARQUET_PARTITION = os.getenv("PARQUET_PARTITION", "month")
+PARQUET_PARTITIONS = ("day", "month", "none")
+
+# Coluna usada na partição e sufixo do diretório de cada granularidade
+COLUNA_PARTICAO = "data_pedido"
+PARTICAO_SUFIXO = {"day": "dia", "month": "mes"}
+
+# Limite de linhas pendentes em memória, em row groups, somando todas as partições abertas: ao passar
+# de um row group a maior partição é gravada, o que mantém a memória do sink constante com o volume
+PARQUET_MAX_ROW_GROUPS_PENDENTES = 1
+
+
+class SinkPostgres:
+    """Grava os lotes no banco de dados pelo BatchLoader (modo de carga e política de commit do .env)."""
+
+    # O gerador pode ler o banco (próximo id, amostras e tabelas já populadas)
+    banco = True
+
+    # Recebe um lote por vez (a política de commit decide o que vai em cada transação)
+    por_shard = False
+
+    def __init__(self, carregador):
+        self.carregador = carregador
+        self.batch_size = carregador.batch_size
+
+    @property
+    def concorrente(self):
+        """Cargas em paralelo usam conexões separadas; na política "run" há uma só conexão."""
+        return self.carregador.commit_policy != "run"
+
+    def execucao(self):
+        """Delimita a execução (uma única transação na política de commit "run")."""
+        return self.carregador.run()
+
+    def gravar(self, lotes):
+        """Grava os lotes e retorna a quantidade de linhas gravadas."""
+        return self.carregador.load_tables(lotes)
+
+
+class SinkStdout:
+    """Escreve cada linha como JSON (com o nome da tabela) na saída padrão."""
+
+    banco = False
+    por_shard = False
+
+    # Uma carga por vez (o sink não é seguro para várias threads)
+    concorrente = False
+
+    def __init__(self, stream=None, batch_size=None):
+        # Guarda a saída padrão original: as mensagens de progresso podem ser desviadas para o stderr
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size or default_batch_size()
+
+    @contextmanager
+    def execucao(self):
+        """Delimita a execução, descarregando a saída ao final."""
+        try:
+            yield self
+        finally:
+            self.stream.flush()
+
+    def gravar(self, lotes):
+        """Escreve os lotes e retorna a quantidade de linhas escritas."""
+        total = 0
+        for lote in lotes:
+            for table, dados in lote:
+                linhas = columns_to_rows(dados) if isinstance(dados, dict) else dados
+                for linha in linhas:
+                    self.stream.write(
+                        json.dumps({"tabela": table.name, **linha}, default=str) + "\n",
+                    )
+                total += len(linhas)
+        return total
+
+
+class SinkAsyncpg:
+    """Grava no banco com asyncpg: a geração continua enquanto N conexões gravam os shards anteriores.
+
+    Os shards gerados entram em uma fila limitada (a geração espera quando a fila enche) e são
+    gravados em paralelo, cada shard (ex.: pedidos e seus itens) em uma transação da sua conexão.
+    Cada chamada de `gravar` termina só depois de gravar todos os seus shards, então as tabelas
+    referenciadas por chaves estrangeiras já estão gravadas quando a tabela seguinte começa.
+    """
+
+    banco = True
+
+    # Recebe todos os lotes de um shard juntos: shards diferentes não dependem uns dos outros
+    por_shard = True
+
+    # As cargas passam uma por vez; o paralelismo fica nas conexões que gravam os shards
+    concorrente = False
+
+    def __init__(self, carregador, conexoes=None, tamanho_fila=None):
+        try:
+            import asyncpg  # noqa: F401
+        except ImportError as erro:
+            raise ImportError(
+                "O sink asyncpg precisa do asyncpg, do extra async: uv sync --extra async",
+            ) from erro
+
+        # O BatchLoader continua atendendo as leituras do gerador (próximo id, amostras, sequências)
+        self.carregador = carregador
+        self.mode = carregador.mode
+        self.batch_size = carregador.batch_size
+        self.conexoes = conexoes or ASYNC_CONNECTIONS
+        self.tamanho_fila = tamanho_fila or ASYNC_QUEUE_SIZE
+
+        # Loop de eventos em uma thread própria, com o pool de conexões, durante a execução
+        self._loop = None
+        self._pool = None
+        self._erro = None
+
+    def _rodar(self, corrotina):
+        """Executa a corrotina no loop do sink e espera o resultado."""
+        return asyncio.run_coroutine_threadsafe(corrotina, self._loop).result()
+
+    async def _criar_pool(self):
+        """Cria o pool de conexões asyncpg com as mesmas variáveis DB_* da engine."""
+        import asyncpg
+
+        return await asyncpg.create_pool(
+            host=conexao_db.DB_HOST,
+            port=int(conexao_db.DB_PORT) if conexao_db.DB_PORT else None,
+            user=conexao_db.DB_USER,
+            password=conexao_db.DB_PASSWORD,
+            database=conexao_db.DB_NAME,
+            ssl=conexao_db.DB_SSLMODE,
+            min_size=self.conexoes,
+            max_size=self.conexoes,
+            # Atrás do PgBouncer em modo transação não há prepared statements reaproveitáveis
+            statement_cache_size=0 if conexao_db.DB_PROFILE == "pgbouncer" else 100,
+        )
+
+    @contextmanager
+    def execucao(self):
+        """Abre o loop de eventos e o pool de conexões durante a execução."""
+        self._loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        thread.start()
+
+        try:
+            self._pool = self._rodar(self._criar_pool())
+            yield self
+        finally:
+            if self._pool is not None:
+                self._rodar(self._pool.close())
+                self._pool = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            thread.join()
+            self._loop.close()
+            self._loop = None
+
+    async def _escrever(self, conexao, table, dados):
+        """Grava um lote (linhas ou lote colunar) pela conexão, via COPY ou INSERT."""
+        if isinstance(dados, dict):
+            colunas = list(dados)
+            registros = list(zip(*(column_values(dados[coluna]) for coluna in colunas)))
+        else:
+            colunas = list(dados[0])
+            registros = [tuple(linha[coluna] for coluna in colunas) for linha in dados]
+
+        if self.mode == "copy":
+            await conexao.copy_records_to_table(
+                table.name,
+                records=registros,
+                columns=colunas,
+                schema_name=table.schema,
+            )
+        else:
+            preparer = postgresql.dialect().identifier_preparer
+            await conexao.executemany(
+                "INSERT INTO {} ({}) VALUES ({})".format(
+                    preparer.format_table(table),
+                    ", ".join(preparer.quote(coluna) for coluna in colunas),
+                    ", ".join(f"${posicao}" for posicao in range(1, len(colunas) + 1)),
+                ),
+                registros,
+            )
+        return len(registros)
+
+    async def _escritor(self, fila):
+        """Consome shards da fila até o sinal de fim, gravando cada um em uma transação."""
+        total = 0
+        while True:
+            shard = await fila.get()
+            if shard is None:
+                return total
+
+            # Depois de um erro só esvazia a fila, para a geração não ficar bloqueada
+            if self._erro is not None:
+                continue
+
+            try:
+                async with self._pool.acquire() as conexao:
+                    async with conexao.transaction():
+                        for table, dados in shard:
+                            total += await self._escrever(conexao, table, dados)
+            except Exception as erro:
+                self._erro = erro
+
+    async def _iniciar_escritores(self):
+        """Cria a fila limitada e um escritor por conexão."""
+        fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        escritores = [
+            asyncio.create_task(self._escritor(fila)) for _ in range(self.conexoes)
+        ]
+        return fila, escritores
+
+    async def _aguardar(self, escritores):
+        """Espera os escritores terminarem e soma as linhas gravadas."""
+        return sum(await asyncio.gather(*escritores))
+
+    def gravar(self, lotes):
+        """Grava os lotes em paralelo enquanto os próximos são gerados; retorna as linhas gravadas."""
+        self._erro = None
+        fila, escritores = self._rodar(self._iniciar_escritores())
+
+        try:
+            for lote in lotes:
+                if self._erro is not None:
+                    break
+                # Bloqueia a geração enquanto a fila estiver cheia
+                self._rodar(fila.put(lote))
+        finally:
+            for _ in escritores:
+                self._rodar(fila.put(None))
+            total = self._rodar(self._aguardar(escritores))
+
+        if self._erro is not None:
+            raise self._erro
+        return total
+
+
+def tipo_arrow(coluna):
+    """Tipo Arrow equivalente ao tipo SQLAlchemy da coluna."""
+    import pyarrow as pa
+
+    tipo = coluna.type
+    if isinstance(tipo, sa.Integer):
+        return pa.int64()
+    if isinstance(tipo, sa.Float):
+        return pa.float64()
+    if isinstance(tipo, sa.Numeric):
+        return pa.decimal128(tipo.precision, tipo.scale)
+    if isinstance(tipo, sa.Date):
+        return pa.date32()
+    if isinstance(tipo, sa.Boolean):
+        return pa.bool_()
+    return pa.string()
+
+
+def esquema_arrow(table, colunas):
+    """Esquema Arrow das colunas informadas, com os tipos e a nulidade do modelo."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field(nome, tipo_arrow(table.c[nome]), nullable=table.c[nome].nullable)
+            for nome in colunas
+        ],
+    )
+
+
+def esquema_entrada(esquema):
+    """Esquema em que o gerador entrega os dados: as colunas decimais (MONEY_TYPE=numeric) chegam
+    como float com 2 casas e o cast para o esquema do modelo as converte sem arredondamento."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            campo.with_type(pa.float64()) if pa.types.is_decimal(campo.type) else campo
+            for campo in esquema
+        ],
+    )
+
+
+def para_arrow(table, dados):
+    """Converte linhas ou um lote colunar em uma tabela Arrow com o esquema do modelo."""
+    import pyarrow as pa
+
+    if isinstance(dados, dict):
+        esquema = esquema_arrow(table, list(dados))
+        entrada = esquema_entrada(esquema)
+        tabela_arrow = pa.table(
+            [
+                # Colunas NumPy vão direto para o Arrow (NaT das datas vira nulo)
+                pa.array(
+                    coluna if hasattr(coluna, "dtype") else column_values(coluna),
+                    type=campo.type,
+                    from_pandas=True,
+                )
+                for campo, coluna in zip(entrada, dados.values())
+            ],
+            schema=entrada,
+        )
+    else:
+        esquema = esquema_arrow(table, list(dados[0]))
+        entrada = esquema_entrada(esquema)
+        tabela_arrow = pa.Table.from_pylist(dados, schema=entrada)
+
+    return tabela_arrow if entrada == esquema else tabela_arrow.cast(esquema)
+
+
+def particoes(tabela_arrow, coluna, granularidade):
+    """Divide uma tabela Arrow pelas datas da coluna, agrupadas por dia ou por mês."""
+    import numpy as np
+
+    # Datas do Arrow (date32) viram dias desde 1970 e depois datas NumPy do dia ou do mês
+    dias = tabela_arrow.column(coluna).to_numpy().astype("datetime64[D]")
+    chaves = dias.astype("datetime64[M]") if granularidade == "month" else dias
+
+    ordem = np.argsort(chaves, kind="stable")
+    valores, inicios, contagens = np.unique(
+        chaves[ordem],
+        return_index=True,
+        return_counts=True,
+    )
+
+    # Cada partição é copiada à parte: uma fatia da tabela ordenada manteria o lote inteiro em
+    # memória enquanto a partição estiver pendente
+    for valor, inicio, quantidade in zip(valores, inicios, contagens):
+        yield str(valor), tabela_arrow.take(ordem[inicio : inicio + quantidade])
+
+
+class SinkParquet:
+    """Grava cada tabela como um conjunto de arquivos Parquet comprimidos no diretório de saída.
+
+    Tabelas com `data_pedido` são particionadas por dia ou mês do pedido (diretórios no estilo Hive,
+    ex.: pedidos/data_pedido_mes=2026-01/). As linhas de cada arquivo ficam em memória até completar
+    um row group, com um limite total de linhas em memória para todas as partições.
+    """
+
+    banco = False
+    por_shard = False
+
+    # Uma carga por vez (o sink não é seguro para várias threads)
+    concorrente = False
+
+    def __init__(
+        self,
+        diretorio,
+        batch_size=None,
+        compressao=None,
+        row_group_size=None,
+        particao=None,
+    ):
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as erro:
+            raise ImportError("O sink parquet precisa do pyarrow instalado") from erro
+
+        self.diretorio = diretorio
+        self.batch_size = batch_size or BATCH_SIZE_ARQUIVO
+        self.compressao = compressao or PARQUET_COMPRESSION
+        self.row_group_size = row_group_size or PARQUET_ROW_GROUP_SIZE
+        self.particao = particao or PARQUET_PARTITION
+
+        if self.particao not in PARQUET_PARTITIONS:
+            raise ValueError(f"Partição inválida: {self.particao}")
+
+        # Nome dos arquivos desta execução: o instante ordena as execuções e o sufixo aleatório evita
+        # que execuções no mesmo segundo sobrescrevam os arquivos umas das outras
+        self.arquivo = (
+            f"part-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:12]}.parquet"
+        )
+
+        # Writer aberto e linhas pendentes de cada arquivo (tabela, partição)
+        self._writers = {}
+        self._pendentes = {}
+        self._linhas_pendentes = 0
+
+    @contextmanager
+    def execucao(self):
+        """Delimita a execução; ao final grava as linhas pendentes e fecha os arquivos."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        try:
+            yield self
+            for chave in list(self._pendentes):
+                self._descarregar(chave)
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
+            self._pendentes = {}
+            self._linhas_pendentes = 0
+
+    def _caminho(self, chave):
+        """Caminho do arquivo da tabela (e da partição, se houver) nesta execução."""
+        nome_tabela, particao = chave
+        partes = [self.diretorio, nome_tabela]
+        if particao is not None:
+            partes.append(
+                f"{COLUNA_PARTICAO}_{PARTICAO_SUFIXO[self.particao]}={particao}",
+            )
+        os.makedirs(os.path.join(*partes), exist_ok=True)
+        return os.path.join(*partes, self.arquivo)
+
+    def _descarregar(self, chave, so_completos=False):
+        """Grava as linhas pendentes de um arquivo em row groups de até `row_group_size` linhas.
+
+        Com `so_completos`, grava só os row groups cheios e mantém o restante pendente.
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        partes = self._pendentes.pop(chave, None)
+        if not partes:
+            return
+
+        tabela_arrow = pa.concat_tables(partes)
+        if so_completos:
+            completas = (
+                tabela_arrow.num_rows - tabela_arrow.num_rows % self.row_group_size
+            )
+            if completas < tabela_arrow.num_rows:
+                # O restante é copiado para não manter em memória as linhas já gravadas
+                restante = np.arange(completas, tabela_arrow.num_rows)
+                self._pendentes[chave] = [tabela_arrow.take(restante)]
+            tabela_arrow = tabela_arrow.slice(0, completas)
+
+        if chave not in self._writers:
+            self._writers[chave] = pq.ParquetWriter(
+                self._caminho(chave),
+                tabela_arrow.schema,
+                compression=self.compressao,
+            )
+        self._writers[chave].write_table(
+            tabela_arrow,
+            row_group_size=self.row_group_size,
+        )
+        self._linhas_pendentes -= tabela_arrow.num_rows
+
+    def _acumular(self, chave, tabela_arrow):
+        """Guarda as linhas do arquivo até completar um row group."""
+        partes = self._pendentes.setdefault(chave, [])
+        partes.append(tabela_arrow)
+        self._linhas_pendentes += tabela_arrow.num_rows
+
+        if sum(parte.num_rows for parte in partes) >= self.row_group_size:
+            self._descarregar(chave, so_completos=True)
+
+        # Com muitas partições abertas, grava a maior delas para limitar a memória
+        while (
+            self._linhas_pendentes
+            > self.row_group_size * PARQUET_MAX_ROW_GROUPS_PENDENTES
+        ):
+            maior = max(
+                self._pendentes,
+                key=lambda item: sum(parte.num_rows for parte in self._pendentes[item]),
+            )
+            self._descarregar(maior)
+
+    def gravar(self, lotes):
+        """Grava os lotes e retorna a quantidade de linhas gravadas."""
+        total = 0
+        for lote in lotes:
+            for table, dados in lote:
+                tabela_arrow = para_arrow(table, dados)
+                total += tabela_arrow.num_rows
+
+                if self.particao == "none" or COLUNA_PARTICAO not in table.c:
+                    self._acumular((table.name, None), tabela_arrow)
+                    continue
+
+                for particao, parte in particoes(
+                    tabela_arrow,
+                    COLUNA_PARTICAO,
+                    self.particao,
+                ):
+                    self._acumular((table.name, particao), parte)
+        return total
@@ -1,7 +1,8 @@
 # Script para se conectar ao banco de dados PostgreSQl(Supabase)
 
 # Bibliotecas utilizadas
-from sqlalchemy import create_engine
+from sqlalchemy import URL, create_engine
+from sqlalchemy.pool import NullPool
 from sqlalchemy.orm import declarative_base
 from dotenv import load_dotenv
 import os
@@ -15,17 +16,167 @@ DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+
+# Linhas enviadas por ida ao banco nos comandos executemany
+DB_PAGE_SIZE = int(os.getenv("DB_PAGE_SIZE", "1000"))
+
+# Driver do PostgreSQL: "psycopg2" ou "psycopg" (psycopg 3, com prepared statements no servidor)
+DB_DRIVER = os.getenv("DB_DRIVER", "psycopg2")
+DB_DRIVERS = ("psycopg2", "psycopg")
+
+# Modo dos executemany no psycopg2: "values_plus_batch" ou "values_only" (SQLAlchemy 2.0)
+DB_EXECUTEMANY_MODE = os.getenv("DB_EXECUTEMANY_MODE", "values_plus_batch")
+DB_EXECUTEMANY_MODES = ("values_plus_batch", "values_only")
+
+# Perfil de desempenho da engine: "default", "bulk" (cargas longas) ou "pgbouncer" (modo transação)
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+
+# Configurações de cada perfil; cada uma pode ser sobrescrita pela variável de ambiente correspondente
+PERFIS_ENGINE = {
+    # Pool do SQLAlchemy com um ping a cada checkout
+    "default": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+        "statement_timeout": None,
+        "keepalives_idle": None,
+        "prepare_threshold": 5,
+    },
+    # Cargas longas: sem ping a cada checkout (os keepalives TCP derrubam conexões mortas),
+    # conexões reaproveitadas por mais tempo e comandos repetidos preparados no servidor
+    "bulk": {
+        "pool_size": 8,
+        "max_overflow": 0,
+        "pool_pre_ping": False,
+        "pool_recycle": 1800,
+        "statement_timeout": None,
+        "keepalives_idle": 30,
+        "prepare_threshold": 2,
+    },
+    # PgBouncer em modo transação: o pool fica no PgBouncer (NullPool no SQLAlchemy) e os
+    # prepared statements são desativados, pois cada transação pode ir para outra conexão
+    "pgbouncer": {
+        "pool_size": None,
+        "max_overflow": None,
+        "pool_pre_ping": False,
+        "pool_recycle": None,
+        "statement_timeout": None,
+        "keepalives_idle": 30,
+        "prepare_threshold": None,
+    },
+}
+VARIAVEIS_PERFIL = {
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_pre_ping": "DB_POOL_PRE_PING",
+    "pool_recycle": "DB_POOL_RECYCLE",
+    "statement_timeout": "DB_STATEMENT_TIMEOUT",
+    "keepalives_idle": "DB_KEEPALIVES_IDLE",
+    "prepare_threshold": "DB_PREPARE_THRESHOLD",
+}
 
 # URL de conexão com o banco de dados
-DB_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
+# (montada com URL.create: senhas com caracteres especiais e sem .env, ex.: sink parquet, funcionam)
+DB_URL = URL.create(
+    "postgresql",
+    username=DB_USER,
+    password=DB_PASSWORD,
+    host=DB_HOST,
+    port=int(DB_PORT) if DB_PORT else None,
+    database=DB_NAME,
+    query={"sslmode": DB_SSLMODE},
+)
 
 # Criar engine e sessão com o banco de dados
 Base = declarative_base()
 
 
-def get_engine():
-    """Cria e retorna uma engine de conexão com o banco de dados."""
-    return create_engine(DB_URL, pool_pre_ping=True, pool_recycle=300)
+def configuracao_perfil(perfil=None):
+    """Configurações do perfil da engine, com as sobrescritas das variáveis de ambiente."""
+    perfil = perfil or DB_PROFILE
+    if perfil not in PERFIS_ENGINE:
+        raise ValueError(f"Perfil de engine inválido: {perfil}")
+
+    configuracao = dict(PERFIS_ENGINE[perfil])
+    for chave, variavel in VARIAVEIS_PERFIL.items():
+        valor = os.getenv(variavel)
+        if valor is None:
+            continue
+        if chave == "pool_pre_ping":
+            configuracao[chave] = valor.lower() in ("1", "true", "yes")
+        else:
+            # Vazio ou "none" desativa a configuração (ex.: DB_PREPARE_THRESHOLD=none)
+            configuracao[chave] = None if valor.lower() in ("", "none") else int(valor)
+
+    return configuracao
+
+
+def get_engine(perfil=None, driver=None):
+    """Cria e retorna uma engine de conexão com o banco de dados, no perfil e driver configurados."""
+    perfil = perfil or DB_PROFILE
+    driver = driver or DB_DRIVER
+    if driver not in DB_DRIVERS:
+        raise ValueError(f"Driver do PostgreSQL inválido: {driver}")
+    if driver == "psycopg":
+        try:
+            import psycopg  # noqa: F401
+        except ImportError as erro:
+            raise ImportError(
+                "DB_DRIVER=psycopg precisa do psycopg 3, do extra psycopg3: uv sync --extra psycopg3",
+            ) from erro
+    if driver == "psycopg2" and DB_EXECUTEMANY_MODE not in DB_EXECUTEMANY_MODES:
+        raise ValueError(
+            f"DB_EXECUTEMANY_MODE inválido: {DB_EXECUTEMANY_MODE} "
+            f"(use {' ou '.join(DB_EXECUTEMANY_MODES)})",
+        )
+    configuracao = configuracao_perfil(perfil)
+
+    # Parâmetros da libpq, aceitos pelos dois drivers: tempo limite dos comandos e keepalives TCP
+    connect_args = {}
+    if configuracao["statement_timeout"] is not None:
+        connect_args["options"] = (
+            f"-c statement_timeout={configuracao['statement_timeout']}"
+        )
+    if configuracao["keepalives_idle"] is not None:
+        connect_args.update(
+            keepalives=1,
+            keepalives_idle=configuracao["keepalives_idle"],
+            keepalives_interval=10,
+            keepalives_count=3,
+        )
+
+    opcoes = {
+        "pool_pre_ping": configuracao["pool_pre_ping"],
+        # INSERTs em lote viram um único INSERT ... VALUES com várias linhas por ida ao banco
+        "insertmanyvalues_page_size": DB_PAGE_SIZE,
+    }
+    if perfil == "pgbouncer":
+        opcoes["poolclass"] = NullPool
+    else:
+        opcoes.update(
+            pool_size=configuracao["pool_size"],
+            max_overflow=configuracao["max_overflow"],
+            pool_recycle=configuracao["pool_recycle"] or -1,
+        )
+
+    if driver == "psycopg":
+        # Comandos executados `prepare_threshold` vezes passam a ser preparados no servidor
+        # (None desativa, como exige o PgBouncer em modo transação)
+        connect_args["prepare_threshold"] = configuracao["prepare_threshold"]
+    else:
+        # Os UPDATEs em lote usam o execute_batch do psycopg2
+        opcoes.update(
+            executemany_mode=DB_EXECUTEMANY_MODE,
+            executemany_batch_page_size=DB_PAGE_SIZE,
+        )
+
+    return create_engine(
+        DB_URL.set(drivername=f"postgresql+{driver}"),
+        connect_args=connect_args,
+        **opcoes,
+    )
 
 
 if __name__ == "__main__":
@@ -1,9 +1,42 @@
 # Script com o modelo das tabelas
 
 # Bibliotecas utilizadas
-from sqlalchemy import Column, Date, Float, Integer, String, ForeignKey
+from datetime import date
+from typing import Any
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    Float,
+    Integer,
+    Numeric,
+    String,
+    ForeignKey,
+    ForeignKeyConstraint,
+    text,
+)
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeEngine
 from .conect_supabase_db import Base
+import os
+
+# Particionamento de pedidos por faixa mensal da data_pedido: "none" (padrão) ou "month"
+DB_PARTITION = os.getenv("DB_PARTITION", "none")
+if DB_PARTITION not in ("none", "month"):
+    raise ValueError(f"Particionamento inválido: {DB_PARTITION}")
+PARTICIONADO = DB_PARTITION == "month"
+
+# Tipo das colunas de dinheiro: "float" (padrão), "numeric" (Numeric(12, 2), exato) ou "cents"
+# (centavos inteiros); o gerador calcula em centavos e converte na saída (src/dinheiro.py)
+MONEY_TYPE = os.getenv("MONEY_TYPE", "float")
+TIPOS_DINHEIRO: dict[str, type[TypeEngine[Any]] | TypeEngine[Any]] = {
+    "float": Float,
+    "numeric": Numeric(12, 2),
+    "cents": BigInteger,
+}
+if MONEY_TYPE not in TIPOS_DINHEIRO:
+    raise ValueError(f"Tipo de dinheiro inválido: {MONEY_TYPE}")
+Dinheiro = TIPOS_DINHEIRO[MONEY_TYPE]
 
 # Definição das classes que representam as tabelas do banco de dados
 
@@ -43,8 +76,8 @@ class produtos(Base):
     sku = Column(String(50), nullable=False, unique=True)
     nome = Column(String(255), nullable=False)
     descricao = Column(String(255))
-    preco = Column(Float, nullable=False)
-    preco_custo = Column(Float, nullable=False)
+    preco = Column(Dinheiro, nullable=False)
+    preco_custo = Column(Dinheiro, nullable=False)
     margem = Column(Float, nullable=False)
     tamanho = Column(String(20))
     estoque = Column(Integer, nullable=False)
@@ -65,23 +98,29 @@ class produtos(Base):
 class pedidos(Base):
     __tablename__ = "pedidos"
 
+    # Particionada, a tabela é dividida por mês da data_pedido, que passa a fazer parte da chave
+    # primária (exigência do PostgreSQL); as partições são criadas por `criar_particoes_pedidos`
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (data_pedido)"} if PARTICIONADO else {}
+    )
+
     # Campos da tabela
-    id = Column(Integer, primary_key=True)
-    id_cliente = Column(Integer, ForeignKey("clientes.id"), nullable=False)
-    id_produto = Column(Integer, ForeignKey("produtos.id"), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    id_cliente = Column(Integer, ForeignKey("clientes.id"), nullable=False, index=True)
+    id_produto = Column(Integer, ForeignKey("produtos.id"), nullable=False, index=True)
     quantidade = Column(Integer, nullable=False)
-    subtotal = Column(Float, nullable=False)
-    data_pedido = Column(Date, nullable=False)
+    subtotal = Column(Dinheiro, nullable=False)
+    data_pedido = Column(Date, nullable=False, primary_key=PARTICIONADO, index=True)
     id_canalvenda = Column(Integer, ForeignKey("canalvenda.id"), nullable=False)
-    frete = Column(Float, nullable=False)
-    valor_desconto = Column(Float, nullable=False)
-    total = Column(Float, nullable=False)
+    frete = Column(Dinheiro, nullable=False)
+    valor_desconto = Column(Dinheiro, nullable=False)
+    total = Column(Dinheiro, nullable=False)
     id_forma_pagamento = Column(
         Integer,
         ForeignKey("formapagamento.id"),
         nullable=False,
     )
-    id_status = Column(Integer, ForeignKey("status.id"), nullable=False)
+    id_status = Column(Integer, ForeignKey("status.id"), nullable=False, index=True)
     endereco_entrega = Column(String(500), nullable=False)
     data_envio = Column(Date)
     data_entrega = Column(Date)
@@ -210,14 +249,56 @@ class entregue(Base):
 class itenspedido(Base):
     __tablename__ = "itenspedido"
 
+    # Com pedidos particionado o id sozinho não é único em pedidos: os itens guardam também a
+    # data_pedido e a chave estrangeira passa a ser (id_pedido, data_pedido), a chave primária de
+    # pedidos. Custa uma coluna de data por item e exige gerar os itens junto com os pedidos.
+    __table_args__ = (
+        (
+            ForeignKeyConstraint(
+                ["id_pedido", "data_pedido"],
+                ["pedidos.id", "pedidos.data_pedido"],
+            ),
+        )
+        if PARTICIONADO
+        else ()
+    )
+
     # Campos da tabela
     id = Column(Integer, primary_key=True)
-    id_pedido = Column(Integer, ForeignKey("pedidos.id"), nullable=False)
-    id_produto = Column(Integer, ForeignKey("produtos.id"), nullable=False)
+    id_pedido = Column(
+        Integer,
+        *(() if PARTICIONADO else (ForeignKey("pedidos.id"),)),
+        nullable=False,
+        index=True,
+    )
+    if PARTICIONADO:
+        data_pedido = Column(Date, nullable=False)
+    id_produto = Column(Integer, ForeignKey("produtos.id"), nullable=False, index=True)
     quantidade = Column(Integer, nullable=False)
-    preco_unitario = Column(Float, nullable=False)
-    subtotal = Column(Float, nullable=False)
+    preco_unitario = Column(Dinheiro, nullable=False)
+    subtotal = Column(Dinheiro, nullable=False)
 
     # Relacionamentos
     pedido = relationship("pedidos", back_populates="itens")
     produto = relationship("produtos", back_populates="itens")
+
+
+def proximo_mes(mes):
+    """Primeiro dia do mês seguinte a `mes`."""
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def criar_particoes_pedidos(connection, inicio, fim):
+    """Cria (se não existirem) as partições mensais de pedidos que cobrem as datas de `inicio` a `fim`."""
+    if not PARTICIONADO:
+        return
+
+    mes = date(inicio.year, inicio.month, 1)
+    while mes <= fim:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS pedidos_{mes:%Y_%m} PARTITION OF pedidos "
+                f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{proximo_mes(mes).isoformat()}')",
+            ),
+        )
+        mes = proximo_mes(mes)
@@ -0,0 +1,146 @@
+# Testes do agendador das cargas: as dependências vêm das chaves estrangeiras do modelo (ou de
+# `depois_de`, quando a chave não existe), um ciclo é recusado e o erro de uma carga chega ao chamador
+# sem travar a execução das demais.
+
+# Bibliotecas utilizadas
+import threading
+import time
+import pytest
+import sqlalchemy as sa
+import src.insert_data_supabase_db as carga
+from src import agendador
+
+metadata = sa.MetaData()
+pais = sa.Table("pais", metadata, sa.Column("id", sa.Integer, primary_key=True))
+filhos = sa.Table(
+    "filhos",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("id_pai", sa.Integer, sa.ForeignKey("pais.id")),
+)
+# Como itenspedido com pedidos particionado: referencia pais sem chave estrangeira
+avulsos = sa.Table(
+    "avulsos",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("id_pai", sa.Integer),
+)
+
+
+def test_dependencias_das_cargas_com_pedidos_com_itens():
+    grafo = agendador.dependencias(carga.cargas(itens_avulsos=False))
+
+    assert grafo == {
+        "auxiliares": set(),
+        "clientes": {"auxiliares"},
+        "produtos": {"auxiliares"},
+        "pedidos_com_itens": {"auxiliares", "clientes", "produtos"},
+    }
+    assert agendador.ordem_topologica(grafo) == [
+        "auxiliares",
+        "clientes",
+        "produtos",
+        "pedidos_com_itens",
+    ]
+
+
+def test_dependencias_das_cargas_com_itens_avulsos():
+    grafo = agendador.dependencias(carga.cargas(itens_avulsos=True))
+
+    assert grafo["pedidos"] == {"auxiliares", "clientes", "produtos"}
+    assert grafo["itens_pedidos"] == {"pedidos", "produtos"}
+    assert grafo["update_pedidos"] == {"pedidos", "itens_pedidos"}
+    assert agendador.ordem_topologica(grafo) == [
+        "auxiliares",
+        "clientes",
+        "produtos",
+        "pedidos",
+        "itens_pedidos",
+        "update_pedidos",
+    ]
+
+
+def test_tabela_sem_chave_estrangeira_espera_pelo_depois_de():
+    def grafo(**opcoes):
+        return agendador.dependencias(
+            [
+                agendador.Carga("pais", None, [pais]),
+                agendador.Carga("avulsos", None, [avulsos], **opcoes),
+                agendador.Carga("filhos", None, [filhos]),
+            ],
+        )
+
+    assert grafo()["avulsos"] == set()
+    assert grafo(depois_de=["pais"])["avulsos"] == {"pais"}
+    assert grafo()["filhos"] == {"pais"}
+
+
+def test_depois_de_com_carga_inexistente():
+    with pytest.raises(ValueError, match="cargas inexistentes"):
+        agendador.dependencias(
+            [agendador.Carga("filhos", None, [filhos], depois_de=["pais"])],
+        )
+
+
+def test_dependencia_circular():
+    with pytest.raises(ValueError, match="Dependência circular"):
+        agendador.ordem_topologica({"a": set(), "b": {"c"}, "c": {"b"}})
+
+
+def test_executar_respeita_as_dependencias():
+    executadas = []
+
+    def registrar(nome, espera=0.0):
+        def funcao():
+            time.sleep(espera)
+            executadas.append(nome)
+
+        return funcao
+
+    agendador.executar(
+        [
+            agendador.Carga("filhos", registrar("filhos"), [filhos]),
+            agendador.Carga(
+                "avulsos",
+                registrar("avulsos"),
+                [avulsos],
+                depois_de=["filhos"],
+            ),
+            agendador.Carga("pais", registrar("pais", espera=0.05), [pais]),
+        ],
+    )
+
+    assert executadas == ["pais", "filhos", "avulsos"]
+
+
+def test_erro_de_uma_carga_chega_ao_chamador():
+    executadas = []
+    resultado: dict[str, Exception] = {}
+
+    def falhar():
+        raise RuntimeError("carga de pais falhou")
+
+    def lenta():
+        time.sleep(0.05)
+        executadas.append("avulsos")
+
+    cargas = [
+        agendador.Carga("pais", falhar, [pais]),
+        agendador.Carga("filhos", lambda: executadas.append("filhos"), [filhos]),
+        agendador.Carga("avulsos", lenta, [avulsos]),
+    ]
+
+    def executar():
+        try:
+            agendador.executar(cargas)
+        except RuntimeError as erro:
+            resultado["erro"] = erro
+
+    thread = threading.Thread(target=executar, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert str(resultado["erro"]) == "carga de pais falhou"
+    # A carga dependente não roda; a independente já iniciada termina antes do retorno
+    assert executadas == ["avulsos"]
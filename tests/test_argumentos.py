@@ -0,0 +1,46 @@
+# Testes das combinações de parâmetros rejeitadas pelo parse_args antes de qualquer acesso ao banco.
+
+# Bibliotecas utilizadas
+import pytest
+import src.insert_data_supabase_db as carga
+from supabase.model_supabase_db import pedidos
+
+
+@pytest.fixture
+def particionado(monkeypatch):
+    """Pedidos particionado por mês, como com DB_PARTITION=month."""
+    monkeypatch.setitem(
+        pedidos.__table__.dialect_options["postgresql"],
+        "partition_by",
+        "RANGE (data_pedido)",
+    )
+
+
+def erro(argv, capsys):
+    """Mensagem do parser.error para os parâmetros informados."""
+    with pytest.raises(SystemExit):
+        carga.parse_args(argv)
+    return capsys.readouterr().err
+
+
+def test_unlogged_exige_tabelas_recriadas(capsys):
+    assert "--unlogged vale só para tabelas recriadas" in erro(["--unlogged"], capsys)
+    assert carga.parse_args(["--unlogged", "--reset", "recreate"]).unlogged
+
+
+def test_unlogged_com_pedidos_particionado(particionado, capsys):
+    for argv in (["--reset", "recreate"], ["--carga-inicial"]):
+        assert "DB_PARTITION=month" in erro(["--unlogged", *argv], capsys)
+    assert carga.parse_args(["--carga-inicial"]).carga_inicial
+
+
+def test_itens_avulsos_com_pedidos_particionado(particionado, capsys):
+    assert "DB_PARTITION=month" in erro(["--itens-avulsos"], capsys)
+
+
+def test_sinks_de_arquivo_nao_aceitam_opcoes_do_banco(capsys):
+    for opcao in ("--itens-avulsos", "--checkpoint", "--carga-inicial"):
+        assert "exige um sink do banco de dados" in erro(
+            [opcao, "--sink", "parquet"],
+            capsys,
+        )
@@ -0,0 +1,57 @@
+# Testes das chaves únicas derivadas do id: a permutação de Feistel é uma bijeção da faixa e os CPFs,
+# e-mails e SKUs de ids distintos nunca se repetem.
+
+# Bibliotecas utilizadas
+import pytest
+from src import chaves
+
+
+@pytest.mark.parametrize("faixa", [1, 2, 10, 1000, 4097])
+def test_permutacao_e_uma_bijecao_da_faixa(faixa):
+    permutacao = chaves.Permutacao("teste", faixa)
+    assert sorted(permutacao(numero) for numero in range(faixa)) == list(range(faixa))
+
+
+def test_permutacao_depende_so_do_nome():
+    assert [chaves.Permutacao("a")(numero) for numero in range(100)] == [
+        chaves.Permutacao("a")(numero) for numero in range(100)
+    ]
+    assert [chaves.Permutacao("a")(numero) for numero in range(100)] != [
+        chaves.Permutacao("b")(numero) for numero in range(100)
+    ]
+
+
+def test_permutacao_rejeita_numero_fora_da_faixa():
+    with pytest.raises(ValueError):
+        chaves.Permutacao("teste", 10)(10)
+
+
+def test_chaves_unicas_por_id():
+    ids = range(1, 20001)
+    assert len({chaves.cpf(id_linha) for id_linha in ids}) == len(ids)
+    assert len({chaves.sufixo_email(id_linha) for id_linha in ids}) == len(ids)
+    assert len({chaves.sku(id_linha) for id_linha in ids}) == len(ids)
+
+
+def test_cpf_com_digitos_verificadores_validos():
+    for id_linha in range(1, 500):
+        numero = [int(digito) for digito in chaves.cpf(id_linha) if digito.isdigit()]
+        for tamanho in (9, 10):
+            soma = sum(
+                digito * peso for digito, peso in zip(numero, range(tamanho + 1, 1, -1))
+            )
+            assert numero[tamanho] == soma * 10 % 11 % 10
+
+
+def test_sku_no_formato_isbn13():
+    for id_linha in range(1, 500):
+        sku = chaves.sku(id_linha)
+        assert len(sku) == 13 and sku.startswith(chaves.PREFIXO_SKU)
+        assert (
+            sum(
+                int(digito) * (3 if posicao % 2 else 1)
+                for posicao, digito in enumerate(sku)
+            )
+            % 10
+            == 0
+        )
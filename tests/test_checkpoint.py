@@ -0,0 +1,108 @@
+# Testes da retomada pelos checkpoints, com um SQLite em arquivo no lugar do PostgreSQL: os shards
+# gravados (inclusive fora de ordem) são lidos pela posição, a retomada é só da mesma data base e o
+# registro é montado na ordem dos shards.
+
+# Bibliotecas utilizadas
+from contextlib import nullcontext
+import pytest
+import sqlalchemy as sa
+import src.insert_data_supabase_db as carga
+from src import checkpoint
+from src.loader import BatchLoader
+
+PARAMETROS = {"seed": 7, "data_base": "2026-01-01", "num_clientes": 50}
+
+
+@pytest.fixture
+def carregador(tmp_path):
+    """BatchLoader sobre um SQLite em arquivo."""
+    return BatchLoader(
+        sa.create_engine(f"sqlite:///{tmp_path / 'teste.db'}"),
+        mode="insert",
+    )
+
+
+def gravar_marcados(carregador, marcados, posicoes):
+    """Grava só as linhas de checkpoint dos shards nas `posicoes` (simula uma interrupção)."""
+    with carregador.transaction() as connection:
+        for posicao, lote in enumerate(marcados):
+            if posicao in posicoes:
+                for table, linhas in lote:
+                    connection.execute(table.insert(), linhas)
+
+
+def iniciar_execucao(carregador, pendentes, posicoes_gravadas):
+    """Inicia uma execução e grava os checkpoints de parte dos seus shards."""
+    inicial = checkpoint.Checkpoint(carregador)
+    assert inicial.retomar("2026-01-01") is None
+    inicial.iniciar(PARAMETROS)
+
+    marcar = inicial.marcador("clientes", pendentes)
+    marcados = list(marcar(iter([[] for _ in pendentes])))
+    gravar_marcados(carregador, marcados, posicoes_gravadas)
+    return inicial
+
+
+def test_retomada_le_os_shards_gravados_pela_posicao(carregador):
+    pendentes = [(0, 1, 20), (1, 21, 20), (2, 41, 10)]
+    inicial = iniciar_execucao(carregador, pendentes, {0, 2})
+
+    retomada = checkpoint.Checkpoint(carregador)
+    assert retomada.retomar("2026-01-01") == PARAMETROS
+    assert retomada.execucao == inicial.execucao
+
+    with carregador.transaction() as connection:
+        gravados = retomada.gravados(connection, "clientes")
+    assert list(gravados) == [0, 2]
+    assert [
+        (shard.id_inicial, shard.id_final, shard.linhas) for shard in gravados.values()
+    ] == [
+        (1, 20, 20),
+        (41, 50, 10),
+    ]
+
+
+def test_execucao_de_outra_data_base_nao_e_retomada(carregador):
+    iniciar_execucao(carregador, [(0, 1, 20)], {0})
+    assert checkpoint.Checkpoint(carregador).retomar("2026-01-02") is None
+
+
+def test_execucao_concluida_nao_e_retomada(carregador):
+    iniciar_execucao(carregador, [(0, 1, 20)], {0}).concluir()
+    assert checkpoint.Checkpoint(carregador).retomar("2026-01-01") is None
+
+
+def test_registro_segue_a_ordem_dos_shards(monkeypatch):
+    ordem = []
+    monkeypatch.setattr(carga, "conexao_leitura", lambda: nullcontext())
+    monkeypatch.setattr(
+        carga.registro,
+        "registrar_gravados",
+        lambda connection, entidade, table, inicio, fim: ordem.append(
+            ("gravado", inicio),
+        ),
+    )
+
+    class Gravado:
+        def __init__(self, id_inicial):
+            self.id_inicial = id_inicial
+            self.id_final = id_inicial + 19
+
+    # Shards 0 e 2 gravados (fora de ordem, como no sink asyncpg); 1 e 3 gerados na retomada
+    gravados = {0: Gravado(1), 2: Gravado(41)}
+    pendentes = [(1, 21, 20), (3, 61, 20)]
+    for shard in carga.intercalar_gravados(
+        iter(["shard 1", "shard 3"]),
+        pendentes,
+        gravados,
+        "clientes",
+        None,
+    ):
+        ordem.append(("gerado", shard))
+
+    assert ordem == [
+        ("gravado", 1),
+        ("gerado", "shard 1"),
+        ("gravado", 41),
+        ("gerado", "shard 3"),
+    ]
@@ -0,0 +1,116 @@
+# Testes do pool de conexões do dashboard com conexões falsas no lugar do Databricks: uma conexão
+# perdida é descartada e a consulta repetida uma única vez, erros de query não são repetidos e quem
+# chega com o pool cheio espera.
+
+# Bibliotecas utilizadas
+import threading
+import pytest
+
+conexao_databricks = pytest.importorskip("databricks_scripts.conect_databricks")
+
+
+class ConexaoFalsa:
+    """Conexão falsa do Databricks, numerada na ordem em que foi aberta."""
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.fechada = False
+
+    def close(self):
+        self.fechada = True
+
+
+@pytest.fixture
+def abertas(monkeypatch):
+    """Conexões abertas pelo pool, na ordem de abertura."""
+    conexoes: list[ConexaoFalsa] = []
+
+    def conectar(http_path=None):
+        conexoes.append(ConexaoFalsa(len(conexoes) + 1))
+        return conexoes[-1]
+
+    monkeypatch.setattr(conexao_databricks, "connect_to_databricks", conectar)
+    return conexoes
+
+
+def test_conexao_reaproveitada_entre_consultas(abertas):
+    pool = conexao_databricks.PoolDatabricks(tamanho=2, timeout=1)
+
+    assert pool.executar(lambda connection: connection.numero) == 1
+    assert pool.executar(lambda connection: connection.numero) == 1
+    assert len(abertas) == 1
+
+
+def test_conexao_perdida_e_descartada_e_repetida_uma_vez(abertas):
+    pool = conexao_databricks.PoolDatabricks(tamanho=2, timeout=1)
+    usadas = []
+
+    def consulta(connection):
+        usadas.append(connection.numero)
+        if connection.numero == 1:
+            raise ConnectionError("conexão perdida")
+        return "ok"
+
+    assert pool.executar(consulta) == "ok"
+    assert usadas == [1, 2]
+    assert abertas[0].fechada and not abertas[1].fechada
+
+
+def test_segunda_queda_chega_ao_chamador(abertas):
+    pool = conexao_databricks.PoolDatabricks(tamanho=2, timeout=1)
+    tentativas = []
+
+    def consulta(connection):
+        tentativas.append(connection.numero)
+        raise ConnectionError("conexão perdida")
+
+    with pytest.raises(ConnectionError):
+        pool.executar(consulta)
+    assert tentativas == [1, 2]
+    assert all(connection.fechada for connection in abertas)
+
+
+def test_erro_de_query_nao_e_repetido(abertas):
+    pool = conexao_databricks.PoolDatabricks(tamanho=2, timeout=1)
+    tentativas = []
+
+    def consulta(connection):
+        tentativas.append(connection.numero)
+        raise ValueError("query inválida")
+
+    with pytest.raises(ValueError, match="query inválida"):
+        pool.executar(consulta)
+    assert tentativas == [1]
+    # A conexão volta ao pool e é reaproveitada
+    assert not abertas[0].fechada
+    assert pool.executar(lambda connection: connection.numero) == 1
+
+
+def test_pool_cheio_espera_ate_o_timeout(abertas):
+    pool = conexao_databricks.PoolDatabricks(tamanho=2, timeout=0.05)
+
+    with pool.conexao(), pool.conexao():
+        with pytest.raises(TimeoutError, match="pool de 2 conexões"):
+            with pool.conexao():
+                pass
+    assert len(abertas) == 2
+
+
+def test_pool_cheio_entrega_a_conexao_devolvida(abertas):
+    pool = conexao_databricks.PoolDatabricks(tamanho=1, timeout=5)
+    recebida = []
+
+    def esperar():
+        with pool.conexao() as connection:
+            recebida.append(connection.numero)
+
+    with pool.conexao():
+        thread = threading.Thread(target=esperar)
+        thread.start()
+        thread.join(timeout=0.1)
+        # Sem vaga no pool, a segunda retirada fica bloqueada
+        assert thread.is_alive() and not recebida
+
+    thread.join(timeout=5)
+    assert recebida == [1]
+    assert len(abertas) == 1
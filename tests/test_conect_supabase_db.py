@@ -0,0 +1,91 @@
+# Testes dos perfis da engine, sem conectar ao banco: cada perfil vira os argumentos esperados do
+# create_engine, as variáveis de ambiente sobrescrevem o perfil e as configurações inválidas falham.
+
+# Bibliotecas utilizadas
+import pytest
+from sqlalchemy.pool import NullPool
+import supabase.conect_supabase_db as conexao
+
+
+@pytest.fixture(autouse=True)
+def sem_sobrescritas(monkeypatch):
+    """Remove as variáveis de ambiente que sobrescrevem os perfis."""
+    for variavel in conexao.VARIAVEIS_PERFIL.values():
+        monkeypatch.delenv(variavel, raising=False)
+
+
+@pytest.fixture
+def argumentos(monkeypatch):
+    """Troca o create_engine por uma função que devolve a URL e os argumentos recebidos."""
+    monkeypatch.setattr(
+        conexao,
+        "create_engine",
+        lambda url, **opcoes: (url, opcoes),
+    )
+
+
+def test_perfil_bulk_sem_ping_e_com_keepalives(argumentos):
+    url, opcoes = conexao.get_engine("bulk", "psycopg2")
+
+    assert url.drivername == "postgresql+psycopg2"
+    assert opcoes["pool_size"] == 8
+    assert opcoes["max_overflow"] == 0
+    assert opcoes["pool_pre_ping"] is False
+    assert opcoes["pool_recycle"] == 1800
+    assert opcoes["connect_args"]["keepalives_idle"] == 30
+    assert opcoes["executemany_mode"] == conexao.DB_EXECUTEMANY_MODE
+
+
+def test_perfil_bulk_com_psycopg_prepara_os_comandos(argumentos):
+    _, opcoes = conexao.get_engine("bulk", "psycopg")
+
+    assert opcoes["connect_args"]["prepare_threshold"] == 2
+    assert "executemany_mode" not in opcoes
+
+
+def test_perfil_pgbouncer_usa_nullpool_sem_prepared_statements(argumentos):
+    _, opcoes = conexao.get_engine("pgbouncer", "psycopg")
+
+    assert opcoes["poolclass"] is NullPool
+    assert "pool_size" not in opcoes and "max_overflow" not in opcoes
+    assert opcoes["connect_args"]["prepare_threshold"] is None
+
+
+def test_variaveis_de_ambiente_sobrescrevem_o_perfil(monkeypatch, argumentos):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "true")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT", "60000")
+    monkeypatch.setenv("DB_PREPARE_THRESHOLD", "none")
+
+    configuracao = conexao.configuracao_perfil("bulk")
+    assert configuracao["pool_size"] == 3
+    assert configuracao["pool_pre_ping"] is True
+    assert configuracao["prepare_threshold"] is None
+
+    _, opcoes = conexao.get_engine("bulk", "psycopg2")
+    assert opcoes["connect_args"]["options"] == "-c statement_timeout=60000"
+
+
+def test_perfil_invalido():
+    with pytest.raises(ValueError, match="Perfil de engine inválido"):
+        conexao.configuracao_perfil("turbo")
+
+
+def test_driver_invalido():
+    with pytest.raises(ValueError, match="Driver do PostgreSQL inválido"):
+        conexao.get_engine("default", "pg8000")
+
+
+def test_executemany_mode_invalido(monkeypatch, argumentos):
+    monkeypatch.setattr(conexao, "DB_EXECUTEMANY_MODE", "batch")
+
+    with pytest.raises(ValueError, match="DB_EXECUTEMANY_MODE inválido"):
+        conexao.get_engine("default", "psycopg2")
+
+    # O modo do executemany só vale para o psycopg2
+    conexao.get_engine("default", "psycopg")
+
+
+def test_url_com_sslmode(argumentos):
+    url, _ = conexao.get_engine("default", "psycopg2")
+    assert url.query["sslmode"] == conexao.DB_SSLMODE
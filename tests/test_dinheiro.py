@@ -0,0 +1,87 @@
+# Testes dos valores monetários em centavos inteiros: arredondamento ao centavo, desconto com metade
+# para cima e totais dos pedidos somados sem erro de ponto flutuante em todos os tipos de saída.
+
+# Bibliotecas utilizadas
+from collections import defaultdict
+from datetime import date
+import numpy as np
+import pytest
+from src import dinheiro
+from src.gerador import GeradorDados, IndiceClientes
+from src.gerador_colunar import GeradorColunar, indice_em_arrays
+
+
+def test_centavos_arredonda_ao_centavo():
+    assert dinheiro.centavos(0.1 + 0.2) == 30
+    assert dinheiro.centavos(344.999) == 34500
+    assert dinheiro.centavos(np.array([97.004, 120.456])).tolist() == [9700, 12046]
+
+
+def test_desconto_de_10_por_cento_com_metade_para_cima():
+    assert dinheiro.desconto(dinheiro.MINIMO_DESCONTO) == 0
+    assert dinheiro.desconto(20005) == 2001
+    assert dinheiro.desconto(20004) == 2000
+    assert dinheiro.desconto(np.array([10000, 30015])).tolist() == [0, 3002]
+
+
+@pytest.mark.parametrize("tipo", ["float", "numeric", "cents"])
+def test_conversao_ida_e_volta(monkeypatch, tipo):
+    monkeypatch.setattr(dinheiro, "MONEY_TYPE", tipo)
+    for valor in (0, 1, 1250, 34567, 10**11 + 1):
+        assert dinheiro.para_centavos(dinheiro.de_centavos(valor)) == valor
+
+
+def indice_clientes():
+    """Índice com clientes de SP (frete grátis) e de outros estados."""
+    indice = IndiceClientes()
+    for id_cliente, estado in enumerate(["SP", "MG", "RJ", "BA"], 1):
+        indice.adicionar(id_cliente, estado, "Rua A, 1", "Centro", "Cidade")
+    return indice
+
+
+def conferir_totais(pedidos, itens):
+    """Confere, em centavos, os subtotais dos pedidos pelos itens e o total com frete e desconto."""
+    subtotais = defaultdict(int)
+    for item in itens:
+        subtotal = dinheiro.para_centavos(item["subtotal"])
+        assert subtotal == item["quantidade"] * dinheiro.para_centavos(
+            item["preco_unitario"],
+        )
+        subtotais[item["id_pedido"]] += subtotal
+
+    for pedido in pedidos:
+        subtotal = dinheiro.para_centavos(pedido["subtotal"])
+        frete = dinheiro.para_centavos(pedido["frete"])
+        assert subtotal == subtotais[pedido["id"]]
+        assert frete in (0, dinheiro.FRETE)
+        assert dinheiro.para_centavos(pedido["valor_desconto"]) == dinheiro.desconto(
+            subtotal,
+        )
+        assert dinheiro.para_centavos(pedido["total"]) == (
+            subtotal + frete - dinheiro.desconto(subtotal)
+        )
+
+
+@pytest.mark.parametrize("tipo", ["float", "cents"])
+def test_totais_dos_pedidos_em_centavos(monkeypatch, tipo):
+    monkeypatch.setattr(dinheiro, "MONEY_TYPE", tipo)
+    gerador = GeradorDados("dinheiro", date(2026, 1, 1))
+    shard = gerador.pedidos_com_itens(500, 1, indice_clientes(), list(range(1, 11)))
+    conferir_totais(shard["pedidos"], shard["itenspedido"])
+
+
+@pytest.mark.parametrize("tipo", ["float", "cents"])
+def test_totais_dos_pedidos_vetorizados_em_centavos(monkeypatch, tipo):
+    monkeypatch.setattr(dinheiro, "MONEY_TYPE", tipo)
+    gerador = GeradorColunar("dinheiro", date(2026, 1, 1))
+    shard = gerador.pedidos_com_itens(
+        500,
+        1,
+        indice_em_arrays(indice_clientes()),
+        list(range(1, 11)),
+    )
+
+    def linhas(colunas):
+        return [dict(zip(colunas, valores)) for valores in zip(*colunas.values())]
+
+    conferir_totais(linhas(shard["pedidos"]), linhas(shard["itenspedido"]))
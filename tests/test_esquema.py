@@ -0,0 +1,133 @@
+# Testes do DDL da carga inicial, compilado com o dialeto do PostgreSQL por uma conexão falsa: as
+# tabelas nascem só com a chave primária, os índices e as restrições unique vêm depois e as chaves
+# estrangeiras entram com NOT VALID e são validadas em seguida (exceto nas tabelas particionadas).
+
+# Bibliotecas utilizadas
+from types import SimpleNamespace
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from src import esquema
+from supabase.model_supabase_db import Base
+
+
+def conexao_falsa():
+    """Conexão falsa que guarda os comandos compilados para o PostgreSQL em `comandos`."""
+    dialeto = postgresql.dialect()
+    comandos: list[str] = []
+    return SimpleNamespace(
+        dialect=dialeto,
+        comandos=comandos,
+        execute=lambda comando: comandos.append(
+            " ".join(str(comando.compile(dialect=dialeto)).split()),
+        ),
+    )
+
+
+def modelo(particionado=False):
+    """Modelo de clientes e pedidos; particionado, pedidos é dividido por mês e ganha os itens."""
+    metadata = sa.MetaData()
+    sa.Table(
+        "clientes",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("email", sa.String(100), unique=True),
+    )
+    sa.Table(
+        "pedidos",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("data_pedido", sa.Date, primary_key=particionado, index=True),
+        sa.Column("id_cliente", sa.Integer, sa.ForeignKey("clientes.id")),
+        postgresql_partition_by="RANGE (data_pedido)" if particionado else None,
+    )
+    if not particionado:
+        return metadata
+
+    # Como itenspedido: a chave estrangeira leva a data_pedido, parte da chave primária de pedidos
+    sa.Table(
+        "itens",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("id_pedido", sa.Integer),
+        sa.Column("data_pedido", sa.Date),
+        sa.ForeignKeyConstraint(
+            ["id_pedido", "data_pedido"],
+            ["pedidos.id", "pedidos.data_pedido"],
+        ),
+    )
+    return metadata
+
+
+def test_tabelas_criadas_so_com_a_chave_primaria():
+    conexao = conexao_falsa()
+    esquema.criar_tabelas_sem_restricoes(conexao, Base.metadata)
+
+    assert len(conexao.comandos) == len(Base.metadata.sorted_tables)
+    for comando in conexao.comandos:
+        assert comando.startswith("CREATE TABLE")
+        assert "PRIMARY KEY" in comando
+        assert "FOREIGN KEY" not in comando and "REFERENCES" not in comando
+        assert "UNIQUE" not in comando
+
+
+def test_indices_e_unique_depois_da_carga():
+    conexao = conexao_falsa()
+    esquema.criar_indices(conexao, modelo())
+
+    assert conexao.comandos == [
+        "ALTER TABLE clientes ADD UNIQUE (email)",
+        "CREATE INDEX ix_pedidos_data_pedido ON pedidos (data_pedido)",
+    ]
+
+
+def test_chaves_estrangeiras_do_modelo_sem_validar_e_validadas_depois():
+    conexao = conexao_falsa()
+    pendentes = esquema.adicionar_chaves_estrangeiras(conexao, Base.metadata)
+    chaves = [
+        (table.name, constraint)
+        for table in Base.metadata.sorted_tables
+        for constraint in table.foreign_key_constraints
+        if not esquema.particionada(table)
+        and not esquema.particionada(constraint.referred_table)
+    ]
+
+    assert chaves and len(pendentes) == len(chaves) == len(conexao.comandos)
+    for comando in conexao.comandos:
+        assert comando.endswith(" NOT VALID")
+
+    validacao = conexao_falsa()
+    esquema.validar_chaves_estrangeiras(validacao, pendentes)
+    assert validacao.comandos == [
+        f"ALTER TABLE {tabela} VALIDATE CONSTRAINT {nome}" for tabela, nome in pendentes
+    ]
+
+
+def test_chave_estrangeira_com_o_nome_padrao_do_postgresql():
+    conexao = conexao_falsa()
+
+    assert esquema.adicionar_chaves_estrangeiras(conexao, modelo()) == [
+        ("pedidos", "pedidos_id_cliente_fkey"),
+    ]
+    assert conexao.comandos == [
+        "ALTER TABLE pedidos ADD CONSTRAINT pedidos_id_cliente_fkey "
+        "FOREIGN KEY (id_cliente) REFERENCES clientes (id) NOT VALID",
+    ]
+
+
+def test_chaves_de_e_para_tabela_particionada_checadas_ao_adicionar():
+    conexao = conexao_falsa()
+    esquema.criar_tabelas_sem_restricoes(conexao, modelo(particionado=True))
+    assert conexao.comandos[1].endswith(
+        "PRIMARY KEY (id, data_pedido) ) PARTITION BY RANGE (data_pedido)",
+    )
+
+    conexao = conexao_falsa()
+    assert (
+        esquema.adicionar_chaves_estrangeiras(conexao, modelo(particionado=True)) == []
+    )
+    assert conexao.comandos == [
+        "ALTER TABLE pedidos ADD CONSTRAINT pedidos_id_cliente_fkey "
+        "FOREIGN KEY (id_cliente) REFERENCES clientes (id)",
+        "ALTER TABLE itens ADD CONSTRAINT itens_id_pedido_data_pedido_fkey "
+        "FOREIGN KEY (id_pedido, data_pedido) REFERENCES pedidos (id, data_pedido)",
+    ]
@@ -0,0 +1,68 @@
+# Testes do sorteio ponderado pelo método alias: as frequências sorteadas seguem os pesos, no sorteio
+# um a um e no sorteio em lote usado pelo gerador de clientes.
+
+# Bibliotecas utilizadas
+from datetime import date
+import random
+import numpy as np
+import pytest
+from src.gerador import GeradorDados
+from src.list_auxiliar import (
+    AMOSTRADORES_LOCAIS,
+    LOCAIS_ESTADOS,
+    POPULACAO_ESTADOS,
+    AmostradorAlias,
+)
+
+PESOS = [5, 1, 0, 3, 1]
+SORTEIOS = 200_000
+
+
+def proporcoes(posicoes):
+    """Proporção de cada posição de PESOS nos sorteios."""
+    return np.bincount(posicoes, minlength=len(PESOS)) / len(posicoes)
+
+
+def test_sorteio_segue_os_pesos():
+    amostrador = AmostradorAlias(PESOS)
+    rng = random.Random(1)
+    sorteios = [amostrador.sortear(rng) for _ in range(SORTEIOS)]
+    assert proporcoes(sorteios) == pytest.approx(
+        np.array(PESOS) / sum(PESOS),
+        abs=0.005,
+    )
+
+
+def test_sorteio_em_lote_segue_os_pesos():
+    amostrador = AmostradorAlias(PESOS)
+    sorteios = amostrador.sortear_lote(np.random.default_rng(1), SORTEIOS)
+    assert proporcoes(sorteios) == pytest.approx(
+        np.array(PESOS) / sum(PESOS),
+        abs=0.005,
+    )
+
+
+def test_peso_zero_nunca_e_sorteado():
+    amostrador = AmostradorAlias(PESOS)
+    assert 2 not in amostrador.sortear_lote(np.random.default_rng(2), SORTEIOS)
+
+
+def test_sorteio_reproduzivel_pela_semente():
+    amostrador = AmostradorAlias(PESOS)
+    assert [amostrador.sortear(random.Random(7)) for _ in range(10)] == [
+        amostrador.sortear(random.Random(7)) for _ in range(10)
+    ]
+
+
+def test_amostradores_locais_cobrem_todos_os_locais():
+    for amostrador in AMOSTRADORES_LOCAIS.values():
+        assert len(amostrador) == len(LOCAIS_ESTADOS)
+
+
+def test_clientes_com_locais_sorteados_em_lote_pelos_pesos():
+    gerador = GeradorDados("locais", date(2026, 1, 1), pesos_locais="population")
+    estados = [cliente["estado"] for cliente in gerador.clientes(2000, 1)]
+    assert estados.count("SP") / len(estados) == pytest.approx(
+        POPULACAO_ESTADOS["SP"] / sum(POPULACAO_ESTADOS.values()),
+        abs=0.03,
+    )
@@ -0,0 +1,242 @@
+# Testes das políticas de commit do BatchLoader, com um SQLite em arquivo no lugar do PostgreSQL, e
+# do CSV enviado ao COPY, com cursores falsos do psycopg2 e do psycopg 3.
+
+# Bibliotecas utilizadas
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+import csv
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from src import loader
+from src.loader import BatchLoader, chunked
+
+metadata = sa.MetaData()
+tabela = sa.Table(
+    "linhas",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("valor", sa.Integer, nullable=False),
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine SQLite com a tabela de teste e a contagem de commits em `engine.commits`."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'teste.db'}")
+    metadata.create_all(engine)
+    engine.commits = 0
+
+    @sa.event.listens_for(engine, "commit")
+    def contar_commit(connection):
+        engine.commits += 1
+
+    return engine
+
+
+def linhas(quantidade, inicio=1):
+    """Linhas da tabela de teste com ids a partir de `inicio`."""
+    return [
+        {"id": id_linha, "valor": id_linha * 10}
+        for id_linha in range(inicio, inicio + quantidade)
+    ]
+
+
+def gravadas(engine):
+    """Quantidade de linhas gravadas na tabela de teste."""
+    with engine.connect() as connection:
+        return connection.execute(
+            sa.select(sa.func.count()).select_from(tabela),
+        ).scalar()
+
+
+def test_chunked_entrega_o_resto():
+    assert [len(lote) for lote in chunked(range(7), 3)] == [3, 3, 1]
+
+
+def test_politica_invalida():
+    with pytest.raises(ValueError):
+        BatchLoader(sa.create_engine("sqlite://"), commit_policy="linha")
+
+
+def test_politica_batch_faz_um_commit_por_lote(engine):
+    carregador = BatchLoader(engine, batch_size=4, commit_policy="batch", mode="insert")
+    engine.commits = 0
+
+    assert carregador.load(tabela, linhas(10)) == 10
+    assert engine.commits == 3
+    assert gravadas(engine) == 10
+
+
+def test_politica_table_faz_um_commit_por_carga(engine):
+    carregador = BatchLoader(engine, batch_size=4, commit_policy="table", mode="insert")
+    engine.commits = 0
+
+    carregador.load(tabela, linhas(10))
+    assert engine.commits == 1
+    assert gravadas(engine) == 10
+
+
+def test_politica_run_faz_um_commit_por_execucao(engine):
+    carregador = BatchLoader(engine, batch_size=4, commit_policy="run", mode="insert")
+    engine.commits = 0
+
+    with carregador.run():
+        carregador.load(tabela, linhas(10))
+        carregador.load(tabela, linhas(5, inicio=11))
+        assert engine.commits == 0
+
+    assert engine.commits == 1
+    assert gravadas(engine) == 15
+
+
+def test_erro_na_politica_batch_mantem_os_lotes_anteriores(engine):
+    carregador = BatchLoader(engine, batch_size=4, commit_policy="batch", mode="insert")
+
+    # O id 3 repetido no terceiro lote viola a chave primária
+    with pytest.raises(sa.exc.IntegrityError):
+        carregador.load(tabela, linhas(8) + linhas(2, inicio=2))
+    assert gravadas(engine) == 8
+
+
+def test_erro_na_politica_table_desfaz_a_carga(engine):
+    carregador = BatchLoader(engine, batch_size=4, commit_policy="table", mode="insert")
+
+    with pytest.raises(sa.exc.IntegrityError):
+        carregador.load(tabela, linhas(8) + linhas(2, inicio=2))
+    assert gravadas(engine) == 0
+
+
+def ler_csv(buffer):
+    """Linhas do CSV como o COPY (FORMAT csv) as lê."""
+    return list(csv.reader(buffer))
+
+
+def test_rows_to_csv_escapa_nulos_aspas_quebras_e_delimitadores():
+    rows = [
+        {"id": 1, "nome": 'Loja "Central", SP', "obs": None},
+        {"id": 2, "nome": "linha 1\nlinha 2", "obs": ""},
+    ]
+    buffer = loader.rows_to_csv(rows, ["id", "nome", "obs"])
+
+    assert buffer.getvalue() == (
+        '1,"Loja ""Central"", SP",\\N\n2,"linha 1\nlinha 2",\n'
+    )
+    assert ler_csv(buffer) == [
+        ["1", 'Loja "Central", SP', loader.COPY_NULL],
+        ["2", "linha 1\nlinha 2", ""],
+    ]
+
+
+def test_rows_to_csv_com_decimal_e_datas():
+    rows = [
+        {
+            "valor": Decimal("1234.50"),
+            "data_pedido": date(2026, 1, 5),
+            "criado_em": datetime(2026, 1, 5, 10, 30, 15, 250),
+        },
+    ]
+
+    assert ler_csv(loader.rows_to_csv(rows, list(rows[0]))) == [
+        ["1234.50", "2026-01-05", "2026-01-05 10:30:15.000250"],
+    ]
+
+
+def test_columns_to_csv_com_nat_e_textos():
+    colunas = {
+        "id": np.array([1, 2]),
+        "valor": np.array([0.1, 150.25]),
+        "nome": np.array(['a,"b"', None], dtype=object),
+        "data_envio": np.array(["2026-02-03", "NaT"], dtype="datetime64[D]"),
+    }
+
+    assert ler_csv(loader.columns_to_csv(colunas)) == [
+        ["1", "0.1", 'a,"b"', "2026-02-03"],
+        ["2", "150.25", loader.COPY_NULL, loader.COPY_NULL],
+    ]
+
+
+class CursorPsycopg2:
+    """Cursor falso do psycopg2: guarda o comando e o conteúdo do copy_expert."""
+
+    def __init__(self):
+        self.fechado = False
+
+    def copy_expert(self, sql, buffer):
+        self.sql = sql
+        self.dados = buffer.read()
+
+    def close(self):
+        self.fechado = True
+
+
+class CursorPsycopg3:
+    """Cursor falso do psycopg 3: guarda o comando e cada escrita do cursor.copy."""
+
+    def __init__(self):
+        self.fechado = False
+        self.escritas = []
+
+    def copy(self, sql):
+        self.sql = sql
+        cursor = self
+
+        class Copia:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *erro):
+                return False
+
+            def write(self, dados):
+                cursor.escritas.append(dados)
+
+        return Copia()
+
+    def close(self):
+        self.fechado = True
+
+
+def conexao_falsa(cursor):
+    """Conexão SQLAlchemy falsa com o dialeto do PostgreSQL e o cursor informado."""
+    return SimpleNamespace(
+        dialect=postgresql.dialect(),
+        connection=SimpleNamespace(cursor=lambda: cursor),
+    )
+
+
+def test_copy_com_psycopg2_usa_copy_expert():
+    cursor = CursorPsycopg2()
+    rows = [{"id": 1, "user": "a"}, {"id": 2, "user": None}]
+
+    assert loader.copy_rows(conexao_falsa(cursor), tabela, rows) == 2
+    assert cursor.sql == (
+        "COPY linhas (id, \"user\") FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    assert cursor.dados == "1,a\n2,\\N\n"
+    assert cursor.fechado
+
+
+def test_copy_com_psycopg3_escreve_em_blocos(monkeypatch):
+    monkeypatch.setattr(loader, "COPY_CHUNK_SIZE", 4)
+    cursor = CursorPsycopg3()
+    colunas = {"id": np.array([1, 2]), "valor": np.array([10, 20])}
+
+    assert loader.write_columns(conexao_falsa(cursor), tabela, colunas, "copy") == 2
+    assert cursor.sql.startswith("COPY linhas (id, valor) FROM STDIN")
+    assert cursor.escritas == ["1,10", "\n2,2", "0\n"]
+    assert cursor.fechado
+
+
+def test_copy_fecha_o_cursor_quando_falha():
+    cursor = CursorPsycopg2()
+
+    def falhar(sql, buffer):
+        raise RuntimeError("COPY falhou")
+
+    cursor.copy_expert = falhar
+    with pytest.raises(RuntimeError, match="COPY falhou"):
+        loader.copy_rows(conexao_falsa(cursor), tabela, [{"id": 1, "valor": 1}])
+    assert cursor.fechado
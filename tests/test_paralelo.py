@@ -0,0 +1,80 @@
+# Testes da geração em shards: sementes e faixas de ids fixas, resultado igual para qualquer número de
+# processos e shards gerados de novo (retomada) iguais aos da execução completa.
+
+# Bibliotecas utilizadas
+from datetime import date
+import pytest
+from src import paralelo
+
+DATA_BASE = date(2026, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def shards_pequenos(monkeypatch):
+    """Shards de 20 linhas, para testar vários shards com poucas linhas."""
+    monkeypatch.setattr(paralelo, "SHARD_SIZE", 20)
+
+
+def gerar(quantidade, workers=1, pular=(), seed=42):
+    """Clientes gerados em shards, como lista de shards."""
+    return list(
+        paralelo.gerar_shards(
+            "clientes",
+            quantidade,
+            1,
+            seed=seed,
+            data_base=DATA_BASE,
+            workers=workers,
+            pular=pular,
+        ),
+    )
+
+
+def test_semente_do_shard_depende_da_execucao_da_entidade_e_da_posicao():
+    assert paralelo.semente_shard(1, "clientes", 0) == paralelo.semente_shard(
+        1,
+        "clientes",
+        0,
+    )
+    assert paralelo.semente_shard(1, "clientes", 0) != paralelo.semente_shard(
+        2,
+        "clientes",
+        0,
+    )
+    assert paralelo.semente_shard(1, "clientes", 0) != paralelo.semente_shard(
+        1,
+        "produtos",
+        0,
+    )
+    assert paralelo.semente_shard(1, "clientes", 0) != paralelo.semente_shard(
+        1,
+        "clientes",
+        1,
+    )
+
+
+def test_shards_cobrem_a_faixa_de_ids():
+    assert list(paralelo.dividir_em_shards(45, 101)) == [
+        (0, 101, 20),
+        (1, 121, 20),
+        (2, 141, 5),
+    ]
+
+
+def test_mesma_semente_gera_os_mesmos_dados():
+    assert gerar(45) == gerar(45)
+    assert gerar(45) != gerar(45, seed=43)
+
+
+def test_ids_sequenciais_nos_shards():
+    ids = [cliente["id"] for shard in gerar(45) for cliente in shard]
+    assert ids == list(range(1, 46))
+
+
+def test_resultado_independe_do_numero_de_processos():
+    assert gerar(45, workers=2) == gerar(45)
+
+
+def test_shards_pulados_nao_mudam_os_demais():
+    completos = gerar(45)
+    assert gerar(45, pular={0, 2}) == [completos[1]]
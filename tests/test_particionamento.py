@@ -0,0 +1,70 @@
+# Testes dos itens gerados com pedidos particionado (DB_PARTITION=month): cada item leva a data do
+# seu pedido, parte da chave estrangeira (id_pedido, data_pedido), nas duas formas de geração.
+
+# Bibliotecas utilizadas
+from datetime import date
+from src import gerador, gerador_colunar
+from src.gerador import GeradorDados, IndiceClientes
+from src.gerador_colunar import GeradorColunar, indice_em_arrays
+
+
+def indice_clientes():
+    """Índice com dois clientes."""
+    indice = IndiceClientes()
+    for id_cliente, estado in enumerate(["SP", "MG"], 1):
+        indice.adicionar(id_cliente, estado, "Rua A, 1", "Centro", "Cidade")
+    return indice
+
+
+def conferir_datas(pedidos, itens):
+    """Confere que cada item tem a data_pedido do seu pedido."""
+    datas = {pedido["id"]: pedido["data_pedido"] for pedido in pedidos}
+    assert itens and all(
+        item["data_pedido"] == datas[item["id_pedido"]] for item in itens
+    )
+
+
+def test_itens_com_a_data_do_pedido(monkeypatch):
+    monkeypatch.setattr(gerador, "PARTICIONADO", True)
+    shard = GeradorDados("particionado", date(2026, 1, 1)).pedidos_com_itens(
+        200,
+        1,
+        indice_clientes(),
+        [1, 2, 3],
+    )
+    conferir_datas(shard["pedidos"], shard["itenspedido"])
+
+
+def test_itens_vetorizados_com_a_data_do_pedido(monkeypatch):
+    monkeypatch.setattr(gerador_colunar, "PARTICIONADO", True)
+    shard = GeradorColunar("particionado", date(2026, 1, 1)).pedidos_com_itens(
+        200,
+        1,
+        indice_em_arrays(indice_clientes()),
+        [1, 2, 3],
+    )
+
+    def linhas(colunas):
+        return [dict(zip(colunas, valores)) for valores in zip(*colunas.values())]
+
+    conferir_datas(linhas(shard["pedidos"]), linhas(shard["itenspedido"]))
+
+
+def test_sem_particionamento_os_itens_nao_tem_data(monkeypatch):
+    monkeypatch.setattr(gerador, "PARTICIONADO", False)
+    monkeypatch.setattr(gerador_colunar, "PARTICIONADO", False)
+
+    linhas = GeradorDados("sem", date(2026, 1, 1)).pedidos_com_itens(
+        10,
+        1,
+        indice_clientes(),
+        [1],
+    )
+    colunar = GeradorColunar("sem", date(2026, 1, 1)).pedidos_com_itens(
+        10,
+        1,
+        indice_em_arrays(indice_clientes()),
+        [1],
+    )
+    assert "data_pedido" not in linhas["itenspedido"][0]
+    assert "data_pedido" not in colunar["itenspedido"]
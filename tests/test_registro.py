@@ -0,0 +1,58 @@
+# Testes da amostra de linhas de execuções anteriores do registro, com um SQLite em memória: a amostra
+# é limitada qualquer que seja o pedido, sem repetir ids, e reproduzível pela semente.
+
+# Bibliotecas utilizadas
+import pytest
+import sqlalchemy as sa
+from src import registro
+
+metadata = sa.MetaData()
+tabela = sa.Table("clientes", metadata, sa.Column("id", sa.Integer, primary_key=True))
+
+
+@pytest.fixture
+def connection():
+    """Conexão SQLite com 25 mil linhas de execuções anteriores (ids 1 a 25.000)."""
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            tabela.insert(),
+            [{"id": id_linha} for id_linha in range(1, 25_001)],
+        )
+        yield connection
+
+
+def amostrar(connection, quantidade, seed=1):
+    """Ids da amostra de um registro novo com a semente informada."""
+    amostra = registro.Registro(seed).amostrar_anteriores(
+        connection,
+        tabela,
+        [tabela.c.id],
+        quantidade,
+    )
+    return [linha.id for linha in amostra]
+
+
+def test_amostra_limitada_mesmo_pedindo_a_tabela_inteira(connection):
+    ids = amostrar(connection, 1_000_000)
+    assert len(ids) == registro.AMOSTRA_ANTERIORES
+    assert len(set(ids)) == len(ids)
+    assert set(ids) <= set(range(1, 25_001))
+
+
+def test_amostra_pequena_tem_o_tamanho_pedido(connection):
+    assert len(amostrar(connection, 250)) == 250
+    assert amostrar(connection, 0) == []
+
+
+def test_amostra_reproduzivel_pela_semente(connection):
+    assert amostrar(connection, 500) == amostrar(connection, 500)
+    assert amostrar(connection, 500) != amostrar(connection, 500, seed=2)
+
+
+def test_tabela_sem_execucoes_anteriores():
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.connect() as connection:
+        assert amostrar(connection, 100) == []
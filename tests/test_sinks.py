@@ -0,0 +1,248 @@
+# Testes dos sinks: o sink parquet grava as partições no estilo Hive com os tipos do modelo (float,
+# numeric e centavos) e não sobrescreve os arquivos de outra execução; o sink asyncpg, com um pool
+# falso no lugar do banco, esvazia a fila limitada e repassa o erro de um escritor.
+
+# Bibliotecas utilizadas
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+import asyncio
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import sqlalchemy as sa
+from src import sinks
+
+metadata = sa.MetaData()
+tabela = sa.Table(
+    "vendas",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("valor_float", sa.Float, nullable=False),
+    sa.Column("valor_numeric", sa.Numeric(12, 2), nullable=False),
+    sa.Column("valor_centavos", sa.BigInteger, nullable=False),
+    sa.Column("data_pedido", sa.Date, nullable=False),
+    sa.Column("data_envio", sa.Date),
+)
+dimensao = sa.Table(
+    "marcas",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("nome", sa.String(50), nullable=False),
+)
+
+
+def linhas():
+    """Linhas de vendas de janeiro e fevereiro, com os valores como o gerador os entrega."""
+    return [
+        {
+            "id": 1,
+            "valor_float": 10.5,
+            "valor_numeric": 12.34,
+            "valor_centavos": 1234,
+            "data_pedido": date(2026, 1, 5),
+            "data_envio": None,
+        },
+        {
+            "id": 2,
+            "valor_float": 0.1,
+            "valor_numeric": 99999.99,
+            "valor_centavos": 9999999,
+            "data_pedido": date(2026, 2, 1),
+            "data_envio": date(2026, 2, 3),
+        },
+    ]
+
+
+def lote_colunar():
+    """Lote colunar de vendas de janeiro, como o gerador vetorizado o entrega."""
+    return {
+        "id": np.array([3, 4]),
+        "valor_float": np.array([1.25, 2.5]),
+        "valor_numeric": np.array([0.07, 150.1]),
+        "valor_centavos": np.array([7, 15010]),
+        "data_pedido": np.array(["2026-01-20", "2026-01-31"], dtype="datetime64[D]"),
+        "data_envio": np.array(["NaT", "2026-02-02"], dtype="datetime64[D]"),
+    }
+
+
+def gravar(diretorio, lotes, **opcoes):
+    """Grava os lotes com um sink parquet no diretório e retorna o sink."""
+    sink = sinks.SinkParquet(str(diretorio), **opcoes)
+    with sink.execucao():
+        sink.gravar(lotes)
+    return sink
+
+
+def test_particoes_no_estilo_hive(tmp_path):
+    gravar(tmp_path, [[(tabela, linhas())], [(tabela, lote_colunar())]])
+
+    particoes = sorted(caminho.name for caminho in (tmp_path / "vendas").iterdir())
+    assert particoes == ["data_pedido_mes=2026-01", "data_pedido_mes=2026-02"]
+    janeiro = pq.read_table(tmp_path / "vendas" / "data_pedido_mes=2026-01")
+    assert sorted(janeiro.column("id").to_pylist()) == [1, 3, 4]
+
+
+def test_particao_por_dia_e_sem_particao(tmp_path):
+    gravar(tmp_path / "dia", [[(tabela, linhas())]], particao="day")
+    assert sorted(
+        caminho.name for caminho in (tmp_path / "dia" / "vendas").iterdir()
+    ) == [
+        "data_pedido_dia=2026-01-05",
+        "data_pedido_dia=2026-02-01",
+    ]
+
+    gravar(tmp_path / "sem", [[(tabela, linhas())]], particao="none")
+    arquivos = list((tmp_path / "sem" / "vendas").iterdir())
+    assert len(arquivos) == 1 and arquivos[0].suffix == ".parquet"
+
+
+def test_tipos_do_modelo_na_ida_e_volta(tmp_path):
+    gravar(
+        tmp_path,
+        [[(tabela, linhas())], [(tabela, lote_colunar())]],
+        particao="none",
+    )
+
+    lidas = pq.read_table(tmp_path / "vendas")
+    assert lidas.schema.field("id").type == pa.int64()
+    assert lidas.schema.field("valor_float").type == pa.float64()
+    assert lidas.schema.field("valor_numeric").type == pa.decimal128(12, 2)
+    assert lidas.schema.field("valor_centavos").type == pa.int64()
+    assert lidas.schema.field("data_pedido").type == pa.date32()
+
+    por_id = {linha["id"]: linha for linha in lidas.to_pylist()}
+    assert por_id[1]["valor_numeric"] == Decimal("12.34")
+    assert por_id[2]["valor_numeric"] == Decimal("99999.99")
+    assert por_id[4]["valor_numeric"] == Decimal("150.10")
+    assert por_id[2]["valor_centavos"] == 9999999
+    assert por_id[3]["data_envio"] is None
+    assert por_id[4]["data_envio"] == date(2026, 2, 2)
+
+
+def test_tabela_sem_data_pedido_nao_e_particionada(tmp_path):
+    gravar(tmp_path, [[(dimensao, [{"id": 1, "nome": "Nike"}])]])
+    arquivos = list((tmp_path / "marcas").iterdir())
+    assert len(arquivos) == 1 and arquivos[0].is_file()
+
+
+def test_row_groups_com_o_tamanho_configurado(tmp_path):
+    lote = [{**linhas()[0], "id": id_linha} for id_linha in range(1, 26)]
+    gravar(tmp_path, [[(tabela, lote)]], row_group_size=10, particao="none")
+
+    (arquivo,) = (tmp_path / "vendas").iterdir()
+    metadados = pq.ParquetFile(arquivo).metadata
+    assert [
+        metadados.row_group(posicao).num_rows
+        for posicao in range(metadados.num_row_groups)
+    ] == [10, 10, 5]
+
+
+def test_execucoes_no_mesmo_segundo_nao_se_sobrescrevem(tmp_path):
+    primeira = gravar(tmp_path, [[(tabela, linhas())]], particao="none")
+    segunda = gravar(tmp_path, [[(tabela, linhas())]], particao="none")
+
+    assert primeira.arquivo != segunda.arquivo
+    assert pq.read_table(tmp_path / "vendas").num_rows == 4
+
+
+class ConexaoFalsa:
+    """Conexão asyncpg falsa: guarda os registros copiados e falha na tabela `falhar_em`."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def transaction(self):
+        return ContextoFalso()
+
+    async def copy_records_to_table(self, nome, records, columns, schema_name):
+        pool = self.pool
+        pool.em_espera = max(pool.em_espera, pool.gerados - pool.gravados)
+        await asyncio.sleep(0.001)
+        if nome == pool.falhar_em:
+            raise RuntimeError(f"falha ao gravar {nome}")
+        pool.copiados.extend(records)
+        pool.gravados += 1
+
+
+class ContextoFalso:
+    """Contexto assíncrono sem efeito (transação da conexão falsa)."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *erro):
+        return False
+
+
+class PoolFalso:
+    """Pool asyncpg falso, com a contagem de shards gerados e gravados."""
+
+    def __init__(self, falhar_em=None):
+        self.falhar_em = falhar_em
+        self.copiados = []
+        self.gerados = 0
+        self.gravados = 0
+        self.em_espera = 0
+        self.fechado = False
+
+    def acquire(self):
+        pool = self
+
+        class Aquisicao:
+            async def __aenter__(self):
+                return ConexaoFalsa(pool)
+
+            async def __aexit__(self, *erro):
+                return False
+
+        return Aquisicao()
+
+    async def close(self):
+        self.fechado = True
+
+
+def sink_asyncpg(monkeypatch, pool, conexoes=2, tamanho_fila=3):
+    """SinkAsyncpg em modo COPY com o pool falso no lugar do asyncpg."""
+    pytest.importorskip("asyncpg")
+
+    async def criar_pool(self):
+        return pool
+
+    monkeypatch.setattr(sinks.SinkAsyncpg, "_criar_pool", criar_pool)
+    carregador = SimpleNamespace(mode="copy", batch_size=10)
+    return sinks.SinkAsyncpg(carregador, conexoes=conexoes, tamanho_fila=tamanho_fila)
+
+
+def shards(pool, quantidade):
+    """Shards de uma linha de marcas, contando os gerados no pool falso."""
+    for id_linha in range(1, quantidade + 1):
+        pool.gerados += 1
+        yield [(dimensao, [{"id": id_linha, "nome": f"marca {id_linha}"}])]
+
+
+def test_asyncpg_grava_todos_os_shards_com_a_fila_limitada(monkeypatch):
+    pool = PoolFalso()
+    sink = sink_asyncpg(monkeypatch, pool)
+
+    with sink.execucao():
+        assert sink.gravar(shards(pool, 50)) == 50
+
+    assert sorted(registro[0] for registro in pool.copiados) == list(range(1, 51))
+    # Gerados à frente da gravação: no máximo a fila, os escritores e o shard sendo enfileirado
+    assert pool.em_espera <= sink.tamanho_fila + sink.conexoes + 1
+    assert pool.fechado
+
+
+def test_asyncpg_repassa_o_erro_do_escritor(monkeypatch):
+    pool = PoolFalso(falhar_em="marcas")
+    sink = sink_asyncpg(monkeypatch, pool)
+
+    with pytest.raises(RuntimeError, match="falha ao gravar marcas"):
+        with sink.execucao():
+            sink.gravar(shards(pool, 50))
+
+    # A geração para logo após o erro, sem ficar bloqueada na fila cheia
+    assert pool.gerados < 50
+    assert pool.fechado